@@ -1,10 +1,11 @@
 from django.urls import path
 
 from about.views import AboutAuthorView, AboutTechView
+from yatube.utils import public_page
 
 app_name = '%(about_label)s'
 
 urlpatterns = [
-    path('author/', AboutAuthorView.as_view(), name='author'),
-    path('tech/', AboutTechView.as_view(), name='tech'),
+    path('author/', public_page(AboutAuthorView.as_view()), name='author'),
+    path('tech/', public_page(AboutTechView.as_view()), name='tech'),
 ]
@@ -0,0 +1,81 @@
+from typing import Any, Iterable, Optional
+
+from django.conf import settings
+from django.contrib.auth import (
+    BACKEND_SESSION_KEY,
+    HASH_SESSION_KEY,
+    SESSION_KEY,
+    get_user_model,
+    load_backend,
+)
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.utils.crypto import constant_time_compare
+
+
+def user_cache_key(user_id: Any) -> str:
+    return f'auth-user:{user_id}'
+
+
+def forget_user(user_id: Optional[Any]) -> None:
+    """Убирает пользователя из кэша, следующий запрос прочитает его из базы."""
+    if user_id is not None:
+        cache.delete(user_cache_key(user_id))
+
+
+def forget_users(user_ids: Iterable[Any]) -> None:
+    """
+    Сбрасывает кэш пользователей после QuerySet.update: он не шлет
+    сигналов, и без сброса изменения видны только по истечении срока.
+    """
+    cache.delete_many([user_cache_key(user_id) for user_id in user_ids])
+
+
+def get_cached_user(request: Any) -> Any:
+    """
+    То же, что django.contrib.auth.get_user, но пользователь берется из
+    кэша на AUTH_USER_CACHE_TIMEOUT секунд. Хэш сессии сверяется с
+    паролем закэшированного пользователя, поэтому смена пароля по-прежнему
+    завершает остальные сессии.
+    """
+    user = None
+    try:
+        user_id = get_user_model()._meta.pk.to_python(
+            request.session[SESSION_KEY]
+        )
+        backend_path = request.session[BACKEND_SESSION_KEY]
+    except KeyError:
+        pass
+    else:
+        if backend_path in settings.AUTHENTICATION_BACKENDS:
+            backend = load_backend(backend_path)
+            key = user_cache_key(user_id)
+            user = cache.get(key)
+            if user is None:
+                user = backend.get_user(user_id)
+                if user is not None:
+                    cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+            elif not getattr(
+                backend, 'user_can_authenticate', lambda user: True
+            )(user):
+                # та же проверка, что в get_user бэкенда (is_active)
+                forget_user(user_id)
+                user = None
+            if hasattr(user, 'get_session_auth_hash'):
+                session_hash = request.session.get(HASH_SESSION_KEY)
+                if not session_hash or not constant_time_compare(
+                    session_hash, user.get_session_auth_hash()
+                ):
+                    request.session.flush()
+                    user = None
+    return user or AnonymousUser()
+
+
+def forget_saved_user(sender, instance, **kwargs) -> None:
+    """Изменение или удаление пользователя сбрасывает его кэш."""
+    forget_user(instance.pk)
+
+
+def forget_logged_out_user(sender, request, user, **kwargs) -> None:
+    """Выход сбрасывает кэш пользователя."""
+    forget_user(getattr(user, 'pk', None))
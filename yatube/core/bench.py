@@ -0,0 +1,18 @@
+import itertools
+from typing import List
+
+
+def percentile(values: List[float], share: float) -> float:
+    """Перцентиль методом ближайшего ранга."""
+    ordered = sorted(values)
+    rank = max(int(round(share * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def zipf_weights(size: int, exponent: float) -> List[float]:
+    """Накопленные веса распределения Ципфа для size элементов."""
+    return list(
+        itertools.accumulate(
+            1 / rank**exponent for rank in range(1, size + 1)
+        )
+    )
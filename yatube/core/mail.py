@@ -0,0 +1,47 @@
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+from core.tasks import task
+
+
+def dump_message(message: Any) -> Dict[str, Any]:
+    """Письмо в виде, пригодном для JSON; вложения не поддерживаются."""
+    return {
+        'subject': message.subject,
+        'body': message.body,
+        'from_email': message.from_email,
+        'to': message.to,
+        'cc': message.cc,
+        'bcc': message.bcc,
+        'reply_to': message.reply_to,
+        'headers': message.extra_headers,
+        'alternatives': getattr(message, 'alternatives', []),
+    }
+
+
+@task
+def send_messages(messages: List[Dict[str, Any]]) -> None:
+    """Отправляет письма через TASKS_EMAIL_BACKEND."""
+    connection = get_connection(settings.TASKS_EMAIL_BACKEND)
+    connection.send_messages(
+        [EmailMultiAlternatives(**message) for message in messages]
+    )
+
+
+class TaskEmailBackend(BaseEmailBackend):
+    """
+    Почтовый бэкенд, который не отправляет письма в запросе, а ставит их
+    фоновой задачей: письмо сброса пароля и прочие письма уходят после
+    ответа пользователю.
+    """
+
+    def send_messages(self, email_messages: List[Any]) -> int:
+        if not email_messages:
+            return 0
+        send_messages.delay(
+            [dump_message(message) for message in email_messages]
+        )
+        return len(email_messages)
@@ -0,0 +1,171 @@
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from core.bench import percentile, zipf_weights
+
+# имя, класс бэкенда и LOCATION относительно временного каталога
+BACKENDS = (
+    ('locmem', 'django.core.cache.backends.locmem.LocMemCache', 'locmem'),
+    ('file', 'django.core.cache.backends.filebased.FileBasedCache', 'file'),
+    ('mmap', 'yatube.mmap_cache.MmapCache', 'cache.mmap'),
+)
+
+# не больше стольких замеров задержки на процесс
+LATENCY_SAMPLES = 20000
+
+
+def cache_params(name: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    if name == 'mmap':
+        return {
+            'OPTIONS': {
+                'SLOTS': options['keys'] * 2,
+                'SLOT_SIZE': options['value_size'] + 512,
+            }
+        }
+    return {'OPTIONS': {'MAX_ENTRIES': options['keys'] * 2}}
+
+
+def work(
+    backend: str,
+    location: str,
+    params: Dict[str, Any],
+    options: Dict[str, Any],
+    seed: int,
+    deadline: float,
+    results: Any,
+) -> None:
+    """
+    Процесс-воркер: читает ключи с распределением Ципфа, промах
+    заполняет кэш (cache-aside), часть операций - безусловная запись.
+    """
+    cache = import_string(backend)(location, params)
+    rng = random.Random(seed)
+    keys = range(options['keys'])
+    weights = zipf_weights(options['keys'], 1.1)
+    value = os.urandom(options['value_size'])
+    hits = misses = writes = 0
+    latencies: List[float] = []
+    while time.perf_counter() < deadline:
+        key = f'bench:{rng.choices(keys, cum_weights=weights)[0]}'
+        started = time.perf_counter()
+        if rng.random() < options['write_share']:
+            cache.set(key, value)
+            writes += 1
+        elif cache.get(key) is None:
+            misses += 1
+            cache.set(key, value)
+        else:
+            hits += 1
+        if len(latencies) < LATENCY_SAMPLES:
+            latencies.append(time.perf_counter() - started)
+    results.put((hits, misses, writes, latencies))
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагружает кэш из нескольких процессов и сравнивает LocMemCache, '
+        'FileBasedCache и MmapCache: пропускная способность, доля попаданий '
+        'и задержка операции.'
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('--processes', type=int, default=4)
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=5.0,
+            help='секунд нагрузки на каждый бэкенд',
+        )
+        parser.add_argument(
+            '--keys', type=int, default=2000, help='число разных ключей'
+        )
+        parser.add_argument(
+            '--value-size',
+            type=int,
+            default=4096,
+            help='размер значения в байтах',
+        )
+        parser.add_argument(
+            '--write-share',
+            type=float,
+            default=0.05,
+            help='доля безусловных записей',
+        )
+        parser.add_argument(
+            '--json',
+            dest='json_path',
+            help='файл для отчета в JSON, "-" - вывести в stdout',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        directory = Path(tempfile.mkdtemp(prefix='bench_cache_'))
+        try:
+            report = [
+                self.run_backend(name, backend, directory / location, options)
+                for name, backend, location in BACKENDS
+            ]
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        for row in report:
+            self.stdout.write(
+                f'{row["backend"]:<7} {row["ops_per_s"]:>10.0f} опер/с  '
+                f'попаданий {row["hit_ratio"]:>6.1%}  '
+                f'p50 {row["p50_us"]:>8.1f} мкс  p95 {row["p95_us"]:>8.1f} мкс'
+            )
+        if options['json_path'] == '-':
+            self.stdout.write(json.dumps(report, indent=2))
+        elif options['json_path']:
+            with open(options['json_path'], 'w') as report_file:
+                json.dump(report, report_file, indent=2)
+
+    def run_backend(
+        self, name: str, backend: str, location: Path, options: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        started = time.perf_counter()
+        deadline = started + options['duration']
+        workers = [
+            context.Process(
+                target=work,
+                args=(
+                    backend,
+                    str(location),
+                    cache_params(name, options),
+                    options,
+                    seed,
+                    deadline,
+                    results,
+                ),
+            )
+            for seed in range(options['processes'])
+        ]
+        for worker in workers:
+            worker.start()
+        rows = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+        hits = sum(row[0] for row in rows)
+        misses = sum(row[1] for row in rows)
+        writes = sum(row[2] for row in rows)
+        latencies = list(itertools.chain.from_iterable(row[3] for row in rows))
+        return {
+            'backend': name,
+            'processes': options['processes'],
+            'ops_per_s': (hits + misses + writes) / elapsed,
+            'hit_ratio': hits / max(hits + misses, 1),
+            'p50_us': percentile(latencies or [0], 0.50) * 1e6,
+            'p95_us': percentile(latencies or [0], 0.95) * 1e6,
+        }
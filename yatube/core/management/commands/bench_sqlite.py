@@ -0,0 +1,226 @@
+import json
+import random
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+from django.db.models import F
+
+from core.bench import percentile
+from posts.dataset import DatasetGenerator, explicit_post_dates
+from posts.models import AuthorCounter, Group, Post
+from yatube.sqlite import retry_on_lock
+
+User = get_user_model()
+
+# режим: прагмы соединения (None - SQLITE_PRAGMAS) и повтор при блокировке
+MODES = (
+    ('stock', {'journal_mode': 'delete'}, False),
+    ('tuned', None, True),
+)
+
+PAGES = 20
+
+
+class WorkerStats:
+    def __init__(self) -> None:
+        self.reads: List[float] = []
+        self.writes: List[float] = []
+        self.errors = 0
+
+
+def write_post(alias: str, author_id: int, text: str) -> None:
+    """Транзакция как у post_create: вставка поста и счетчик автора."""
+    Post.objects.using(alias).bulk_create(
+        [Post(text=text, author_id=author_id)]
+    )
+    AuthorCounter.objects.using(alias).filter(author_id=author_id).update(
+        posts_count=F('posts_count') + 1
+    )
+
+
+def read_page(alias: str, page: int) -> None:
+    """Чтение страницы главной ленты."""
+    per_page = settings.OBJECTS_PER_PAGE
+    list(
+        Post.objects.using(alias)
+        .select_related('author', 'group')
+        .order_by('-pub_date', '-pk')[
+            page * per_page:(page + 1) * per_page
+        ]
+    )
+
+
+def work(
+    alias: str,
+    write: Callable,
+    author_ids: List[int],
+    deadline: float,
+    write_share: float,
+    seed: int,
+    stats: WorkerStats,
+) -> None:
+    rng = random.Random(seed)
+    try:
+        while time.perf_counter() < deadline:
+            is_write = rng.random() < write_share
+            started = time.perf_counter()
+            try:
+                if is_write:
+                    write(alias, rng.choice(author_ids), f'Пост {seed}')
+                else:
+                    read_page(alias, rng.randrange(PAGES))
+            except OperationalError:
+                stats.errors += 1
+                continue
+            elapsed = time.perf_counter() - started
+            (stats.writes if is_write else stats.reads).append(elapsed)
+    finally:
+        connections[alias].close()
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагружает временную базу SQLite чтениями и записями из нескольких '
+        'потоков: без настроек (stock) и с прагмами SQLITE_PRAGMAS и '
+        'повтором транзакций при блокировке (tuned).'
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument(
+            '--duration',
+            type=float,
+            default=5.0,
+            help='секунд нагрузки на каждый режим',
+        )
+        parser.add_argument(
+            '--write-share',
+            type=float,
+            default=0.2,
+            help='доля операций записи',
+        )
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=2000)
+        parser.add_argument(
+            '--json',
+            dest='json_path',
+            help='файл для отчета в JSON, "-" - вывести в stdout',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        directory = Path(tempfile.mkdtemp(prefix='bench_sqlite_'))
+        try:
+            report = [
+                self.run_mode(name, pragmas, retry, directory, options)
+                for name, pragmas, retry in MODES
+            ]
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        for mode in report:
+            self.stdout.write(
+                f'{mode["mode"]:<6} {mode["ops_per_s"]:>9.0f} опер/с  '
+                f'чтение {mode["reads"]:>7} p95 {mode["read_p95_ms"]:>7.2f} '
+                f'мс  запись {mode["writes"]:>6} p95 '
+                f'{mode["write_p95_ms"]:>7.2f} мс  ошибок {mode["errors"]}'
+            )
+        if options['json_path'] == '-':
+            self.stdout.write(json.dumps(report, indent=2))
+        elif options['json_path']:
+            with open(options['json_path'], 'w') as report_file:
+                json.dump(report, report_file, indent=2)
+
+    def run_mode(
+        self,
+        name: str,
+        pragmas: Optional[Dict[str, Any]],
+        retry: bool,
+        directory: Path,
+        options: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        alias = f'bench_{name}'
+        connections.databases[alias] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': str(directory / f'{name}.sqlite3'),
+            'PRAGMAS': (
+                settings.SQLITE_PRAGMAS if pragmas is None else pragmas
+            ),
+        }
+        try:
+            call_command(
+                'migrate', database=alias, interactive=False, verbosity=0
+            )
+            author_ids = self.seed(alias, options)
+            write = (
+                retry_on_lock(write_post, using=alias)
+                if retry
+                else transaction.atomic(using=alias)(write_post)
+            )
+            stats = [WorkerStats() for _ in range(options['threads'])]
+            started = time.perf_counter()
+            deadline = started + options['duration']
+            threads = [
+                threading.Thread(
+                    target=work,
+                    args=(
+                        alias,
+                        write,
+                        author_ids,
+                        deadline,
+                        options['write_share'],
+                        number,
+                        worker_stats,
+                    ),
+                )
+                for number, worker_stats in enumerate(stats)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+        finally:
+            connections[alias].close()
+            del connections.databases[alias]
+        reads = [value for item in stats for value in item.reads]
+        writes = [value for item in stats for value in item.writes]
+        return {
+            'mode': name,
+            'threads': options['threads'],
+            'ops_per_s': (len(reads) + len(writes)) / elapsed,
+            'reads': len(reads),
+            'writes': len(writes),
+            'errors': sum(item.errors for item in stats),
+            'read_p95_ms': percentile(reads or [0], 0.95) * 1000,
+            'write_p95_ms': percentile(writes or [0], 0.95) * 1000,
+        }
+
+    def seed(self, alias: str, options: Dict[str, Any]) -> List[int]:
+        generator = DatasetGenerator()
+        User.objects.using(alias).bulk_create(
+            generator.users(options['users'])
+        )
+        Group.objects.using(alias).bulk_create(generator.groups(5))
+        author_ids = list(
+            User.objects.using(alias).values_list('pk', flat=True)
+        )
+        group_ids = list(
+            Group.objects.using(alias).values_list('pk', flat=True)
+        )
+        AuthorCounter.objects.using(alias).bulk_create(
+            AuthorCounter(author_id=author_id) for author_id in author_ids
+        )
+        with explicit_post_dates():
+            for batch in generator.posts(
+                options['posts'], author_ids, group_ids, 1000
+            ):
+                Post.objects.using(alias).bulk_create(batch)
+        return author_ids
@@ -0,0 +1,205 @@
+import json
+import time
+from typing import Any, Dict, Optional
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse
+
+from about import urls as about_urls
+from core.bench import percentile
+from core.timing import QueryTimer, RenderTimer
+from posts import urls as posts_urls
+from posts.dataset import seed_dataset
+from posts.models import Group, Post
+from users import urls as users_urls
+
+User = get_user_model()
+
+ROUTE_MODULES = (
+    ('posts', posts_urls),
+    ('users', users_urls),
+    ('about', about_urls),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет задержку, число и время SQL-запросов и время рендера '
+        'шаблонов для всех именованных маршрутов posts, users и about.'
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--groups', type=int, default=10)
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=20,
+            help='число запросов к каждому маршруту',
+        )
+        parser.add_argument(
+            '--json',
+            dest='json_path',
+            help='файл для отчета в JSON, "-" - вывести в stdout',
+        )
+        parser.add_argument(
+            '--in-place',
+            action='store_true',
+            help='работать с текущей базой вместо временной тестовой',
+        )
+        parser.add_argument(
+            '--no-seed',
+            action='store_true',
+            help='не наполнять базу, использовать имеющиеся данные',
+        )
+        parser.add_argument(
+            '--cold',
+            action='store_true',
+            help='очищать кэш перед каждым запросом',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options['in_place']:
+            report = self.run(options)
+        else:
+            setup_test_environment()
+            old_name = connection.creation.create_test_db(verbosity=0)
+            try:
+                report = self.run(options)
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+                teardown_test_environment()
+        self.print_table(report)
+        if options['json_path'] == '-':
+            self.stdout.write(json.dumps(report, indent=2))
+        elif options['json_path']:
+            with open(options['json_path'], 'w') as report_file:
+                json.dump(report, report_file, indent=2)
+
+    def run(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        if not options['no_seed']:
+            seed_dataset(options['users'], options['groups'], options['posts'])
+        user = (
+            User.objects.filter(posts__isnull=False)
+            .order_by('pk')
+            .first()
+        )
+        if user is None:
+            raise CommandError(
+                'Нет данных для замера, запустите без --no-seed.'
+            )
+        kwargs = {
+            'slug': Group.objects.values_list('slug', flat=True).first(),
+            'pk': user.posts.values_list('pk', flat=True).first(),
+            'username': user.username,
+        }
+        clients = {'anonymous': Client(), 'authorized': Client()}
+        routes = []
+        for namespace, module in ROUTE_MODULES:
+            for pattern in module.urlpatterns:
+                url = self.reverse_route(namespace, pattern, kwargs)
+                if url is None:
+                    continue
+                for mode, client in clients.items():
+                    route = self.measure(
+                        f'{namespace}:{pattern.name}',
+                        url,
+                        mode,
+                        client,
+                        user,
+                        options,
+                    )
+                    # маршруты только для POST на GET отвечают 405
+                    if route['status'] != 405:
+                        routes.append(route)
+        return {
+            'dataset': {
+                'users': User.objects.count(),
+                'groups': Group.objects.count(),
+                'posts': Post.objects.count(),
+            },
+            'requests': options['requests'],
+            'routes': routes,
+        }
+
+    def reverse_route(
+        self, namespace: str, pattern: Any, kwargs: Dict[str, Any]
+    ) -> Optional[str]:
+        route_kwargs = {
+            name: kwargs.get(name) for name in pattern.pattern.converters
+        }
+        if None in route_kwargs.values():
+            return None
+        return reverse(f'{namespace}:{pattern.name}', kwargs=route_kwargs)
+
+    def measure(
+        self,
+        name: str,
+        url: str,
+        mode: str,
+        client: Client,
+        user: Any,
+        options: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        latencies, queries, sql_times, render_times = [], [], [], []
+        status = None
+        for _ in range(options['requests']):
+            if mode == 'authorized':
+                client.force_login(user)
+            if options['cold']:
+                cache.clear()
+            query_timer = QueryTimer()
+            with connection.execute_wrapper(query_timer):
+                with RenderTimer().active() as render_timer:
+                    started = time.perf_counter()
+                    status = client.get(url).status_code
+                    latencies.append(time.perf_counter() - started)
+            queries.append(query_timer.count)
+            sql_times.append(query_timer.total)
+            render_times.append(render_timer.total)
+        return {
+            'route': name,
+            'mode': mode,
+            'url': url,
+            'status': status,
+            'p50_ms': percentile(latencies, 0.50) * 1000,
+            'p95_ms': percentile(latencies, 0.95) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+            'queries': max(queries),
+            'sql_ms': percentile(sql_times, 0.50) * 1000,
+            'render_ms': percentile(render_times, 0.50) * 1000,
+        }
+
+    def print_table(self, report: Dict[str, Any]) -> None:
+        columns = (
+            ('route', 'маршрут', '<22'),
+            ('mode', 'режим', '<10'),
+            ('status', 'код', '>4'),
+            ('p50_ms', 'p50 мс', '>8.2f'),
+            ('p95_ms', 'p95 мс', '>8.2f'),
+            ('p99_ms', 'p99 мс', '>8.2f'),
+            ('queries', 'SQL', '>4'),
+            ('sql_ms', 'SQL мс', '>8.2f'),
+            ('render_ms', 'шаблоны мс', '>10.2f'),
+        )
+        self.stdout.write(
+            ' '.join(
+                format(title, spec.split('.')[0])
+                for _, title, spec in columns
+            )
+        )
+        for route in report['routes']:
+            self.stdout.write(
+                ' '.join(
+                    format(route[key], spec) for key, _, spec in columns
+                )
+            )
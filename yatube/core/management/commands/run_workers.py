@@ -0,0 +1,63 @@
+import threading
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from core.tasks import claim_task, process_task
+
+
+class Command(BaseCommand):
+    help = 'Выполняет фоновые задачи из очереди в базе (TASKS_BACKEND).'
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            '--workers', type=int, default=2, help='число потоков-работников'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='пауза в секундах, когда очередь пуста',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='выполнить доступные задачи и завершиться',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        stop = threading.Event()
+        workers = [
+            threading.Thread(
+                target=self.work,
+                args=(stop, options),
+                name=f'worker-{number}',
+                daemon=True,
+            )
+            for number in range(options['workers'])
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                while worker.is_alive():
+                    worker.join(0.5)
+        except KeyboardInterrupt:
+            stop.set()
+            for worker in workers:
+                worker.join()
+        self.stdout.write(self.style.SUCCESS('Работники остановлены.'))
+
+    def work(self, stop: threading.Event, options: Any) -> None:
+        try:
+            while not stop.is_set():
+                claimed = claim_task()
+                if claimed is not None:
+                    process_task(claimed)
+                elif options['once']:
+                    return
+                else:
+                    stop.wait(options['poll_interval'])
+        finally:
+            connections.close_all()
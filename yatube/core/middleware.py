@@ -0,0 +1,177 @@
+import logging
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Callable
+
+from django.conf import settings
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils.cache import patch_vary_headers
+from django.utils.functional import SimpleLazyObject
+
+from core.auth import get_cached_user
+from core.profiling import profile_templates
+from core.timing import QueryTimer, RenderTimer
+from yatube.routers import replica_reads
+
+logger = logging.getLogger('core.timing')
+
+
+class ServerTimingMiddleware:
+    """
+    Замеряет число и время SQL-запросов, время рендера шаблонов и общее
+    время обработки запроса. Итог отдается в заголовке Server-Timing и
+    пишется строкой key=value в логгер core.timing с уровнем INFO.
+    Для потоковых ответов учитывается только работа до первого байта.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: Any) -> Any:
+        query_timer = QueryTimer()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(query_timer)
+                )
+            render_timer = stack.enter_context(RenderTimer().active())
+            response = self.get_response(request)
+        total = time.perf_counter() - started
+        response['Server-Timing'] = ', '.join(
+            (
+                f'db;desc="{query_timer.count} queries";'
+                f'dur={query_timer.total * 1000:.1f}',
+                f'tpl;dur={render_timer.total * 1000:.1f}',
+                f'total;dur={total * 1000:.1f}',
+            )
+        )
+        match = request.resolver_match
+        route = match.view_name if match else '-'
+        logger.info(
+            'route=%s method=%s status=%s queries=%d db_ms=%.1f '
+            'tpl_ms=%.1f total_ms=%.1f',
+            route,
+            request.method,
+            response.status_code,
+            query_timer.count,
+            query_timer.total * 1000,
+            render_timer.total * 1000,
+            total * 1000,
+            extra={
+                'route': route,
+                'queries': query_timer.count,
+                'db_ms': query_timer.total * 1000,
+                'tpl_ms': render_timer.total * 1000,
+                'total_ms': total * 1000,
+            },
+        )
+        return response
+
+
+class TemplateProfilerMiddleware:
+    """
+    Профилирует рендер шаблонов каждого запроса, если задан
+    TEMPLATE_PROFILE_DIR: в каталог пишутся отчет <имя>.txt и стеки
+    <имя>.folded для flamegraph. Без настройки middleware отключается.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        if not settings.TEMPLATE_PROFILE_DIR:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.directory = Path(settings.TEMPLATE_PROFILE_DIR)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def __call__(self, request: Any) -> Any:
+        with profile_templates() as profile:
+            response = self.get_response(request)
+        if not profile.calls:
+            return response
+        match = request.resolver_match
+        route = match.view_name.replace(':', '.') if match else 'unresolved'
+        name = f'{time.time_ns()}-{route}'
+        (self.directory / f'{name}.txt').write_text(
+            f'{request.method} {request.get_full_path()}\n'
+            + profile.report(),
+            encoding='utf-8',
+        )
+        with open(
+            self.directory / f'{name}.folded', 'w', encoding='utf-8'
+        ) as stream:
+            profile.write_collapsed(stream)
+        return response
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Включает чтение с реплик для запроса. Если запрос что-то записал,
+    ответ ставит cookie, и следующие REPLICA_STICKY_SECONDS секунд чтения
+    пользователя идут в основную базу: он сразу видит свои изменения.
+    Должен стоять перед SessionMiddleware, чтобы учитывать запись сессии.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: Any) -> Any:
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+        pinned = settings.REPLICA_STICKY_COOKIE in request.COOKIES
+        with replica_reads(pinned) as state:
+            response = self.get_response(request)
+        if state.wrote:
+            response.set_cookie(
+                settings.REPLICA_STICKY_COOKIE,
+                '1',
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    AuthenticationMiddleware, который берет пользователя сессии из кэша:
+    вместе с сессиями cached_db вошедший пользователь обходится без
+    запросов к django_session и auth_user.
+    """
+
+    def process_request(self, request: Any) -> None:
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
+
+
+class AnonymousFastPathMiddleware:
+    """
+    GET-запросы к view с public_page без cookie сессии получают готового
+    AnonymousUser вместо ленивого пользователя из сессии, поэтому ни
+    сессия, ни auth, ни хранилище messages не трогаются. Vary: Cookie
+    ставится явно, чтобы кэши не отдали такую страницу вошедшему
+    пользователю. Должен стоять после AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: Any) -> Any:
+        response = self.get_response(request)
+        if getattr(request, 'anonymous_fast_path', False):
+            patch_vary_headers(response, ('Cookie',))
+        return response
+
+    def process_view(
+        self, request: Any, view: Callable, args: Any, kwargs: Any
+    ) -> None:
+        if (
+            request.method in ('GET', 'HEAD')
+            and getattr(view, 'public_page', False)
+            and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        ):
+            request.user = AnonymousUser()
+            request.anonymous_fast_path = True
@@ -0,0 +1,21 @@
+from django.db import models
+
+
+class Task(models.Model):
+    """Отложенная задача очереди в базе, ее выполняет run_workers."""
+
+    name = models.CharField('задача', max_length=200)
+    payload = models.TextField('аргументы в JSON')
+    attempts = models.PositiveSmallIntegerField('число попыток', default=0)
+    available_at = models.DateTimeField(
+        'доступна для выполнения с', db_index=True
+    )
+    last_error = models.TextField('последняя ошибка', blank=True)
+    created = models.DateTimeField('дата и время создания', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'фоновая задача'
+        verbose_name_plural = 'фоновые задачи'
+
+    def __str__(self) -> str:
+        return self.name
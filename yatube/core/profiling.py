@@ -0,0 +1,153 @@
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import IO, Any, Callable, Iterator, List, Optional
+
+from django.template import engines
+from django.template.base import Node, Template, TextNode, VariableNode
+
+_profile: ContextVar[Optional['TemplateProfile']] = ContextVar(
+    'template_profile', default=None
+)
+
+_installed = False
+
+
+class TemplateProfile:
+    """
+    Время рендера по кадрам: шаблонам, тегам и контекст-процессорам.
+    Собственное время кадра - полное время без времени вложенных кадров.
+    """
+
+    def __init__(self) -> None:
+        self.stack: List[list] = []
+        self.calls: Counter = Counter()
+        self.cumulative: defaultdict = defaultdict(float)
+        self.own: defaultdict = defaultdict(float)
+        self.stacks: defaultdict = defaultdict(float)
+
+    def push(self, name: str) -> list:
+        frame = [name, 0.0, time.perf_counter()]
+        self.stack.append(frame)
+        return frame
+
+    def pop(self, frame: list) -> None:
+        name, children, started = frame
+        elapsed = time.perf_counter() - started
+        path = ';'.join(entry[0] for entry in self.stack)
+        self.stack.pop()
+        self.calls[name] += 1
+        self.own[name] += elapsed - children
+        self.stacks[path] += elapsed - children
+        # при рекурсии время учитывается один раз, во внешнем кадре
+        if all(entry[0] != name for entry in self.stack):
+            self.cumulative[name] += elapsed
+        if self.stack:
+            self.stack[-1][1] += elapsed
+
+    def report(self) -> str:
+        """Таблица кадров по убыванию собственного времени."""
+        lines = [
+            f'{"собств. мс":>11} {"всего мс":>10} {"вызовы":>7} '
+            f'{"мс/вызов":>9}  кадр'
+        ]
+        for name, own in sorted(
+            self.own.items(), key=lambda item: item[1], reverse=True
+        ):
+            calls = self.calls[name]
+            lines.append(
+                f'{own * 1000:>11.3f} {self.cumulative[name] * 1000:>10.3f} '
+                f'{calls:>7} {self.cumulative[name] * 1000 / calls:>9.3f}'
+                f'  {name}'
+            )
+        return '\n'.join(lines) + '\n'
+
+    def write_collapsed(self, stream: IO[str]) -> None:
+        """Стеки в формате collapsed (flamegraph.pl, speedscope), в мкс."""
+        for path, own in sorted(self.stacks.items()):
+            stream.write(f'{path} {max(round(own * 1e6), 1)}\n')
+
+
+def profiled(name: str, function: Callable, *args: Any) -> Any:
+    profile = _profile.get()
+    if profile is None:
+        return function(*args)
+    frame = profile.push(name)
+    try:
+        return function(*args)
+    finally:
+        profile.pop(frame)
+
+
+def install_profiling_hooks() -> None:
+    """
+    Один раз оборачивает Template._render (через него рендерятся и
+    родительские шаблоны {% extends %}), Node.render_annotated и
+    контекст-процессоры движков шаблонов. Вне profile_templates()
+    каждая обертка стоит одного чтения ContextVar.
+    """
+    global _installed
+    if _installed:
+        return
+    _installed = True
+    original_render = Template._render
+    original_render_annotated = Node.render_annotated
+
+    def render(template: Template, context: Any) -> Any:
+        if _profile.get() is None:
+            return original_render(template, context)
+        return profiled(
+            f'template:{template.name or "<string>"}',
+            original_render,
+            template,
+            context,
+        )
+
+    def render_annotated(node: Node, context: Any) -> Any:
+        if _profile.get() is None or isinstance(
+            node, (TextNode, VariableNode)
+        ):
+            return original_render_annotated(node, context)
+        token = getattr(node, 'token', None)
+        tag = token.contents.split(None, 1)[0] if token else None
+        return profiled(
+            f'tag:{tag or type(node).__name__}',
+            original_render_annotated,
+            node,
+            context,
+        )
+
+    Template._render = render
+    Node.render_annotated = render_annotated
+    for backend in engines.all():
+        engine = getattr(backend, 'engine', None)
+        if engine is None:
+            continue
+        engine.template_context_processors = tuple(
+            profile_processor(processor)
+            for processor in engine.template_context_processors
+        )
+
+
+def profile_processor(processor: Callable) -> Callable:
+    name = f'context_processor:{processor.__module__}.{processor.__name__}'
+
+    @wraps(processor)
+    def wrapper(request: Any) -> Any:
+        return profiled(name, processor, request)
+
+    return wrapper
+
+
+@contextmanager
+def profile_templates() -> Iterator[TemplateProfile]:
+    """Собирает профиль рендера шаблонов внутри блока with."""
+    install_profiling_hooks()
+    profile = TemplateProfile()
+    token = _profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _profile.reset(token)
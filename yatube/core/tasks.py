@@ -0,0 +1,183 @@
+import datetime as dt
+import json
+import logging
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from core.models import Task
+
+logger = logging.getLogger('core.tasks')
+
+
+def task(function: Callable) -> Callable:
+    """
+    Регистрирует функцию как фоновую задачу. function.delay(*args,
+    **kwargs) ставит ее в очередь вместе с текущей транзакцией
+    (см. enqueue); аргументы должны сериализоваться в JSON. Задача
+    объявляется на уровне модуля: работник находит ее по пути модуля и
+    имени.
+    """
+    name = f'{function.__module__}.{function.__qualname__}'
+
+    @wraps(function)
+    def delay(*args: Any, **kwargs: Any) -> None:
+        enqueue(name, *args, **kwargs)
+
+    function.task_name = name
+    function.delay = delay
+    return function
+
+
+def enqueue(name: str, *args: Any, **kwargs: Any) -> None:
+    """
+    Передает задачу бэкенду TASKS_BACKEND. Транзакционный бэкенд пишет
+    задачу в той же транзакции, что и данные: она фиксируется и
+    откатывается вместе с ними и не теряется при падении процесса сразу
+    после фиксации. Остальным задача передается после фиксации, при
+    откате она не ставится. Вне транзакции задача ставится сразу.
+    """
+    payload = json.dumps({'args': args, 'kwargs': kwargs})
+    backend = get_backend()
+    if getattr(backend, 'transactional', False):
+        backend.submit(name, payload)
+    else:
+        transaction.on_commit(lambda: backend.submit(name, payload))
+
+
+def run_task(name: str, payload: str) -> None:
+    function = import_string(name)
+    if getattr(function, 'task_name', None) != name:
+        raise ValueError(f'{name} не является фоновой задачей')
+    data = json.loads(payload)
+    function(*data['args'], **data['kwargs'])
+
+
+def retry_delay(attempts: int) -> float:
+    """Задержка перед повтором: TASKS_RETRY_DELAY, растущая вдвое."""
+    return settings.TASKS_RETRY_DELAY * 2 ** (attempts - 1)
+
+
+class ImmediateBackend:
+    """Выполняет задачу сразу в текущем потоке, ошибки пробрасываются."""
+
+    def submit(self, name: str, payload: str) -> None:
+        run_task(name, payload)
+
+
+class ThreadBackend:
+    """
+    Пул потоков процесса для разработки: задачи не переживают перезапуск
+    процесса. Упавшая задача повторяется по таймеру до TASKS_MAX_ATTEMPTS.
+    """
+
+    def __init__(self) -> None:
+        self.executor = ThreadPoolExecutor(
+            max_workers=settings.TASKS_THREADS,
+            thread_name_prefix='tasks',
+        )
+
+    def submit(self, name: str, payload: str, attempts: int = 0) -> None:
+        self.executor.submit(self.run, name, payload, attempts + 1)
+
+    def run(self, name: str, payload: str, attempts: int) -> None:
+        try:
+            run_task(name, payload)
+        except Exception:
+            logger.exception('task=%s attempt=%d failed', name, attempts)
+            if attempts < settings.TASKS_MAX_ATTEMPTS:
+                timer = threading.Timer(
+                    retry_delay(attempts),
+                    self.submit,
+                    (name, payload, attempts),
+                )
+                timer.daemon = True
+                timer.start()
+        finally:
+            # соединения потоков пула иначе остаются открытыми
+            connections.close_all()
+
+
+class DatabaseBackend:
+    """
+    Надежная очередь в таблице core_task, задачи выполняет run_workers.
+    Задача записывается в транзакции вызывающего кода, работник увидит ее
+    только после фиксации.
+    """
+
+    transactional = True
+
+    def submit(self, name: str, payload: str) -> None:
+        Task.objects.create(
+            name=name, payload=payload, available_at=timezone.now()
+        )
+
+
+BACKENDS = {
+    'immediate': ImmediateBackend,
+    'thread': ThreadBackend,
+    'database': DatabaseBackend,
+}
+
+_backends: Dict[str, Any] = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend() -> Any:
+    with _backends_lock:
+        name = settings.TASKS_BACKEND
+        if name not in _backends:
+            _backends[name] = BACKENDS[name]()
+        return _backends[name]
+
+
+def claim_task() -> Optional[Task]:
+    """
+    Забирает доступную задачу: попытка засчитывается, и задача становится
+    невидимой для других работников на TASKS_VISIBILITY_TIMEOUT секунд.
+    Если работник упадет, не завершив задачу, она вернется в очередь.
+    Условный UPDATE по старому available_at не дает двум работникам
+    забрать одну задачу.
+    """
+    now = timezone.now()
+    candidates = Task.objects.filter(
+        available_at__lte=now, attempts__lt=settings.TASKS_MAX_ATTEMPTS
+    ).order_by('available_at', 'pk')
+    for claimed in candidates[:10]:
+        lease = now + dt.timedelta(seconds=settings.TASKS_VISIBILITY_TIMEOUT)
+        if Task.objects.filter(
+            pk=claimed.pk, available_at=claimed.available_at
+        ).update(available_at=lease, attempts=F('attempts') + 1):
+            claimed.available_at = lease
+            claimed.attempts += 1
+            return claimed
+    return None
+
+
+def process_task(claimed: Task) -> None:
+    """
+    Выполняет забранную задачу. Успешная задача удаляется, упавшая
+    возвращается в очередь с задержкой; после TASKS_MAX_ATTEMPTS попыток
+    она остается в таблице с последней ошибкой и больше не выполняется.
+    """
+    try:
+        run_task(claimed.name, claimed.payload)
+    except Exception:
+        logger.exception(
+            'task=%s attempt=%d failed', claimed.name, claimed.attempts
+        )
+        Task.objects.filter(pk=claimed.pk).update(
+            available_at=timezone.now()
+            + dt.timedelta(seconds=retry_delay(claimed.attempts)),
+            last_error=traceback.format_exc(),
+        )
+    else:
+        Task.objects.filter(pk=claimed.pk).delete()
@@ -0,0 +1,63 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+User = get_user_model()
+
+# таблицы, которые читают сами страницы: посты, группы, авторы, отметки лент
+FEED_TABLES = ('"posts_', '"auth_user"')
+
+
+class AnonymousFastPathTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = mixer.blend(User, username='kir')
+        cls.group = mixer.blend('posts.Group', slug='test-slug')
+        cls.post = mixer.blend(
+            'posts.Post', author=cls.author, group=cls.group
+        )
+        cls.public_urls = (
+            reverse('posts:h_page'),
+            reverse('posts:page_post', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile', kwargs={'username': cls.author}),
+            reverse('posts:post_detail', kwargs={'pk': cls.post.pk}),
+            reverse('posts:search') + '?q=test',
+            reverse('about:author'),
+            reverse('about:tech'),
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_public_pages_skip_session_auth_and_messages(self):
+        """Анонимные GET публичных страниц не трогают сессию и messages."""
+        for url in self.public_urls:
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as context:
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                for query in context.captured_queries:
+                    self.assertTrue(
+                        any(table in query['sql'] for table in FEED_TABLES),
+                        query['sql'],
+                    )
+                    self.assertNotIn('django_session', query['sql'])
+                request = response.wsgi_request
+                self.assertTrue(request.anonymous_fast_path)
+                self.assertFalse(request.session.accessed)
+                self.assertFalse(request._messages.used)
+                self.assertIn('Cookie', response['Vary'])
+
+    def test_session_cookie_takes_regular_path(self):
+        """С cookie сессии и для закрытых страниц работает обычный путь."""
+        client = Client()
+        client.force_login(self.author)
+        response = client.get(reverse('posts:h_page'))
+        self.assertFalse(hasattr(response.wsgi_request, 'anonymous_fast_path'))
+        self.assertContains(response, 'Пользователь: kir')
+        response = self.client.get(reverse('posts:post_create'))
+        self.assertFalse(hasattr(response.wsgi_request, 'anonymous_fast_path'))
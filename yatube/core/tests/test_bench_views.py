@@ -0,0 +1,51 @@
+import json
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+
+class BenchViewsCommandTests(TestCase):
+    def setUp(self):
+        # пользователи из кэша других тестов не должны сбрасывать сессию
+        cache.clear()
+
+    def test_bench_views_reports_every_route(self):
+        """Команда замеряет все маршруты в обоих режимах и пишет JSON."""
+        stdout = StringIO()
+        call_command(
+            'bench_views',
+            users=3,
+            groups=2,
+            posts=15,
+            requests=2,
+            in_place=True,
+            json_path='-',
+            stdout=stdout,
+        )
+        output = stdout.getvalue()
+        report = json.loads(output[output.index('{'):])
+        self.assertEqual(report['dataset']['posts'], 15)
+        routes = {
+            (route['route'], route['mode']) for route in report['routes']
+        }
+        self.assertIn(('posts:h_page', 'anonymous'), routes)
+        self.assertIn(('posts:post_edit', 'authorized'), routes)
+        self.assertIn(('about:tech', 'authorized'), routes)
+        self.assertIn(('posts:search', 'anonymous'), routes)
+        statuses = {
+            (route['route'], route['mode']): route['status']
+            for route in report['routes']
+        }
+        self.assertEqual(statuses[('posts:follow_index', 'authorized')], 200)
+        for route in report['routes']:
+            self.assertLess(route['status'], 400, route['route'])
+            self.assertGreaterEqual(route['p99_ms'], route['p50_ms'])
+
+    def test_bench_views_without_data_reports_error(self):
+        """Без постов в базе и с --no-seed команда сообщает об ошибке."""
+        with self.assertRaisesMessage(CommandError, 'без --no-seed'):
+            call_command(
+                'bench_views', in_place=True, no_seed=True, stdout=StringIO()
+            )
@@ -0,0 +1,92 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.auth import forget_users, user_cache_key
+
+User = get_user_model()
+
+AUTH_TABLES = ('"django_session"', '"auth_user"')
+
+
+class CachedAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        # свой экземпляр на тест: тесты меняют пароль и имя пользователя
+        self.user = User.objects.create_user(
+            username='kir', password='old-password'
+        )
+        self.client.force_login(self.user)
+        self.url = reverse('posts:post_create')
+
+    def auth_queries(self, client=None):
+        with CaptureQueriesContext(connection) as context:
+            response = (client or self.client).get(self.url)
+        queries = [
+            query['sql']
+            for query in context.captured_queries
+            if any(table in query['sql'] for table in AUTH_TABLES)
+        ]
+        return response, queries
+
+    def test_logged_in_requests_skip_session_and_user(self):
+        """Повторный запрос вошедшего не читает сессию и пользователя."""
+        response, _ = self.auth_queries()
+        self.assertEqual(response.context['user'], self.user)
+        response, queries = self.auth_queries()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['user'], self.user)
+        self.assertEqual(queries, [])
+
+    def test_user_changes_reset_cache(self):
+        """Изменение пользователя видно на следующем запросе."""
+        self.auth_queries()
+        self.user.first_name = 'Кирилл'
+        self.user.save()
+        response, queries = self.auth_queries()
+        self.assertEqual(response.context['user'].first_name, 'Кирилл')
+        self.assertEqual(len(queries), 1)
+
+    def test_password_change_ends_other_sessions(self):
+        """Смена пароля завершает сессии, открытые со старым паролем."""
+        self.auth_queries()
+        self.user.set_password('new-password')
+        self.user.save()
+        response, _ = self.auth_queries()
+        self.assertRedirects(
+            response, f'{reverse("users:login")}?next={self.url}'
+        )
+
+    def test_logout_resets_cache(self):
+        """После выхода пользователь снова читается из базы."""
+        other = Client()
+        other.force_login(self.user)
+        self.auth_queries(other)
+        self.client.get(reverse('users:logout'))
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        _, queries = self.auth_queries(other)
+        self.assertEqual(
+            len([sql for sql in queries if '"auth_user"' in sql]), 1
+        )
+
+    def test_inactive_user_is_logged_out(self):
+        """Отключенный пользователь не проходит даже из кэша."""
+        self.auth_queries()
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        stale = cache.get(user_cache_key(self.user.pk))
+        stale.is_active = False
+        cache.set(user_cache_key(self.user.pk), stale)
+        response, _ = self.auth_queries()
+        self.assertEqual(response.status_code, 302)
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+
+    def test_bulk_update_is_seen_after_forget_users(self):
+        """После update и forget_users пользователь читается заново."""
+        self.auth_queries()
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        forget_users([self.user.pk])
+        response, _ = self.auth_queries()
+        self.assertEqual(response.status_code, 302)
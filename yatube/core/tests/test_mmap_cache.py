@@ -0,0 +1,147 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+from io import StringIO
+from pathlib import Path
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from yatube.mmap_cache import WAYS, MmapCache
+
+
+def make_cache(path, slots=64, slot_size=1024):
+    return MmapCache(
+        str(path), {'OPTIONS': {'SLOTS': slots, 'SLOT_SIZE': slot_size}}
+    )
+
+
+def increment(path, times):
+    cache = make_cache(path)
+    for _ in range(times):
+        cache.incr('counter')
+
+
+class MmapCacheTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / 'cache'
+        self.cache = make_cache(self.path)
+
+    def test_basic_operations(self):
+        """Чтение, запись, add, incr, touch, удаление и очистка."""
+        self.cache.set('key', {'value': 1})
+        self.assertEqual(self.cache.get('key'), {'value': 1})
+        self.assertIsNone(self.cache.get('missing'))
+        self.assertFalse(self.cache.add('key', 2))
+        self.assertTrue(self.cache.add('new', 2))
+        self.cache.set('counter', 1)
+        self.assertEqual(self.cache.incr('counter', 4), 5)
+        with self.assertRaises(ValueError):
+            self.cache.incr('missing')
+        self.assertTrue(self.cache.has_key('new'))
+        self.assertTrue(self.cache.touch('new', 0))
+        self.assertIsNone(self.cache.get('new'))
+        self.cache.set('long', 'x' * 5000)
+        self.assertEqual(self.cache.get('long'), 'x' * 5000)
+        self.cache.delete('key')
+        self.assertIsNone(self.cache.get('key'))
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('counter'))
+
+    def test_oversized_value_drops_old_one(self):
+        """Значение больше слота не кэшируется и не оставляет старое."""
+        self.cache.set('key', 'old')
+        self.cache.set('key', os.urandom(2048))
+        self.assertIsNone(self.cache.get('key'))
+
+    def test_least_recently_used_is_evicted(self):
+        """Из полного набора вытесняется давно не читанный ключ."""
+        cache = make_cache(self.path.with_name('single_set'), slots=WAYS)
+        for number in range(WAYS):
+            cache.set(number, number)
+        cache.get(0)
+        cache.set('extra', 'value')
+        self.assertEqual(cache.get(0), 0)
+        self.assertIsNone(cache.get(1))
+        self.assertEqual(cache.get('extra'), 'value')
+
+    def test_cache_is_shared_between_processes(self):
+        """Процессы видят записи друг друга, incr не теряет обновлений."""
+        self.cache.set('counter', 0)
+        context = multiprocessing.get_context('fork')
+        workers = [
+            context.Process(target=increment, args=(self.path, 200))
+            for _ in range(3)
+        ]
+        for worker in workers:
+            worker.start()
+        threads = [
+            threading.Thread(target=increment, args=(self.path, 200))
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for worker in workers + threads:
+            worker.join()
+        self.assertEqual(self.cache.get('counter'), 1000)
+
+    def test_foreign_or_open_files_are_rejected(self):
+        """Файл или каталог, доступные другим пользователям, не читаются."""
+        self.cache.set('key', 'value')
+        self.path.chmod(0o666)
+        with self.assertRaises(ImproperlyConfigured):
+            make_cache(self.path).get('key')
+        self.path.chmod(0o600)
+        self.path.parent.chmod(0o777)
+        self.addCleanup(self.path.parent.chmod, 0o700)
+        with self.assertRaises(ImproperlyConfigured):
+            make_cache(self.path).get('key')
+
+    def test_private_directory_is_created(self):
+        """Недостающий каталог кэша создается с правами 0700."""
+        path = self.path.with_name('nested') / 'cache'
+        make_cache(path).set('key', 'value')
+        self.assertEqual(path.parent.stat().st_mode & 0o777, 0o700)
+        self.assertEqual(path.stat().st_mode & 0o777, 0o600)
+
+    def test_truncated_file_is_extended(self):
+        """Обрезанный другим процессом файл дополняется пустыми слотами."""
+        self.cache.set('key', 'value')
+        os.truncate(self.path, 200)
+        cache = make_cache(self.path)
+        self.assertIsNone(cache.get('missing'))
+        cache.set('other', 'value')
+        self.assertEqual(cache.get('other'), 'value')
+
+    def test_geometry_mismatch_is_reported(self):
+        """Файл с другой геометрией слотов не переписывается молча."""
+        self.cache.set('key', 'value')
+        with self.assertRaises(ImproperlyConfigured):
+            make_cache(self.path, slots=128).get('key')
+
+
+class BenchCacheCommandTests(SimpleTestCase):
+    def test_bench_cache_reports_every_backend(self):
+        """Команда нагружает все бэкенды из нескольких процессов."""
+        stdout = StringIO()
+        call_command(
+            'bench_cache',
+            processes=2,
+            duration=0.2,
+            keys=50,
+            value_size=256,
+            json_path='-',
+            stdout=stdout,
+        )
+        output = stdout.getvalue()
+        report = json.loads(output[output.index('['):])
+        self.assertEqual(
+            [row['backend'] for row in report], ['locmem', 'file', 'mmap']
+        )
+        for row in report:
+            self.assertGreater(row['ops_per_s'], 0)
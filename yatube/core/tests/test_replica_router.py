@@ -0,0 +1,111 @@
+import copy
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post
+from yatube.routers import PRIMARY, ReplicaRouter, replica_reads
+
+User = get_user_model()
+
+REPLICA = 'replica'
+
+REPLICA_SETTINGS = {
+    'ENGINE': 'django.db.backends.sqlite3',
+    'NAME': str(Path(tempfile.gettempdir()) / 'yatube_replica.sqlite3'),
+    'TEST': {
+        'NAME': str(
+            Path(tempfile.gettempdir()) / 'test_yatube_replica.sqlite3'
+        ),
+    },
+}
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRouterTests(TransactionTestCase):
+    databases = {PRIMARY, REPLICA}
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        # вторая SQLite-база изображает отстающую реплику основной; она
+        # существует только на время этих тестов
+        connections.databases[REPLICA] = copy.deepcopy(REPLICA_SETTINGS)
+        connections.ensure_defaults(REPLICA)
+        connections.prepare_test_settings(REPLICA)
+        connections[REPLICA].creation.create_test_db(
+            verbosity=0, autoclobber=True
+        )
+        try:
+            super().setUpClass()
+        except Exception:
+            cls.drop_replica()
+            raise
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        try:
+            super().tearDownClass()
+        finally:
+            cls.drop_replica()
+
+    @classmethod
+    def drop_replica(cls) -> None:
+        connections[REPLICA].creation.destroy_test_db(
+            REPLICA_SETTINGS['NAME'], verbosity=0
+        )
+        del connections.databases[REPLICA]
+        delattr(connections._connections, REPLICA)
+
+    def setUp(self) -> None:
+        cache.clear()
+        self.user_author = User.objects.create_user(username='author_post')
+        self.user_author.save(using=REPLICA)
+        Post.objects.create(author=self.user_author, text='Тестовый пост')
+        self.profile_url = reverse(
+            'posts:profile', kwargs={'username': self.user_author}
+        )
+
+    def test_views_read_from_replica(self) -> None:
+        """Анонимные чтения идут на реплику, где поста еще нет."""
+        self.assertEqual(Post.objects.using(PRIMARY).count(), 1)
+        response = self.client.get(reverse('posts:h_page'))
+        self.assertEqual(len(response.context['page_obj']), 0)
+        response = self.client.get(self.profile_url)
+        self.assertEqual(len(response.context['page_obj']), 0)
+
+    def test_writer_reads_own_posts(self) -> None:
+        """После записи чтения пользователя идут в основную базу."""
+        self.client.force_login(self.user_author)
+        Session.objects.using(REPLICA).bulk_create(Session.objects.all())
+        response = self.client.get(self.profile_url)
+        self.assertEqual(len(response.context['page_obj']), 0)
+        response = self.client.post(
+            reverse('posts:post_create'), data={'text': 'Новый пост'}
+        )
+        cookie = response.cookies[settings.REPLICA_STICKY_COOKIE]
+        self.assertEqual(cookie['max-age'], settings.REPLICA_STICKY_SECONDS)
+        response = self.client.get(self.profile_url)
+        self.assertEqual(len(response.context['page_obj']), 2)
+        del self.client.cookies[settings.REPLICA_STICKY_COOKIE]
+        response = self.client.get(self.profile_url)
+        self.assertEqual(len(response.context['page_obj']), 0)
+
+    def test_router_rules(self) -> None:
+        """Вне запроса, после записи и в транзакции читается default."""
+        router = ReplicaRouter()
+        self.assertEqual(router.db_for_read(Post), PRIMARY)
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Post), REPLICA)
+            with transaction.atomic():
+                self.assertEqual(router.db_for_read(Post), PRIMARY)
+            self.assertEqual(router.db_for_write(Post), PRIMARY)
+            self.assertEqual(router.db_for_read(Post), PRIMARY)
+        with replica_reads(pinned=True):
+            self.assertEqual(router.db_for_read(Post), PRIMARY)
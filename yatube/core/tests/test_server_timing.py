@@ -0,0 +1,40 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+User = get_user_model()
+
+SERVER_TIMING = re.compile(
+    r'^db;desc="(\d+) queries";dur=[\d.]+, '
+    r'tpl;dur=([\d.]+), total;dur=[\d.]+$'
+)
+
+
+class ServerTimingMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = mixer.blend(User, username='kir')
+        cls.post = mixer.blend('posts.Post', author=cls.author)
+
+    def test_header_and_log_line(self):
+        """Ответ несет Server-Timing, в лог пишется строка с маршрутом."""
+        url = reverse('posts:post_detail', kwargs={'pk': self.post.pk})
+        with self.assertLogs('core.timing', 'INFO') as logs:
+            response = self.client.get(url)
+        match = SERVER_TIMING.match(response['Server-Timing'])
+        self.assertIsNotNone(match, response['Server-Timing'])
+        self.assertGreater(int(match.group(1)), 0)
+        self.assertGreater(float(match.group(2)), 0)
+        self.assertIn('route=posts:post_detail', logs.output[0])
+        self.assertIn('status=200', logs.output[0])
+
+    def test_unresolved_route(self):
+        """Запрос без маршрута тоже замеряется."""
+        with self.assertLogs('core.timing', 'INFO') as logs:
+            response = self.client.get('/no-such-page/')
+        self.assertEqual(response.status_code, 404)
+        self.assertIn('Server-Timing', response)
+        self.assertIn('route=- ', logs.output[0])
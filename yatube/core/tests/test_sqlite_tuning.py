@@ -0,0 +1,114 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import OperationalError, connection, connections, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from yatube.sqlite import retry_on_lock
+
+ALIAS = 'pragma_check'
+
+# значения прагм SQLITE_PRAGMAS в том виде, в каком их читает SQLite
+PRAGMAS = {'journal_mode': 'wal', 'busy_timeout': 5000, 'synchronous': 1}
+
+
+class SqlitePragmasTests(TestCase):
+    def test_pragmas_applied_to_new_connections(self):
+        """Новое соединение получает прагмы из настроек."""
+        with tempfile.TemporaryDirectory() as directory:
+            connections.databases[ALIAS] = {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': str(Path(directory) / 'pragmas.sqlite3'),
+            }
+            try:
+                with connections[ALIAS].cursor() as cursor:
+                    values = {}
+                    for name in PRAGMAS:
+                        cursor.execute(f'PRAGMA {name}')
+                        values[name] = cursor.fetchone()[0]
+            finally:
+                connections[ALIAS].close()
+                del connections.databases[ALIAS]
+        self.assertEqual(values, PRAGMAS)
+
+
+@override_settings(SQLITE_LOCK_RETRIES=3)
+class RetryOnLockTests(TransactionTestCase):
+    def setUp(self):
+        sleep = mock.patch('yatube.sqlite.time.sleep')
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+        # без разброса задержки, чтобы проверять ее рост
+        uniform = mock.patch(
+            'yatube.sqlite.random.uniform', return_value=1.0
+        )
+        uniform.start()
+        self.addCleanup(uniform.stop)
+
+    def failing(self, errors):
+        calls = []
+
+        @retry_on_lock
+        def write():
+            calls.append(connection.in_atomic_block)
+            if len(calls) <= len(errors):
+                raise errors[len(calls) - 1]
+            return 'done'
+
+        return write, calls
+
+    def test_lock_errors_are_retried(self):
+        """Ошибка блокировки повторяется с растущей задержкой."""
+        write, calls = self.failing(
+            [OperationalError('database is locked')] * 2
+        )
+        self.assertEqual(write(), 'done')
+        self.assertEqual(calls, [True, True, True])
+        delays = [call.args[0] for call in self.sleep.call_args_list]
+        self.assertEqual(len(delays), 2)
+        self.assertLess(delays[0], delays[1])
+
+    def test_other_errors_and_exhausted_retries_raise(self):
+        """Прочие ошибки и исчерпанные повторы пробрасываются."""
+        write, calls = self.failing([OperationalError('no such table')])
+        with self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 1)
+        write, calls = self.failing(
+            [OperationalError('database is locked')] * 5
+        )
+        with self.assertRaises(OperationalError):
+            write()
+        self.assertEqual(len(calls), 4)
+
+    def test_no_retry_inside_outer_transaction(self):
+        """Внутри внешней транзакции повтор невозможен."""
+        write, calls = self.failing([OperationalError('database is locked')])
+        with self.assertRaises(OperationalError):
+            with transaction.atomic():
+                write()
+        self.assertEqual(len(calls), 1)
+
+
+class BenchSqliteCommandTests(TestCase):
+    def test_bench_sqlite_reports_both_modes(self):
+        """Команда нагружает базу в обоих режимах и пишет JSON."""
+        stdout = StringIO()
+        call_command(
+            'bench_sqlite',
+            threads=2,
+            duration=0.2,
+            users=3,
+            posts=30,
+            json_path='-',
+            stdout=stdout,
+        )
+        output = stdout.getvalue()
+        report = json.loads(output[output.index('['):])
+        self.assertEqual([mode['mode'] for mode in report], ['stock', 'tuned'])
+        for mode in report:
+            self.assertGreater(mode['reads'] + mode['writes'], 0)
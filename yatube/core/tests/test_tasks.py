@@ -0,0 +1,150 @@
+import datetime as dt
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_in
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.models import Task
+from core.tasks import ThreadBackend, claim_task, process_task, task
+from users.tasks import update_last_login
+
+User = get_user_model()
+
+CALLS = []
+
+PAYLOAD = '{"args": [%s], "kwargs": {}}'
+
+
+@task
+def record(value):
+    CALLS.append(value)
+
+
+@task
+def explode():
+    raise RuntimeError('сбой задачи')
+
+
+class TasksTestCase(TransactionTestCase):
+    def setUp(self):
+        CALLS.clear()
+
+
+@override_settings(TASKS_BACKEND='immediate')
+class EnqueueTests(TasksTestCase):
+    def test_task_runs_after_commit_only(self):
+        """Задача ставится после фиксации транзакции, при откате - нет."""
+        with transaction.atomic():
+            record.delay('commit')
+            self.assertEqual(CALLS, [])
+        self.assertEqual(CALLS, ['commit'])
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                record.delay('rollback')
+                raise ValueError
+        self.assertEqual(CALLS, ['commit'])
+
+    @override_settings(
+        EMAIL_BACKEND='core.mail.TaskEmailBackend',
+        TASKS_EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    )
+    def test_mail_is_sent_by_task(self):
+        """Письмо уходит фоновой задачей после фиксации транзакции."""
+        with transaction.atomic():
+            mail.send_mail('Тема', 'Текст', 'from@a.ru', ['to@a.ru'])
+            self.assertEqual(mail.outbox, [])
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, 'Тема')
+        self.assertEqual(mail.outbox[0].to, ['to@a.ru'])
+
+    def test_login_updates_last_login_by_task(self):
+        """Вход записывает last_login фоновой задачей."""
+        user = User.objects.create_user(username='kir', password='password')
+        self.assertTrue(self.client.login(username='kir', password='password'))
+        user.refresh_from_db()
+        self.assertIsNotNone(user.last_login)
+
+    def test_only_deferred_last_login_receiver_runs(self):
+        """Вход пишет last_login только фоновой задачей, без UPDATE auth."""
+        user = User.objects.create_user(username='kir', password='password')
+        with mock.patch.object(update_last_login, 'delay') as delay:
+            with CaptureQueriesContext(connection) as context:
+                user_logged_in.send(sender=User, request=None, user=user)
+        delay.assert_called_once_with(user.pk, user.last_login.isoformat())
+        self.assertEqual(context.captured_queries, [])
+
+
+@override_settings(TASKS_THREADS=1)
+class ThreadBackendTests(TasksTestCase):
+    def test_thread_backend_runs_and_retries(self):
+        """Пул потоков выполняет задачу и повторяет упавшую."""
+        backend = ThreadBackend()
+        with mock.patch('core.tasks.threading.Timer') as timer:
+            with self.assertLogs('core.tasks', 'ERROR'):
+                backend.submit(record.task_name, PAYLOAD % '1')
+                backend.submit(explode.task_name, PAYLOAD % '')
+                backend.executor.shutdown(wait=True)
+        self.assertEqual(CALLS, [1])
+        self.assertEqual(timer.call_count, 1)
+
+
+@override_settings(
+    TASKS_BACKEND='database', TASKS_MAX_ATTEMPTS=2, TASKS_RETRY_DELAY=10
+)
+class DatabaseQueueTests(TasksTestCase):
+    def test_workers_run_queued_tasks(self):
+        """Задача ждет в таблице и выполняется командой run_workers."""
+        record.delay('queued')
+        self.assertEqual(CALLS, [])
+        self.assertEqual(Task.objects.count(), 1)
+        call_command('run_workers', '--once', stdout=StringIO())
+        self.assertEqual(CALLS, ['queued'])
+        self.assertFalse(Task.objects.exists())
+
+    def test_task_is_written_in_callers_transaction(self):
+        """Задача пишется в транзакции данных и откатывается вместе с ней."""
+        with transaction.atomic():
+            record.delay('inside')
+            self.assertEqual(Task.objects.count(), 1)
+        self.assertEqual(Task.objects.count(), 1)
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                record.delay('rollback')
+                self.assertEqual(Task.objects.count(), 2)
+                raise ValueError
+        self.assertEqual(Task.objects.count(), 1)
+
+    def test_claimed_task_is_hidden_until_timeout(self):
+        """Забранная задача не видна другим работникам до конца аренды."""
+        record.delay('leased')
+        self.assertIsNotNone(claim_task())
+        self.assertIsNone(claim_task())
+        Task.objects.update(
+            available_at=timezone.now() - dt.timedelta(seconds=1)
+        )
+        claimed = claim_task()
+        self.assertEqual(claimed.attempts, 2)
+
+    def test_failed_task_is_retried_then_kept(self):
+        """Упавшая задача повторяется, после лимита остается в таблице."""
+        explode.delay()
+        with self.assertLogs('core.tasks', 'ERROR'):
+            process_task(claim_task())
+        failed = Task.objects.get()
+        self.assertEqual(failed.attempts, 1)
+        self.assertIn('сбой задачи', failed.last_error)
+        self.assertGreater(failed.available_at, timezone.now())
+        self.assertIsNone(claim_task())
+        Task.objects.update(available_at=timezone.now())
+        with self.assertLogs('core.tasks', 'ERROR'):
+            process_task(claim_task())
+        Task.objects.update(available_at=timezone.now())
+        self.assertIsNone(claim_task())
+        self.assertEqual(Task.objects.get().attempts, 2)
@@ -0,0 +1,57 @@
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from core.middleware import TemplateProfilerMiddleware
+
+User = get_user_model()
+
+
+class TemplateProfilerMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        mixer.cycle(3).blend(
+            'posts.Post', author=mixer.blend(User, username='kir')
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_profile_files_are_written(self):
+        """Отчет и collapsed-стеки пишутся для каждого запроса."""
+        with tempfile.TemporaryDirectory() as directory:
+            with override_settings(TEMPLATE_PROFILE_DIR=directory):
+                Client().get(reverse('posts:h_page'))
+            reports = list(Path(directory).glob('*-posts.h_page.txt'))
+            folded = list(Path(directory).glob('*-posts.h_page.folded'))
+            self.assertEqual((len(reports), len(folded)), (1, 1))
+            report = reports[0].read_text(encoding='utf-8')
+            stacks = folded[0].read_text(encoding='utf-8').splitlines()
+        for frame in (
+            'template:posts/index.html',
+            'template:posts/includes/post.html',
+            'tag:post_card',
+            'tag:url',
+            'context_processor:core.context_processors.year.year',
+        ):
+            with self.subTest(frame=frame):
+                self.assertIn(frame, report)
+        self.assertIn(
+            'template:posts/index.html;tag:extends;template:base.html;',
+            '\n'.join(stacks),
+        )
+        for line in stacks:
+            path, value = line.rsplit(' ', 1)
+            self.assertTrue(path)
+            self.assertGreater(int(value), 0)
+
+    def test_disabled_without_directory(self):
+        """Без TEMPLATE_PROFILE_DIR middleware не подключается."""
+        with self.assertRaises(MiddlewareNotUsed):
+            TemplateProfilerMiddleware(lambda request: None)
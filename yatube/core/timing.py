@@ -0,0 +1,78 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Tuple
+
+from django.template.base import Template
+
+_render_timers: ContextVar[Tuple['RenderTimer', ...]] = ContextVar(
+    'render_timers', default=()
+)
+
+
+class QueryTimer:
+    """Считает SQL-запросы соединения и суммарное время их выполнения."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+
+    def __call__(
+        self, execute: Any, sql: str, params: Any, many: bool, context: Any
+    ) -> Any:
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.total += time.perf_counter() - started
+
+
+class RenderTimer:
+    """
+    Суммирует время рендера шаблонов верхнего уровня (без вложенных),
+    пока таймер активен в текущем потоке или задаче. Вложенные таймеры
+    (middleware внутри bench_views) считают время независимо.
+    """
+
+    def __init__(self) -> None:
+        self.total = 0.0
+        self.depth = 0
+
+    @contextmanager
+    def active(self) -> Iterator['RenderTimer']:
+        install_render_hook()
+        token = _render_timers.set(_render_timers.get() + (self,))
+        try:
+            yield self
+        finally:
+            _render_timers.reset(token)
+
+
+def install_render_hook() -> None:
+    """
+    Один раз оборачивает Template.render: без активных RenderTimer
+    обертка стоит одного чтения ContextVar.
+    """
+    if getattr(Template.render, 'timed', False):
+        return
+    original_render = Template.render
+
+    def render(template: Template, context: Any) -> Any:
+        timers = _render_timers.get()
+        if not timers:
+            return original_render(template, context)
+        for timer in timers:
+            timer.depth += 1
+        started = time.perf_counter()
+        try:
+            return original_render(template, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            for timer in timers:
+                timer.depth -= 1
+                if not timer.depth:
+                    timer.total += elapsed
+
+    render.timed = True
+    Template.render = render
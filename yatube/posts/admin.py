@@ -1,9 +1,46 @@
+from django import forms
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.admin import helpers
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import Paginator
+from django.db.models import Sum
+from django.template.response import TemplateResponse
+from django.utils.functional import cached_property
 
-from posts.models import Group, Post
+from posts.bulk import delete_posts, reassign_posts
+from posts.models import AuthorCounter, Group, Post
+from posts.search import filter_matching
 from yatube.admin import BaseAdmin
 
 
+class PostCountPaginator(Paginator):
+    """
+    Число постов без фильтров берется из счетчиков авторов вместо
+    COUNT(*) по всей таблице; отфильтрованная выборка считается как обычно.
+    """
+
+    @cached_property
+    def count(self) -> int:
+        if self.object_list.query.where:
+            return super().count
+        return AuthorCounter.objects.aggregate(
+            total=Sum('posts_count')
+        )['total'] or 0
+
+
+class ReassignGroupForm(forms.Form):
+    group = forms.ModelChoiceField(
+        Group.objects.all(),
+        required=False,
+        label='Группа',
+        help_text='Пустое значение - убрать посты из групп.',
+        widget=AutocompleteSelect(
+            Post._meta.get_field('group').remote_field, admin.site
+        ),
+    )
+
+
 @admin.register(Post)
 class PostAdmin(BaseAdmin):
     list_display = (
@@ -14,8 +51,81 @@ class PostAdmin(BaseAdmin):
         'group',
     )
     list_editable = ('group',)
+    list_select_related = ('author', 'group')
     search_fields = ('text',)
     list_filter = ('pub_date',)
+    autocomplete_fields = ('author', 'group')
+    actions = ('reassign_group', 'delete_selected_posts')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if settings.ADMIN_LARGE_TABLES:
+            # select со всеми группами в каждой строке заменяет действие
+            # reassign_group, фильтр по датам - date_hierarchy по индексу
+            self.list_editable = ()
+            self.date_hierarchy = 'pub_date'
+            self.show_full_result_count = False
+            self.paginator = PostCountPaginator
+
+    def get_list_filter(self, request):
+        if settings.ADMIN_LARGE_TABLES:
+            return ()
+        return super().get_list_filter(request)
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        # стандартное удаление загружает каждый пост и шлет его сигналы
+        actions.pop('delete_selected', None)
+        return actions
+
+    def get_search_results(self, request, queryset, search_term):
+        # поиск по FTS5-индексу вместо LIKE '%...%' по всей таблице
+        if not search_term:
+            return queryset, False
+        return filter_matching(queryset, search_term), False
+
+    def confirm_action(self, request, queryset, title, form=None):
+        """Промежуточная страница подтверждения массового действия."""
+        context = {
+            **self.admin_site.each_context(request),
+            'title': title,
+            'opts': self.model._meta,
+            'form': form,
+            'media': self.media + (form.media if form else forms.Media()),
+            'posts_count': queryset.count(),
+            'action': request.POST['action'],
+            'selected': request.POST.getlist(helpers.ACTION_CHECKBOX_NAME),
+            'select_across': request.POST.get('select_across', '0'),
+            'action_checkbox_name': helpers.ACTION_CHECKBOX_NAME,
+        }
+        return TemplateResponse(
+            request, 'admin/posts/post/bulk_action.html', context
+        )
+
+    def reassign_group(self, request, queryset):
+        form = ReassignGroupForm(
+            request.POST if 'apply' in request.POST else None
+        )
+        if not form.is_valid():
+            return self.confirm_action(
+                request, queryset, 'Перенос постов в группу', form
+            )
+        updated = reassign_posts(queryset, form.cleaned_data['group'])
+        self.message_user(request, f'Перенесено постов: {updated}.')
+        return None
+
+    reassign_group.short_description = 'Перенести выбранные посты в группу'
+    reassign_group.allowed_permissions = ('change',)
+
+    def delete_selected_posts(self, request, queryset):
+        if 'apply' not in request.POST:
+            return self.confirm_action(request, queryset, 'Удаление постов')
+        deleted = delete_posts(queryset)
+        self.message_user(request, f'Удалено постов: {deleted}.')
+        return None
+
+    delete_selected_posts.short_description = 'Удалить выбранные посты'
+    delete_selected_posts.allowed_permissions = ('delete',)
 
 
 @admin.register(Group)
@@ -24,5 +134,7 @@ class GroupAdmin(BaseAdmin):
         'title',
         'slug',
         'description',
+        'posts_count',
     )
+    search_fields = ('title', 'slug')
     prepopulated_fields = {'slug': ('title',)}
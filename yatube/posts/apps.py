@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class PostsConfig(AppConfig):
     name = 'posts'
     verbose_name = 'приложение для публикации постов'
+
+    def ready(self) -> None:
+        from posts import signals  # noqa: F401
@@ -0,0 +1,64 @@
+from typing import Any, Dict, Optional
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from posts.counters import bump_author, bump_group
+from posts.feed_cache import FEED_EPOCH, bump_feeds
+from posts.models import Group, Post
+from posts.signals import muted_post_signals
+
+DELETE_CHUNK = 1000
+
+
+def count_by(queryset: Any, field: str) -> Dict[Optional[int], int]:
+    """Число постов выборки в разрезе значения внешнего ключа."""
+    return dict(
+        queryset.order_by().values_list(field).annotate(total=Count('pk'))
+    )
+
+
+def reassign_posts(queryset: Any, group: Optional[Group]) -> int:
+    """
+    Переносит посты выборки в группу одним UPDATE, без сохранения каждого
+    поста и его сигналов; счетчики групп меняются на итог переноса.
+    """
+    group_id = group.pk if group is not None else None
+    with transaction.atomic():
+        moved = queryset.exclude(group_id=group_id)
+        totals = count_by(moved, 'group')
+        # edited меняется, чтобы устарели закэшированные карточки постов
+        updated = Post.objects.filter(pk__in=moved.values('pk')).update(
+            group_id=group_id, edited=timezone.now()
+        )
+        for old_group_id, total in totals.items():
+            bump_group(old_group_id, -total)
+        bump_group(group_id, sum(totals.values()))
+    bump_feeds(FEED_EPOCH)
+    return updated
+
+
+def delete_posts(queryset: Any) -> int:
+    """
+    Удаляет посты выборки пачками по DELETE_CHUNK через QuerySet.delete,
+    поэтому связанные объекты удаляет штатный сборщик. Обработчик
+    удаления каждого поста отключен, счетчики меняются на итог удаления.
+    """
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    deleted = 0
+    with transaction.atomic(), muted_post_signals():
+        authors = count_by(queryset, 'author')
+        groups = count_by(queryset, 'group')
+        while True:
+            chunk = list(pks[:DELETE_CHUNK])
+            if not chunk:
+                break
+            _, totals = Post.objects.filter(pk__in=chunk).delete()
+            deleted += totals.get(Post._meta.label, 0)
+        for author_id, total in authors.items():
+            bump_author(author_id, -total)
+        for group_id, total in groups.items():
+            bump_group(group_id, -total)
+    bump_feeds(FEED_EPOCH)
+    return deleted
@@ -0,0 +1,21 @@
+from typing import List
+
+from django.conf import settings
+
+
+class SlugListConverter:
+    """
+    Несколько slug через '+': group/a+b+c/. Повторы отбрасываются, больше
+    MERGED_GROUPS_LIMIT групп адрес не принимает.
+    """
+
+    regex = r'[-a-zA-Z0-9_]+(?:\+[-a-zA-Z0-9_]+)+'
+
+    def to_python(self, value: str) -> List[str]:
+        slugs = list(dict.fromkeys(value.split('+')))
+        if len(slugs) > settings.MERGED_GROUPS_LIMIT:
+            raise ValueError
+        return slugs
+
+    def to_url(self, value: List[str]) -> str:
+        return '+'.join(value)
@@ -0,0 +1,80 @@
+from typing import Dict, Optional
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from posts.models import AuthorCounter, Group, Post
+from posts.registry import group_registry
+
+
+def bump_author(
+    author_id: int, delta: int, field: str = 'posts_count'
+) -> None:
+    """Атомарно изменяет счетчик автора field на delta."""
+    counters = AuthorCounter.objects.filter(author_id=author_id)
+    if delta < 0:
+        counters = counters.filter(**{f'{field}__gte': -delta})
+    if counters.update(**{field: F(field) + delta}) or delta < 0:
+        return
+    AuthorCounter.objects.get_or_create(author_id=author_id)
+    counters.update(**{field: F(field) + delta})
+
+
+def bump_followers(author_id: int, delta: int) -> None:
+    """Атомарно изменяет счетчик подписчиков автора на delta."""
+    bump_author(author_id, delta, 'followers_count')
+
+
+def bump_group(group_id: Optional[int], delta: int) -> None:
+    """Атомарно изменяет счетчик постов группы на delta."""
+    if group_id is None:
+        return
+    groups = Group.objects.filter(pk=group_id)
+    if delta < 0:
+        groups = groups.filter(posts_count__gte=-delta)
+    groups.update(posts_count=F('posts_count') + delta)
+    group_registry.forget(group_id)
+
+
+def recount_posts() -> Dict[str, int]:
+    """
+    Пересчитывает счетчики авторов и групп по таблице постов.
+    Возвращает число исправленных записей.
+    """
+    with transaction.atomic():
+        authors = dict(
+            Post.objects.order_by()
+            .values_list('author')
+            .annotate(total=Count('pk'))
+        )
+        counters = {
+            counter.author_id: counter
+            for counter in AuthorCounter.objects.select_for_update()
+        }
+        stale_counters = []
+        for counter in counters.values():
+            total = authors.get(counter.author_id, 0)
+            if counter.posts_count != total:
+                counter.posts_count = total
+                stale_counters.append(counter)
+        AuthorCounter.objects.bulk_update(stale_counters, ('posts_count',))
+        missing_counters = [
+            AuthorCounter(author_id=author_id, posts_count=total)
+            for author_id, total in authors.items()
+            if author_id not in counters
+        ]
+        AuthorCounter.objects.bulk_create(missing_counters)
+
+        stale_groups = []
+        for group in Group.objects.select_for_update().annotate(
+            total=Count('posts')
+        ):
+            if group.posts_count != group.total:
+                group.posts_count = group.total
+                stale_groups.append(group)
+        Group.objects.bulk_update(stale_groups, ('posts_count',))
+    group_registry.clear()
+    return {
+        'authors': len(stale_counters) + len(missing_counters),
+        'groups': len(stale_groups),
+    }
@@ -0,0 +1,193 @@
+import datetime as dt
+import itertools
+import random
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, List, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+
+from core.bench import zipf_weights
+from posts.counters import recount_posts
+from posts.feed_cache import FEED_EPOCH, bump_feeds
+from posts.models import Group, Post
+
+User = get_user_model()
+
+WORDS_POOL_SIZE = 5000
+
+CORPUS_SIZE = 200000
+
+# даты публикации отсчитываются от фиксированного момента, а не от
+# текущего времени, чтобы одинаковый seed давал одинаковый набор
+DEFAULT_END = dt.datetime(2025, 1, 1)
+
+
+@contextmanager
+def explicit_post_dates() -> Iterator[None]:
+    """Отключает auto_now_add/auto_now у Post, чтобы задать даты вручную."""
+    fields = [Post._meta.get_field('pub_date'), Post._meta.get_field('edited')]
+    flags = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, flags):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class DatasetGenerator:
+    """
+    Детерминированно (при одинаковом seed) генерирует пользователей,
+    группы и посты: число постов на автора и группу распределено по Ципфу,
+    длина текста - логнормально, даты - равномерно за days дней до end.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        exponent: float = 1.1,
+        days: int = 365,
+        no_group_share: float = 0.2,
+        end: dt.datetime = DEFAULT_END,
+    ) -> None:
+        self.random = random.Random(seed)
+        self.faker = Faker('ru_RU')
+        self.faker.seed_instance(seed)
+        self.exponent = exponent
+        self.days = days
+        if settings.USE_TZ and timezone.is_naive(end):
+            end = timezone.make_aware(end)
+        elif not settings.USE_TZ and timezone.is_aware(end):
+            end = timezone.make_naive(end)
+        self.end = end
+        self.no_group_share = no_group_share
+        words = [self.faker.word() for _ in range(WORDS_POOL_SIZE)]
+        # тексты постов - срезы одного длинного корпуса, это в разы быстрее,
+        # чем собирать каждый текст из отдельных слов
+        corpus_words = self.random.choices(words, k=CORPUS_SIZE)
+        self.corpus = ' '.join(corpus_words)
+        self.word_starts = list(
+            itertools.accumulate(
+                (len(word) + 1 for word in corpus_words), initial=0
+            )
+        )
+        self.prefix = f's{seed}'
+
+    def users(self, count: int) -> Iterator[Any]:
+        for number in range(count):
+            yield User(
+                username=f'{self.prefix}_user_{number}',
+                first_name=self.faker.first_name(),
+                last_name=self.faker.last_name(),
+                password='!',
+            )
+
+    def groups(self, count: int) -> Iterator[Group]:
+        for number in range(count):
+            yield Group(
+                title=self.faker.sentence(nb_words=3).rstrip('.'),
+                slug=f'{self.prefix}-group-{number}',
+                description=self.faker.paragraph(),
+            )
+
+    def text(self) -> str:
+        length = min(max(int(self.random.lognormvariate(3.5, 0.9)), 1), 600)
+        first = self.random.randrange(CORPUS_SIZE - length)
+        return self.corpus[
+            self.word_starts[first]:self.word_starts[first + length] - 1
+        ].capitalize()
+
+    def posts(
+        self,
+        count: int,
+        author_ids: List[int],
+        group_ids: List[int],
+        batch_size: int,
+    ) -> Iterator[List[Post]]:
+        """Пачки постов в хронологическом порядке дат публикации."""
+        author_weights = zipf_weights(len(author_ids), self.exponent)
+        group_weights = zipf_weights(len(group_ids), self.exponent)
+        start = self.end - dt.timedelta(days=self.days)
+        span = (self.end - start) / max(count, 1)
+        for offset in range(0, count, batch_size):
+            size = min(batch_size, count - offset)
+            authors = self.random.choices(
+                author_ids, cum_weights=author_weights, k=size
+            )
+            groups = [None] * size
+            if group_ids:
+                groups = self.random.choices(
+                    group_ids, cum_weights=group_weights, k=size
+                )
+            moments = sorted(
+                start + span * (offset + self.random.random() * size)
+                for _ in range(size)
+            )
+            batch = []
+            for author_id, group_id, moment in zip(authors, groups, moments):
+                if self.random.random() < self.no_group_share:
+                    group_id = None
+                batch.append(
+                    Post(
+                        text=self.text(),
+                        pub_date=moment,
+                        edited=moment,
+                        author_id=author_id,
+                        group_id=group_id,
+                    )
+                )
+            yield batch
+
+
+def seed_dataset(
+    users: int,
+    groups: int,
+    posts: int,
+    seed: int = 0,
+    transaction_size: int = 50000,
+    progress: Optional[Callable[[int], None]] = None,
+    **generator_options: Any,
+) -> None:
+    """
+    Наполняет базу: посты вставляются bulk_create пачками по
+    transaction_size в одной транзакции, затем пересчитываются счетчики.
+    """
+    generator = DatasetGenerator(seed=seed, **generator_options)
+    with transaction.atomic():
+        User.objects.bulk_create(generator.users(users))
+        Group.objects.bulk_create(generator.groups(groups))
+    author_ids = list(
+        User.objects.filter(
+            username__startswith=f'{generator.prefix}_user_'
+        )
+        .order_by('pk')
+        .values_list('pk', flat=True)
+    )
+    group_ids = list(
+        Group.objects.filter(
+            slug__startswith=f'{generator.prefix}-group-'
+        )
+        .order_by('pk')
+        .values_list('pk', flat=True)
+    )
+    if not author_ids:
+        author_ids = list(
+            User.objects.order_by('pk').values_list('pk', flat=True)[:1]
+        )
+    done = 0
+    with explicit_post_dates():
+        for batch in generator.posts(
+            posts, author_ids, group_ids, transaction_size
+        ):
+            with transaction.atomic():
+                Post.objects.bulk_create(batch)
+            done += len(batch)
+            if progress is not None:
+                progress(done)
+    recount_posts()
+    bump_feeds(FEED_EPOCH)
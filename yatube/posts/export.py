@@ -0,0 +1,66 @@
+import csv
+import json
+from typing import Any, Iterator, Tuple
+
+from posts.models import Post
+
+EXPORT_FIELDS = ('id', 'text', 'pub_date', 'author', 'group')
+
+EXPORT_BATCH_SIZE = 2000
+
+
+def iter_post_rows(batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Tuple]:
+    """
+    Построчно отдает посты пачками по первичному ключу (keyset):
+    в памяти одновременно находится не больше batch_size строк,
+    имя автора и slug группы подтягиваются JOIN в том же запросе.
+    """
+    last_pk = 0
+    while True:
+        rows = list(
+            Post.objects.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .values_list(
+                'pk', 'text', 'pub_date', 'author__username', 'group__slug'
+            )[:batch_size]
+        )
+        yield from rows
+        if len(rows) < batch_size:
+            return
+        last_pk = rows[-1][0]
+
+
+def render_jsonl(rows: Iterator[Tuple]) -> Iterator[str]:
+    for pk, text, pub_date, author, group in rows:
+        yield json.dumps(
+            {
+                'id': pk,
+                'text': text,
+                'pub_date': pub_date.isoformat(),
+                'author': author,
+                'group': group,
+            },
+            ensure_ascii=False,
+        ) + '\n'
+
+
+class Echo:
+    """Буфер для csv.writer, который сразу возвращает записанную строку."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def render_csv(rows: Iterator[Tuple]) -> Iterator[str]:
+    writer: Any = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for pk, text, pub_date, author, group in rows:
+        yield writer.writerow(
+            (pk, text, pub_date.isoformat(), author, group or '')
+        )
+
+
+RENDERERS = {
+    'jsonl': (render_jsonl, 'application/x-ndjson'),
+    'csv': (render_csv, 'text/csv'),
+}
@@ -0,0 +1,187 @@
+import hashlib
+import time
+from functools import wraps
+from typing import Any, Callable, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import HttpResponse
+from django.utils import timezone
+from django.views.decorators.http import condition
+
+from posts.models import FeedStamp, Post
+
+FEED_EPOCH = 'all'
+FEED_INDEX = 'index'
+
+
+def group_scope(slug: str) -> str:
+    return f'group:{slug}'
+
+
+def author_scope(username: str) -> str:
+    return f'author:{username}'
+
+
+def generation_key(scope: str) -> str:
+    return f'feed_gen:{scope}'
+
+
+def bump_feeds(*scopes: str) -> None:
+    """
+    Увеличивает поколение перечисленных лент: закэшированные страницы
+    старого поколения больше не совпадают по ключу и вытесняются сами.
+    В базе обновляются отметки изменения лент для ETag.
+    """
+    scopes = set(scopes)
+    for scope in scopes:
+        key = generation_key(scope)
+        cache.add(key, time.time_ns(), None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # ключ вытеснили между add и incr
+            cache.add(key, time.time_ns(), None)
+    touch_feed_stamps(scopes)
+
+
+def current_generations(keys: list) -> list:
+    """
+    Поколения лент; вытесненное поколение заводится заново уникальным
+    значением, иначе оно совпало бы с прежним и вернуло старые страницы.
+    """
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            seed = time.time_ns()
+            if not cache.add(key, seed, None):
+                seed = cache.get(key, seed)
+            generations[key] = seed
+    return [generations[key] for key in keys]
+
+
+def touch_feed_stamps(scopes: set) -> None:
+    """Одним UPDATE ставит отметкам лент текущее время."""
+    now = timezone.now()
+    stamps = FeedStamp.objects.filter(scope__in=scopes)
+    if stamps.update(changed=now) < len(scopes):
+        FeedStamp.objects.bulk_create(
+            [FeedStamp(scope=scope, changed=now) for scope in scopes],
+            ignore_conflicts=True,
+        )
+
+
+def cache_anonymous_feed(scopes: Callable[..., Iterable[str]]) -> Callable:
+    """
+    Кэширует страницу ленты для анонимных GET-запросов.
+    scopes получает аргументы view и возвращает ленты, от которых
+    зависит страница; ключ включает их текущие поколения и query string.
+    """
+
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(request: Any, *args: Any, **kwargs: Any) -> Any:
+            if (
+                not settings.FEED_CACHE_TIMEOUT
+                or request.method != 'GET'
+                or request.user.is_authenticated
+            ):
+                return view(request, *args, **kwargs)
+            generation_keys = [
+                generation_key(scope)
+                for scope in (FEED_EPOCH, *scopes(*args, **kwargs))
+            ]
+            fingerprint = hashlib.md5(
+                repr(
+                    (
+                        args,
+                        sorted(kwargs.items()),
+                        request.GET.urlencode(),
+                        current_generations(generation_keys),
+                    )
+                ).encode()
+            ).hexdigest()
+            page_key = f'feed_page:{view.__name__}:{fingerprint}'
+            cached = cache.get(page_key)
+            if cached is not None:
+                content, content_type = cached
+                return HttpResponse(content, content_type=content_type)
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.cookies:
+                cache.set(
+                    page_key,
+                    (response.content, response['Content-Type']),
+                    settings.FEED_CACHE_TIMEOUT,
+                )
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def make_etag(request: Any, *parts: Any) -> str:
+    """
+    ETag страницы: валидатор данных, пользователь и query string. Для
+    вошедших в него входят ключ сессии и CSRF-секрет: страницы с формами
+    содержат токен, а при входе оба меняются, и старую копию отдавать
+    нельзя.
+    """
+    secrets = None
+    if request.user.is_authenticated:
+        secrets = (
+            request.session.session_key,
+            request.META.get('CSRF_COOKIE'),
+        )
+    return hashlib.md5(
+        repr(
+            (
+                parts,
+                request.user.pk,
+                secrets,
+                request.GET.urlencode(),
+                settings.FEED_PAGINATION,
+            )
+        ).encode()
+    ).hexdigest()
+
+
+def conditional_feed(scopes: Callable[..., Iterable[str]]) -> Callable:
+    """
+    Отвечает 304 Not Modified, если лента не менялась: валидатор - время
+    последнего изменения ее отметок, одно чтение по первичному ключу.
+    """
+
+    def etag(request: Any, *args: Any, **kwargs: Any) -> Optional[str]:
+        changed = FeedStamp.objects.filter(
+            scope__in=(FEED_EPOCH, *scopes(*args, **kwargs))
+        ).aggregate(changed=Max('changed'))['changed']
+        if changed is None:
+            return None
+        return make_etag(request, changed)
+
+    return condition(etag_func=etag)
+
+
+def post_etag(request: Any, pk: Any) -> Optional[str]:
+    """
+    ETag страницы поста: время его изменения, счетчик постов автора и
+    выводимые на странице имена автора и группы.
+    """
+    row = (
+        Post.objects.filter(pk=pk)
+        .values_list(
+            'edited',
+            'author__posts_counter__posts_count',
+            'author__username',
+            'author__first_name',
+            'author__last_name',
+            'group__title',
+            'group__slug',
+        )
+        .first()
+    )
+    if row is None:
+        return None
+    return make_etag(request, *row)
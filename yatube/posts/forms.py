@@ -1,11 +1,57 @@
+from functools import partial
+from typing import Any, Iterator, Optional, Tuple
+
 from django.contrib.auth import get_user_model
-from django.forms import ModelForm, Select, Textarea
+from django.core.exceptions import ValidationError
+from django.forms import ModelChoiceField, ModelForm, Select, Textarea
 
-from posts.models import Post
+from posts.models import Group, Post
+from posts.registry import group_registry
 
 User = get_user_model()
 
 
+class GroupChoiceIterator:
+    """Варианты выбора группы из процессного кэша групп."""
+
+    def __init__(self, field: ModelChoiceField) -> None:
+        self.field = field
+
+    def __iter__(self) -> Iterator[Tuple[Any, str]]:
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        for group in group_registry.all():
+            yield (group.pk, self.field.label_from_instance(group))
+
+
+def group_from_registry(
+    field: ModelChoiceField, value: Any
+) -> Optional[Group]:
+    """to_python поля группы: группа по pk из процессного кэша групп."""
+    if value in field.empty_values:
+        return None
+    try:
+        group = group_registry.get(pk=int(value))
+    except (TypeError, ValueError):
+        group = None
+    if group is None:
+        raise ValidationError(
+            field.error_messages['invalid_choice'], code='invalid_choice'
+        )
+    return group
+
+
+def use_group_registry(field: ModelChoiceField) -> None:
+    """
+    Переключает поле выбора группы на процессный кэш групп: рендер и
+    проверка формы обходятся без запросов к базе, а тип поля остается
+    ModelChoiceField.
+    """
+    field.iterator = GroupChoiceIterator
+    field.widget.choices = field.choices
+    field.to_python = partial(group_from_registry, field)
+
+
 class PostForm(ModelForm):
     class Meta:
         model = Post
@@ -29,3 +75,7 @@ class PostForm(ModelForm):
                 },
             ),
         }
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        use_group_registry(self.fields['group'])
@@ -0,0 +1,35 @@
+import sys
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from posts.export import EXPORT_BATCH_SIZE, RENDERERS, iter_post_rows
+
+
+class Command(BaseCommand):
+    help = 'Потоково выгружает все посты в JSONL или CSV.'
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            '--format', choices=sorted(RENDERERS), default='jsonl'
+        )
+        parser.add_argument(
+            '--output', default='-', help='файл для выгрузки, "-" - stdout'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=EXPORT_BATCH_SIZE,
+            help='число постов, читаемых из базы за один запрос',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        render, _ = RENDERERS[options['format']]
+        lines = render(iter_post_rows(options['batch_size']))
+        if options['output'] == '-':
+            sys.stdout.writelines(lines)
+            return
+        with open(
+            options['output'], 'w', encoding='utf-8', newline=''
+        ) as output:
+            output.writelines(lines)
@@ -0,0 +1,219 @@
+import csv
+import datetime as dt
+import itertools
+import json
+import sys
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from posts.counters import bump_author, bump_group
+from posts.dataset import explicit_post_dates
+from posts.feed_cache import FEED_EPOCH, bump_feeds
+from posts.models import Group, Post
+from posts.timeline import FANOUT_POSTS, fan_out_posts
+from yatube.sqlite import retry_on_lock
+
+User = get_user_model()
+
+LOOKUP_CHUNK = 500
+
+
+def read_jsonl(stream: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    for line in stream:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        # битая строка отдается пустой записью и считается пропущенной
+        yield record if isinstance(record, dict) else {}
+
+
+def read_csv(stream: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    yield from csv.DictReader(stream)
+
+
+def parse_pub_date(value: str) -> dt.datetime:
+    """
+    Дата публикации в режиме часовых поясов проекта. Неверная дата
+    вызывает ValueError.
+    """
+    pub_date = parse_datetime(value)
+    if pub_date is None:
+        raise ValueError(f'Неверная дата: {value}')
+    if settings.USE_TZ and timezone.is_naive(pub_date):
+        return timezone.make_aware(pub_date)
+    if not settings.USE_TZ and timezone.is_aware(pub_date):
+        return timezone.make_naive(pub_date)
+    return pub_date
+
+
+READERS = {
+    'jsonl': read_jsonl,
+    'csv': read_csv,
+}
+
+
+class LookupTable:
+    """
+    Кэш соответствия значения поля (username, slug) и id.
+    Неизвестные значения подгружаются пачками на каждую порцию постов,
+    поэтому размер таблицы ограничен числом реально встреченных значений.
+    """
+
+    def __init__(self, model: Any, field: str) -> None:
+        self.model = model
+        self.field = field
+        self.ids: Dict[str, Optional[int]] = {}
+
+    def resolve(self, values: Iterable[str]) -> None:
+        missing = list({value for value in values if value not in self.ids})
+        for offset in range(0, len(missing), LOOKUP_CHUNK):
+            chunk = missing[offset:offset + LOOKUP_CHUNK]
+            found = dict(
+                self.model.objects.filter(
+                    **{f'{self.field}__in': chunk}
+                ).values_list(self.field, 'pk')
+            )
+            for value in chunk:
+                self.ids[value] = found.get(value)
+
+    def get(self, value: str) -> Optional[int]:
+        return self.ids.get(value)
+
+
+class Command(BaseCommand):
+    help = 'Потоково импортирует посты из файла JSONL или CSV.'
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('path', help='файл с постами, "-" - stdin')
+        parser.add_argument(
+            '--format',
+            choices=sorted(READERS),
+            help='формат файла, по умолчанию - по расширению',
+        )
+        parser.add_argument(
+            '--transaction-size',
+            type=int,
+            default=10000,
+            help='число постов в одной транзакции',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        path = options['path']
+        file_format = options['format'] or path.rsplit('.', 1)[-1].lower()
+        if file_format not in READERS:
+            raise CommandError(
+                'Не удалось определить формат файла, укажите --format.'
+            )
+        if path == '-':
+            self.import_stream(READERS[file_format](sys.stdin), options)
+            return
+        with open(path, encoding='utf-8', newline='') as stream:
+            self.import_stream(READERS[file_format](stream), options)
+
+    def import_stream(
+        self, records: Iterator[Dict[str, Any]], options: Dict[str, Any]
+    ) -> None:
+        authors = LookupTable(User, 'username')
+        groups = LookupTable(Group, 'slug')
+        started = time.perf_counter()
+        imported = skipped = 0
+        with explicit_post_dates():
+            while True:
+                batch = list(
+                    itertools.islice(records, options['transaction_size'])
+                )
+                if not batch:
+                    break
+                posts = self.build_posts(batch, authors, groups)
+                skipped += len(batch) - len(posts)
+                self.insert(posts)
+                imported += len(posts)
+                elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f'Импортировано {imported}, пропущено {skipped}, '
+                    f'{imported / elapsed:.0f} постов/с'
+                )
+        bump_feeds(FEED_EPOCH)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Готово: {imported} постов за '
+                f'{time.perf_counter() - started:.1f} с.'
+            )
+        )
+
+    def build_posts(
+        self,
+        batch: List[Dict[str, Any]],
+        authors: LookupTable,
+        groups: LookupTable,
+    ) -> List[Post]:
+        authors.resolve(record.get('author') or '' for record in batch)
+        groups.resolve(
+            record['group'] for record in batch if record.get('group')
+        )
+        now = timezone.now()
+        posts = []
+        for record in batch:
+            author_id = authors.get(record.get('author') or '')
+            if author_id is None or not record.get('text'):
+                continue
+            group_id = None
+            if record.get('group'):
+                group_id = groups.get(record['group'])
+                if group_id is None:
+                    continue
+            pub_date = now
+            if record.get('pub_date'):
+                try:
+                    pub_date = parse_pub_date(record['pub_date'])
+                except ValueError:
+                    continue
+            posts.append(
+                Post(
+                    text=record['text'],
+                    pub_date=pub_date,
+                    edited=now,
+                    author_id=author_id,
+                    group_id=group_id,
+                )
+            )
+        return posts
+
+    @retry_on_lock
+    def insert(self, posts: List[Post]) -> None:
+        """
+        Вставляет порцию постов и обновляет счетчики в одной транзакции,
+        после ее фиксации новые посты раскладываются по лентам подписчиков.
+        """
+        last_pk = Post.objects.aggregate(last_pk=Max('pk'))['last_pk'] or 0
+        Post.objects.bulk_create(posts)
+        for author_id, total in Counter(
+            post.author_id for post in posts
+        ).items():
+            bump_author(author_id, total)
+        for group_id, total in Counter(
+            post.group_id for post in posts
+        ).items():
+            bump_group(group_id, total)
+        # bulk_create в SQLite не возвращает id, новые посты ищутся по ним
+        post_ids = list(
+            Post.objects.filter(
+                pk__gt=last_pk,
+                author_id__in={post.author_id for post in posts},
+            )
+            .order_by('pk')
+            .values_list('pk', flat=True)
+        )
+        for offset in range(0, len(post_ids), FANOUT_POSTS):
+            fan_out_posts.delay(post_ids[offset:offset + FANOUT_POSTS])
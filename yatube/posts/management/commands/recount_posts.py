@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from posts.counters import recount_posts
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счетчики постов авторов и групп.'
+
+    def handle(self, *args, **options) -> None:
+        fixed = recount_posts()
+        self.stdout.write(
+            self.style.SUCCESS(
+                'Исправлено счетчиков: авторов - {authors}, '
+                'групп - {groups}.'.format(**fixed)
+            )
+        )
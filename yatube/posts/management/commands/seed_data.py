@@ -0,0 +1,76 @@
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from posts.dataset import DEFAULT_END, seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        'Наполняет базу синтетическими пользователями, группами и постами '
+        'для замеров производительности.'
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--groups', type=int, default=100)
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=365,
+            help='за сколько дней распределить даты публикации',
+        )
+        parser.add_argument(
+            '--end',
+            default=DEFAULT_END.isoformat(),
+            help='дата последней публикации в ISO 8601',
+        )
+        parser.add_argument(
+            '--zipf',
+            type=float,
+            default=1.1,
+            help='показатель распределения Ципфа для авторов и групп',
+        )
+        parser.add_argument(
+            '--transaction-size',
+            type=int,
+            default=50000,
+            help='число постов в одной транзакции',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            end = parse_datetime(options['end'])
+        except ValueError:
+            end = None
+        if end is None:
+            raise CommandError(f'Неверная дата --end: {options["end"]}')
+        started = time.perf_counter()
+
+        def progress(done: int) -> None:
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f'{done}/{options["posts"]} постов, '
+                f'{done / elapsed:.0f} постов/с'
+            )
+
+        seed_dataset(
+            users=options['users'],
+            groups=options['groups'],
+            posts=options['posts'],
+            seed=options['seed'],
+            transaction_size=options['transaction_size'],
+            progress=progress,
+            exponent=options['zipf'],
+            days=options['days'],
+            end=end,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Готово за {time.perf_counter() - started:.1f} с.'
+            )
+        )
@@ -0,0 +1,52 @@
+# Generated by Django 2.2.16 on 2026-10-18 18:55
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_counters(apps, schema_editor):
+    AuthorCounter = apps.get_model('posts', 'AuthorCounter')
+    Group = apps.get_model('posts', 'Group')
+    Post = apps.get_model('posts', 'Post')
+    alias = schema_editor.connection.alias
+    AuthorCounter.objects.using(alias).bulk_create(
+        AuthorCounter(author_id=author_id, posts_count=total)
+        for author_id, total in Post.objects.using(alias)
+        .order_by()
+        .values_list('author')
+        .annotate(total=Count('pk'))
+    )
+    groups = list(Group.objects.using(alias).annotate(total=Count('posts')))
+    for group in groups:
+        group.posts_count = group.total
+    Group.objects.using(alias).bulk_update(groups, ('posts_count',))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('posts', '0004_post_feed_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorCounter',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='posts_counter', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='автор')),
+                ('posts_count', models.PositiveIntegerField(default=0, verbose_name='количество постов')),
+            ],
+            options={
+                'verbose_name': 'счетчик постов автора',
+                'verbose_name_plural': 'счетчики постов авторов',
+            },
+        ),
+        migrations.AddField(
+            model_name='group',
+            name='posts_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='количество постов'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+from django.db import migrations
+
+# Внешнее FTS5-содержимое: индекс хранит только токены, текст читается
+# из posts_post. Триггеры держат индекс в актуальном состоянии, в том числе
+# при bulk_create и массовых update/delete. SQLite удаляет триггеры при
+# пересоздании таблицы, поэтому миграции, перестраивающие posts_post,
+# должны создавать их заново (см. CREATE_TRIGGERS).
+CREATE_TABLE = (
+    "CREATE VIRTUAL TABLE posts_post_fts USING fts5("
+    "text, content='posts_post', content_rowid='id')"
+)
+
+CREATE_TRIGGERS = (
+    "CREATE TRIGGER posts_post_fts_ai AFTER INSERT ON posts_post BEGIN "
+    "INSERT INTO posts_post_fts(rowid, text) VALUES (new.id, new.text); "
+    "END",
+    "CREATE TRIGGER posts_post_fts_ad AFTER DELETE ON posts_post BEGIN "
+    "INSERT INTO posts_post_fts(posts_post_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "END",
+    "CREATE TRIGGER posts_post_fts_au AFTER UPDATE OF text ON posts_post "
+    "BEGIN "
+    "INSERT INTO posts_post_fts(posts_post_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "INSERT INTO posts_post_fts(rowid, text) VALUES (new.id, new.text); "
+    "END",
+)
+
+REBUILD = "INSERT INTO posts_post_fts(posts_post_fts) VALUES ('rebuild')"
+
+DROP = (
+    'DROP TRIGGER IF EXISTS posts_post_fts_ai',
+    'DROP TRIGGER IF EXISTS posts_post_fts_ad',
+    'DROP TRIGGER IF EXISTS posts_post_fts_au',
+    'DROP TABLE IF EXISTS posts_post_fts',
+)
+
+
+def create_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in (CREATE_TABLE, *CREATE_TRIGGERS, REBUILD):
+        schema_editor.execute(statement)
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_post_edited'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fts, drop_fts),
+    ]
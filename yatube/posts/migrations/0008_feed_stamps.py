@@ -0,0 +1,24 @@
+# Generated by Django 2.2.16 on 2026-10-18 19:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_post_fts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedStamp',
+            fields=[
+                ('scope', models.CharField(max_length=200, primary_key=True, serialize=False, verbose_name='лента')),
+                ('changed', models.DateTimeField(verbose_name='дата и время изменения')),
+            ],
+            options={
+                'verbose_name': 'отметка изменения ленты',
+                'verbose_name_plural': 'отметки изменения лент',
+            },
+        ),
+    ]
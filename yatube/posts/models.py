@@ -1,6 +1,6 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, transaction
 from django.urls import reverse
 
 User = get_user_model()
@@ -10,6 +10,11 @@ class Group(models.Model):
     title = models.CharField('название группы', max_length=200)
     slug = models.SlugField('уникальный адрес группы', unique=True)
     description = models.TextField('описание группы')
+    posts_count = models.PositiveIntegerField(
+        'количество постов',
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         verbose_name = 'группа'
@@ -25,6 +30,7 @@ class Post(models.Model):
         'дата и время публикации',
         auto_now_add=True,
     )
+    edited = models.DateTimeField('дата и время изменения', auto_now=True)
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -43,9 +49,137 @@ class Post(models.Model):
         verbose_name_plural = 'посты'
         ordering = ('-pub_date',)
         default_related_name = 'posts'
+        indexes = (
+            models.Index(
+                fields=('pub_date', 'id'), name='post_pub_date_id_idx'
+            ),
+            models.Index(
+                fields=('author', 'pub_date'), name='post_author_pub_date_idx'
+            ),
+            models.Index(
+                fields=('group', 'pub_date'), name='post_group_pub_date_idx'
+            ),
+        )
 
     def __str__(self) -> str:
         return self.text[: settings.SHOW_WORDS]
 
     def get_absolute_url(self) -> str:
         return reverse("posts:post_detail", kwargs={"pk": self.pk})
+
+    def save(self, *args, **kwargs) -> None:
+        # счетчики постов обновляются в post_save внутри той же транзакции
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class AuthorCounter(models.Model):
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='posts_counter',
+        verbose_name='автор',
+    )
+    posts_count = models.PositiveIntegerField('количество постов', default=0)
+    followers_count = models.PositiveIntegerField(
+        'количество подписчиков', default=0
+    )
+
+    class Meta:
+        verbose_name = 'счетчик постов автора'
+        verbose_name_plural = 'счетчики постов авторов'
+
+    def __str__(self) -> str:
+        return f'{self.author}: {self.posts_count}'
+
+
+class FeedStamp(models.Model):
+    """Момент последнего изменения ленты: валидатор условных GET."""
+
+    scope = models.CharField('лента', max_length=200, primary_key=True)
+    changed = models.DateTimeField('дата и время изменения')
+
+    class Meta:
+        verbose_name = 'отметка изменения ленты'
+        verbose_name_plural = 'отметки изменения лент'
+
+    def __str__(self) -> str:
+        return f'{self.scope}: {self.changed}'
+
+
+class Follow(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='follower',
+        verbose_name='подписчик',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='following',
+        verbose_name='автор',
+    )
+
+    class Meta:
+        verbose_name = 'подписка'
+        verbose_name_plural = 'подписки'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'author'), name='follow_user_author_unique'
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f'{self.user} -> {self.author}'
+
+
+class TimelineEntry(models.Model):
+    """
+    Пост в ленте подписок читателя, разложенный при публикации.
+    Автор и дата публикации продублированы из поста, чтобы лента читалась
+    по индексу (reader, pub_date, post) без обращения к таблице постов.
+    """
+
+    reader = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='timeline',
+        verbose_name='читатель',
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='timeline_entries',
+        verbose_name='пост',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        db_index=False,
+        verbose_name='автор',
+    )
+    pub_date = models.DateTimeField('дата и время публикации')
+
+    class Meta:
+        verbose_name = 'запись ленты подписок'
+        verbose_name_plural = 'записи лент подписок'
+        constraints = (
+            models.UniqueConstraint(
+                fields=('reader', 'post'), name='timeline_reader_post_unique'
+            ),
+        )
+        indexes = (
+            models.Index(
+                fields=('reader', 'pub_date', 'post'),
+                name='timeline_reader_pub_date_idx',
+            ),
+            models.Index(
+                fields=('reader', 'author'), name='timeline_reader_author_idx'
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f'{self.reader}: {self.post_id}'
@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from posts.models import Group
+
+
+class GroupRegistry:
+    """
+    Процессный кэш групп по slug и id: LRU на GROUP_REGISTRY_SIZE групп,
+    записи живут не дольше GROUP_REGISTRY_TIMEOUT секунд. В своем процессе
+    кэш сбрасывают сигналы Group и изменение счетчиков постов, таймаут
+    ограничивает устаревание данных, измененных другими процессами.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.entries: OrderedDict = OrderedDict()
+        self.listing: Optional[Tuple[float, List[Group]]] = None
+
+    def get(self, **lookup: Any) -> Optional[Group]:
+        """Группа по slug или pk: из кэша или одним запросом к базе."""
+        (field, value), = lookup.items()
+        key = (field, str(value))
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.entries.move_to_end(key)
+                return entry[1]
+        group = Group.objects.filter(**lookup).first()
+        if group is not None:
+            self.remember(group, now + settings.GROUP_REGISTRY_TIMEOUT)
+        return group
+
+    def get_many(self, field: str, values: List[Any]) -> Dict[str, Group]:
+        """
+        Группы по списку slug или pk: найденные в кэше плюс один запрос
+        с field__in для остальных. Ключ словаря - значение field строкой.
+        """
+        now = time.monotonic()
+        found = {}
+        with self.lock:
+            for value in values:
+                entry = self.entries.get((field, str(value)))
+                if entry is not None and entry[0] > now:
+                    self.entries.move_to_end((field, str(value)))
+                    found[str(value)] = entry[1]
+        missing = [value for value in values if str(value) not in found]
+        if missing:
+            expires = now + settings.GROUP_REGISTRY_TIMEOUT
+            for group in Group.objects.filter(**{f'{field}__in': missing}):
+                self.remember(group, expires)
+                found[str(getattr(group, field))] = group
+        return found
+
+    def remember(self, group: Group, expires: float) -> None:
+        with self.lock:
+            for key in (('slug', group.slug), ('pk', str(group.pk))):
+                self.entries[key] = (expires, group)
+                self.entries.move_to_end(key)
+            while len(self.entries) > settings.GROUP_REGISTRY_SIZE * 2:
+                self.entries.popitem(last=False)
+
+    def all(self) -> List[Group]:
+        """
+        Все группы для выбора в форме; запоминаются и для поиска по
+        slug и pk. Если групп больше размера кэша, список не запоминается
+        и читается из базы каждый раз.
+        """
+        now = time.monotonic()
+        listing = self.listing
+        if listing is not None and listing[0] > now:
+            return listing[1]
+        groups = list(Group.objects.all()[: settings.GROUP_REGISTRY_SIZE + 1])
+        if len(groups) > settings.GROUP_REGISTRY_SIZE:
+            return list(Group.objects.all())
+        expires = now + settings.GROUP_REGISTRY_TIMEOUT
+        for group in groups:
+            self.remember(group, expires)
+        self.listing = (expires, groups)
+        return groups
+
+    def forget(self, group_id: Optional[int]) -> None:
+        """Убирает группу из кэша по id и slug."""
+        if group_id is None:
+            return
+        with self.lock:
+            entry = self.entries.pop(('pk', str(group_id)), None)
+            if entry is not None:
+                self.entries.pop(('slug', entry[1].slug), None)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.listing = None
+
+
+group_registry = GroupRegistry()
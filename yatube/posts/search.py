@@ -0,0 +1,50 @@
+import re
+from typing import Any
+
+from django.db import connection
+
+from posts.models import Post
+
+TOKEN = re.compile(r'\w+')
+
+FTS_MATCH = (
+    'posts_post.id IN '
+    '(SELECT rowid FROM posts_post_fts WHERE posts_post_fts MATCH %s)'
+)
+
+
+def fts_query(query: str) -> str:
+    """
+    Превращает пользовательский ввод в безопасный запрос FTS5:
+    каждое слово берется в кавычки и ищется по префиксу, слова - через И.
+    """
+    return ' '.join(f'"{token}"*' for token in TOKEN.findall(query))
+
+
+def filter_matching(queryset: Any, query: str) -> Any:
+    """Оставляет в queryset посты, текст которых подходит под запрос."""
+    match = fts_query(query)
+    if not match:
+        return queryset.none()
+    if connection.vendor != 'sqlite':
+        return queryset.filter(text__icontains=query)
+    return queryset.extra(where=[FTS_MATCH], params=[match])
+
+
+def search_posts(query: str) -> Any:
+    """Посты по полнотекстовому запросу, от наиболее релевантных."""
+    match = fts_query(query)
+    posts = Post.objects.select_related('author', 'group')
+    if not match:
+        return posts.none()
+    if connection.vendor != 'sqlite':
+        return posts.filter(text__icontains=query)
+    return posts.extra(
+        tables=['posts_post_fts'],
+        where=[
+            'posts_post_fts.rowid = posts_post.id',
+            'posts_post_fts MATCH %s',
+        ],
+        params=[match],
+        order_by=['posts_post_fts.rank'],
+    )
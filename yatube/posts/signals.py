@@ -0,0 +1,223 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from posts.counters import bump_author, bump_followers, bump_group
+from posts.feed_cache import (
+    FEED_EPOCH,
+    FEED_INDEX,
+    author_scope,
+    bump_feeds,
+    group_scope,
+)
+from posts.models import Follow, Group, Post
+from posts.registry import group_registry
+from posts.templatetags.post_cards import (
+    AUTHOR_CARD_FIELDS,
+    GROUP_CARD_FIELDS,
+)
+from posts.timeline import (
+    backfill_timeline,
+    drop_post,
+    fan_out_post,
+    unfollowed,
+)
+
+User = get_user_model()
+
+muted = threading.local()
+
+
+@contextmanager
+def muted_post_signals() -> Iterator[None]:
+    """
+    Отключает в текущем потоке обработчик удаления постов: массовые
+    операции сами меняют счетчики и ленты на итог всей выборки.
+    """
+    muted.active = True
+    try:
+        yield
+    finally:
+        muted.active = False
+
+
+@receiver(post_init, sender=Post)
+def remember_post_relations(sender, instance, **kwargs) -> None:
+    """Запоминает автора и группу поста в момент загрузки."""
+    instance._counted_author_id = instance.author_id
+    instance._counted_group_id = instance.group_id
+
+
+@receiver(post_save, sender=Post)
+def count_saved_post(sender, instance, created, raw=False, **kwargs) -> None:
+    """Обновляет счетчики при создании поста и смене автора или группы."""
+    if raw:
+        return
+    if created:
+        bump_author(instance.author_id, 1)
+        bump_group(instance.group_id, 1)
+        fan_out_post.delay(instance.pk)
+    else:
+        if instance.author_id != instance._counted_author_id:
+            bump_author(instance._counted_author_id, -1)
+            bump_author(instance.author_id, 1)
+            # пост уходит из лент подписчиков прежнего автора
+            drop_post(instance.pk)
+            fan_out_post.delay(instance.pk)
+        if instance.group_id != instance._counted_group_id:
+            bump_group(instance._counted_group_id, -1)
+            bump_group(instance.group_id, 1)
+    bump_post_feeds(instance)
+    remember_post_relations(sender, instance)
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs) -> None:
+    """Уменьшает счетчики автора и группы удаленного поста."""
+    if getattr(muted, 'active', False):
+        return
+    bump_author(instance.author_id, -1)
+    bump_group(instance.group_id, -1)
+    bump_post_feeds(instance)
+
+
+def related_names(instance, field: str, ids: set, model, attr: str) -> list:
+    """Имена связанных объектов: из кэша экземпляра или одним запросом."""
+    ids.discard(None)
+    descriptor = getattr(Post, field)
+    if ids == {getattr(instance, f'{field}_id')} and descriptor.is_cached(
+        instance
+    ):
+        return [getattr(getattr(instance, field), attr)]
+    return list(
+        model.objects.filter(pk__in=ids).values_list(attr, flat=True)
+    )
+
+
+def bump_post_feeds(instance) -> None:
+    """Сбрасывает страницы главной, групп и профилей, где есть пост."""
+    usernames = related_names(
+        instance,
+        'author',
+        {instance.author_id, instance._counted_author_id},
+        User,
+        'username',
+    )
+    slugs = related_names(
+        instance,
+        'group',
+        {instance.group_id, instance._counted_group_id},
+        Group,
+        'slug',
+    )
+    bump_feeds(
+        FEED_INDEX,
+        *map(author_scope, usernames),
+        *map(group_scope, slugs),
+    )
+
+
+def card_fields(instance, fields: tuple) -> tuple:
+    # отложенные поля не читаем, чтобы не порождать лишние запросы
+    return tuple(instance.__dict__.get(field) for field in fields)
+
+
+@receiver(post_init, sender=User)
+def remember_author_card(sender, instance, **kwargs) -> None:
+    """Запоминает поля автора, которые выводятся в карточке поста."""
+    instance._card_fields = card_fields(instance, AUTHOR_CARD_FIELDS)
+
+
+@receiver(post_init, sender=Group)
+def remember_group_card(sender, instance, **kwargs) -> None:
+    """Запоминает поля группы, которые выводятся в карточке поста."""
+    instance._card_fields = card_fields(instance, GROUP_CARD_FIELDS)
+
+
+@receiver(post_save, sender=User)
+def refresh_author_cards(sender, instance, created, raw=False, **kwargs):
+    """
+    Смена имени автора меняет ключ карточек его постов, поэтому
+    сбрасываются только ленты, где эти карточки выводятся: главная,
+    профиль под старым и новым именем и группы, где автор писал.
+    """
+    fields = card_fields(instance, AUTHOR_CARD_FIELDS)
+    if not created and not raw and fields != instance._card_fields:
+        slugs = (
+            Post.objects.filter(author=instance, group__isnull=False)
+            .order_by()
+            .values_list('group__slug', flat=True)
+            .distinct()
+        )
+        usernames = {instance._card_fields[0], fields[0]} - {None}
+        bump_feeds(
+            FEED_INDEX,
+            *map(author_scope, usernames),
+            *map(group_scope, slugs),
+        )
+    instance._card_fields = fields
+
+
+@receiver(post_save, sender=Group)
+def refresh_group_cards(sender, instance, created, raw=False, **kwargs):
+    """
+    Переименование группы сбрасывает главную, ее страницу под старым и
+    новым адресом и профили авторов, писавших в группу.
+    """
+    fields = card_fields(instance, GROUP_CARD_FIELDS)
+    if not created and not raw and fields != instance._card_fields:
+        usernames = (
+            Post.objects.filter(group=instance)
+            .order_by()
+            .values_list('author__username', flat=True)
+            .distinct()
+        )
+        slugs = {instance._card_fields[1], fields[1]} - {None}
+        bump_feeds(
+            FEED_INDEX,
+            *map(group_scope, slugs),
+            *map(author_scope, usernames),
+        )
+    else:
+        bump_feeds(group_scope(instance.slug))
+    instance._card_fields = fields
+
+
+@receiver(post_delete, sender=Group)
+def drop_group_feed(sender, instance, **kwargs) -> None:
+    """Удаление группы сбрасывает ее страницу и ленты с ее постами."""
+    bump_feeds(FEED_EPOCH)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def reset_group_registry(sender, **kwargs) -> None:
+    """
+    Сбрасывает кэш групп сразу и после фиксации транзакции: иначе в кэш
+    могут попасть данные, прочитанные до ее фиксации или отката.
+    """
+    group_registry.clear()
+    transaction.on_commit(group_registry.clear)
+
+
+@receiver(post_save, sender=Follow)
+def count_follow(sender, instance, created, raw=False, **kwargs) -> None:
+    """Подписка меняет счетчик подписчиков и заполняет ленту читателя."""
+    if raw or not created:
+        return
+    bump_followers(instance.author_id, 1)
+    bump_feeds(author_scope(instance.author.username))
+    backfill_timeline.delay(instance.user_id, instance.author_id)
+
+
+@receiver(post_delete, sender=Follow)
+def count_unfollow(sender, instance, **kwargs) -> None:
+    """Отписка меняет счетчик подписчиков и чистит ленту читателя."""
+    bump_followers(instance.author_id, -1)
+    bump_feeds(author_scope(instance.author.username))
+    unfollowed(instance.user_id, instance.author_id)
@@ -0,0 +1,50 @@
+import hashlib
+from typing import Any
+
+from django import template
+from django.conf import settings
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+register = template.Library()
+
+# поля автора и группы, которые выводятся в карточке поста
+AUTHOR_CARD_FIELDS = ('username', 'first_name', 'last_name')
+GROUP_CARD_FIELDS = ('title', 'slug')
+
+
+def card_version(post: Any) -> str:
+    """
+    Отпечаток полей автора и группы в карточке: переименование меняет
+    ключ карточек без перезаписи постов. Автор и группа уже загружены
+    вместе с постом через select_related.
+    """
+    fields = [getattr(post.author, field) for field in AUTHOR_CARD_FIELDS]
+    if post.group_id is not None:
+        fields += [getattr(post.group, field) for field in GROUP_CARD_FIELDS]
+    return hashlib.md5(repr(fields).encode()).hexdigest()[:12]
+
+
+def card_cache_key(post: Any, group_link: bool) -> str:
+    """Ключ карточки: id поста, отметка его изменения и полей карточки."""
+    return 'post_card:{}:{}:{}:{:d}'.format(
+        post.pk, post.edited.timestamp(), card_version(post), group_link
+    )
+
+
+@register.simple_tag
+def post_card(post: Any, group_link: bool = False) -> str:
+    """Отдает карточку поста из кэша, рендерит ее только при промахе."""
+    key = card_cache_key(post, group_link)
+    html = cache.get(key)
+    if html is None:
+        html = render_to_string(
+            'posts/includes/post.html',
+            {
+                'post': post,
+                'group_link': group_link,
+            },
+        )
+        cache.set(key, html, settings.POST_CARD_CACHE_TIMEOUT)
+    return mark_safe(html)
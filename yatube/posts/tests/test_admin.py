@@ -0,0 +1,112 @@
+from unittest import mock
+
+from django.contrib.admin import helpers
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from mixer.backend.django import mixer
+
+from posts.bulk import delete_posts
+from posts.models import AuthorCounter, Group, Post
+
+User = get_user_model()
+
+CHANGELIST_URL = '/admin/posts/post/'
+
+
+class PostAdminTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user_author = User.objects.create_user(username='author_post')
+        cls.group, cls.group_two = mixer.cycle(2).blend(Group)
+        cls.posts = [
+            Post.objects.create(
+                author=cls.user_author, text=f'Пост {number}', group=cls.group
+            )
+            for number in range(5)
+        ]
+        cls.admin_client = Client()
+        cls.admin_client.force_login(
+            User.objects.create_superuser('admin', 'a@a.ru', 'password')
+        )
+
+    def group_counts(self) -> tuple:
+        self.group.refresh_from_db()
+        self.group_two.refresh_from_db()
+        return self.group.posts_count, self.group_two.posts_count
+
+    def action(self, action: str, posts: list, **data) -> None:
+        return self.admin_client.post(
+            CHANGELIST_URL,
+            {
+                'action': action,
+                helpers.ACTION_CHECKBOX_NAME: [post.pk for post in posts],
+                **data,
+            },
+        )
+
+    def test_changelist_does_not_count_table(self) -> None:
+        """Список постов не считает таблицу и не грузит связи по строкам."""
+        with CaptureQueriesContext(connection) as context:
+            response = self.admin_client.get(CHANGELIST_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['cl'].result_count, 5)
+        self.assertNotIn('name="form-0-group"', response.content.decode())
+        sql = '\n'.join(query['sql'] for query in context.captured_queries)
+        self.assertNotIn('COUNT(*) AS "__count" FROM "posts_post"', sql)
+        # авторы приходят JOIN-ом, отдельно читается только пользователь сессии
+        self.assertEqual(sql.count('FROM "auth_user"'), 1)
+        filtered = self.admin_client.get(
+            CHANGELIST_URL, {'pub_date__year': self.posts[0].pub_date.year}
+        )
+        self.assertEqual(filtered.context['cl'].result_count, 5)
+
+    def test_reassign_group_action(self) -> None:
+        """Перенос в группу спрашивает группу и меняет счетчики."""
+        response = self.action('reassign_group', self.posts[:2])
+        self.assertTemplateUsed(response, 'admin/posts/post/bulk_action.html')
+        self.assertEqual(self.group_counts(), (5, 0))
+        old_edited = self.posts[0].edited
+        self.action(
+            'reassign_group',
+            self.posts[:2],
+            apply='yes',
+            group=self.group_two.pk,
+        )
+        self.assertEqual(self.group_counts(), (3, 2))
+        self.assertEqual(
+            Post.objects.filter(group=self.group_two).count(), 2
+        )
+        self.posts[0].refresh_from_db()
+        self.assertGreater(self.posts[0].edited, old_edited)
+        self.action('reassign_group', self.posts[:3], apply='yes', group='')
+        self.assertEqual(self.group_counts(), (2, 0))
+
+    def test_delete_selected_posts_action(self) -> None:
+        """Массовое удаление требует подтверждения и меняет счетчики."""
+        self.action('delete_selected_posts', self.posts[:3])
+        self.assertEqual(Post.objects.count(), 5)
+        with CaptureQueriesContext(connection) as context:
+            self.action('delete_selected_posts', self.posts[:3], apply='yes')
+        deletes = [
+            query
+            for query in context.captured_queries
+            if query['sql'].startswith('DELETE FROM "posts_post"')
+        ]
+        self.assertEqual(len(deletes), 1)
+        self.assertEqual(Post.objects.count(), 2)
+        self.assertEqual(self.group_counts(), (2, 0))
+        self.assertEqual(
+            AuthorCounter.objects.get(author=self.user_author).posts_count, 2
+        )
+
+    def test_delete_posts_in_chunks(self) -> None:
+        """Удаление идет пачками, после него сигналы снова работают."""
+        pks = [post.pk for post in self.posts[:3]]
+        with mock.patch('posts.bulk.DELETE_CHUNK', 2):
+            deleted = delete_posts(Post.objects.filter(pk__in=pks))
+        self.assertEqual(deleted, 3)
+        self.assertEqual(self.group_counts(), (2, 0))
+        Post.objects.filter(pk=self.posts[4].pk).get().delete()
+        self.assertEqual(self.group_counts(), (1, 0))
@@ -0,0 +1,99 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class ConditionalGetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user_author = User.objects.create_user(username='author_post')
+        cls.group = mixer.blend(Group, slug='test-slug')
+        cls.post = Post.objects.create(
+            author=cls.user_author, text='Тестовый пост', group=cls.group
+        )
+        cls.pages = (
+            reverse('posts:h_page'),
+            reverse('posts:page_post', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile', kwargs={'username': cls.user_author}),
+            reverse('posts:post_detail', kwargs={'pk': cls.post.pk}),
+        )
+        cls.authorized_client = Client()
+        cls.authorized_client.force_login(cls.user_author)
+
+    def revalidate(self, url: str, client: Client = None) -> int:
+        client = client or self.client
+        etag = client.get(url)['ETag']
+        return client.get(url, HTTP_IF_NONE_MATCH=etag).status_code
+
+    def test_unchanged_pages_return_304(self) -> None:
+        """Неизменившиеся страницы отвечают 304 без запроса страницы."""
+        for url in self.pages:
+            with self.subTest(url=url):
+                etag = self.client.get(url)['ETag']
+                with CaptureQueriesContext(connection) as context:
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(len(context.captured_queries), 1)
+                self.assertEqual(
+                    self.revalidate(url, self.authorized_client), 304
+                )
+
+    def test_changes_invalidate_etags(self) -> None:
+        """Создание, изменение и удаление постов меняют ETag."""
+        etags = {url: self.client.get(url)['ETag'] for url in self.pages}
+        post = Post.objects.create(
+            author=self.user_author, text='Новый пост', group=self.group
+        )
+        for url in self.pages:
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+                self.assertEqual(response.status_code, 200)
+        etags = {url: self.client.get(url)['ETag'] for url in self.pages}
+        post.delete()
+        self.post.text = 'Измененный пост'
+        self.post.save()
+        for url in self.pages:
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+                self.assertEqual(response.status_code, 200)
+
+    def test_etag_depends_on_user_and_page(self) -> None:
+        """ETag различается для пользователей и страниц ленты."""
+        url = self.pages[0]
+        self.assertNotEqual(
+            self.client.get(url)['ETag'],
+            self.authorized_client.get(url)['ETag'],
+        )
+        self.assertNotEqual(
+            self.client.get(url)['ETag'],
+            self.client.get(url, {'page': 2})['ETag'],
+        )
+
+    def test_login_invalidates_pages_with_forms(self) -> None:
+        """
+        После повторного входа CSRF-секрет меняется: страница с формой
+        подписки не отвечает 304, и ее новый токен принимается.
+        """
+        User.objects.create_user(username='reader', password='password')
+        client = Client(enforce_csrf_checks=True)
+        url = self.pages[2]
+        follow_url = reverse(
+            'posts:profile_follow', kwargs={'username': self.user_author}
+        )
+        client.login(username='reader', password='password')
+        etag = client.get(url)['ETag']
+        client.logout()
+        client.login(username='reader', password='password')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        response = client.post(
+            follow_url, {'csrfmiddlewaretoken': response.context['csrf_token']}
+        )
+        self.assertEqual(response.status_code, 302)
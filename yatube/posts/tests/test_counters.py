@@ -0,0 +1,78 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from posts.models import AuthorCounter, Group, Post
+
+User = get_user_model()
+
+
+class PostCountersTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user_author = User.objects.create_user(username='author_post')
+        cls.group, cls.group_two = mixer.cycle(2).blend(Group)
+        cls.authorized_client = Client()
+        cls.authorized_client.force_login(cls.user_author)
+
+    def author_count(self) -> int:
+        return AuthorCounter.objects.get(author=self.user_author).posts_count
+
+    def group_counts(self) -> tuple:
+        self.group.refresh_from_db()
+        self.group_two.refresh_from_db()
+        return self.group.posts_count, self.group_two.posts_count
+
+    def test_counters_follow_post_form(self) -> None:
+        """Создание и перенос поста формой меняют счетчики."""
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            data={'text': 'Тестовый пост', 'group': self.group.pk},
+        )
+        self.assertEqual(self.author_count(), 1)
+        self.assertEqual(self.group_counts(), (1, 0))
+        post = Post.objects.get(author=self.user_author)
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'pk': post.pk}),
+            data={'text': 'Тестовый пост', 'group': self.group_two.pk},
+        )
+        self.assertEqual(self.author_count(), 1)
+        self.assertEqual(self.group_counts(), (0, 1))
+
+    def test_counters_follow_delete(self) -> None:
+        """Удаление поста уменьшает счетчики автора и группы."""
+        post = Post.objects.create(
+            author=self.user_author, text='Тестовый пост', group=self.group
+        )
+        post.delete()
+        self.assertEqual(self.author_count(), 0)
+        self.assertEqual(self.group_counts(), (0, 0))
+
+    def test_pages_read_counters(self) -> None:
+        """Страницы поста и профиля показывают сохраненный счетчик."""
+        post = Post.objects.create(author=self.user_author, text='Пост')
+        AuthorCounter.objects.filter(author=self.user_author).update(
+            posts_count=7
+        )
+        response = self.client.get(
+            reverse('posts:post_detail', kwargs={'pk': post.pk})
+        )
+        self.assertContains(response, '<span >7</span>')
+        response = self.client.get(
+            reverse('posts:profile', kwargs={'username': self.user_author})
+        )
+        self.assertEqual(response.context['page_obj'].paginator.count, 7)
+
+    def test_recount_posts_fixes_drift(self) -> None:
+        """Команда recount_posts исправляет расхождение счетчиков."""
+        Post.objects.bulk_create(
+            Post(author=self.user_author, text='Пост', group=self.group)
+            for _ in range(3)
+        )
+        call_command('recount_posts', stdout=StringIO())
+        self.assertEqual(self.author_count(), 3)
+        self.assertEqual(self.group_counts(), (3, 0))
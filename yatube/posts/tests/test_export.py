@@ -0,0 +1,85 @@
+import csv
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from posts import export
+from posts.models import Group, Post
+
+User = get_user_model()
+
+NUMBER_TEST_POSTS = 7
+
+
+class ExportPostsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user_author = User.objects.create_user(username='author_post')
+        cls.staff = User.objects.create_user(username='staff', is_staff=True)
+        cls.group = mixer.blend(Group, slug='test-slug')
+        mixer.cycle(NUMBER_TEST_POSTS).blend(
+            Post, author=cls.user_author, group=cls.group
+        )
+        cls.staff_client = Client()
+        cls.staff_client.force_login(cls.staff)
+        cls.authorized_client = Client()
+        cls.authorized_client.force_login(cls.user_author)
+
+    def test_export_endpoint_is_staff_only(self) -> None:
+        """Выгрузка доступна только сотрудникам."""
+        url = reverse('posts:export_posts', kwargs={'file_format': 'jsonl'})
+        self.assertEqual(self.authorized_client.get(url).status_code, 302)
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+    def test_export_jsonl_streams_all_posts(self) -> None:
+        """JSONL выгружается потоком, по строке на пост."""
+        response = self.staff_client.get(
+            reverse('posts:export_posts', kwargs={'file_format': 'jsonl'})
+        )
+        self.assertTrue(response.streaming)
+        records = [
+            json.loads(line)
+            for line in b''.join(response.streaming_content).splitlines()
+        ]
+        self.assertEqual(len(records), NUMBER_TEST_POSTS)
+        self.assertEqual(records[0]['author'], 'author_post')
+        self.assertEqual(records[0]['group'], 'test-slug')
+
+    def test_rows_are_read_in_keyset_batches(self) -> None:
+        """Посты читаются пачками заданного размера без пропусков."""
+        with self.assertNumQueries(3):
+            rows = list(export.iter_post_rows(batch_size=3))
+        self.assertEqual(
+            [row[0] for row in rows],
+            sorted(Post.objects.values_list('pk', flat=True)),
+        )
+
+    def test_export_command_csv(self) -> None:
+        """Команда export_posts пишет CSV с автором и группой."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'posts.csv'
+            call_command(
+                'export_posts',
+                format='csv',
+                output=str(path),
+                batch_size=2,
+                stdout=StringIO(),
+            )
+            with open(path, encoding='utf-8', newline='') as stream:
+                rows = list(csv.DictReader(stream))
+        self.assertEqual(len(rows), NUMBER_TEST_POSTS)
+        self.assertEqual(
+            {(row['author'], row['group']) for row in rows},
+            {('author_post', 'test-slug')},
+        )
+        self.assertEqual(
+            [int(row['id']) for row in rows],
+            sorted(Post.objects.values_list('pk', flat=True)),
+        )
@@ -0,0 +1,88 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from posts.feed_cache import FEED_INDEX, bump_feeds, generation_key
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class FeedCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user_author = User.objects.create_user(username='author_post')
+        cls.group, cls.group_two = mixer.cycle(2).blend(Group)
+        cls.post = Post.objects.create(
+            author=cls.user_author, text='Тестовый пост', group=cls.group
+        )
+        cls.authorized_client = Client()
+        cls.authorized_client.force_login(cls.user_author)
+        cls.index = reverse('posts:h_page')
+        cls.group_page = reverse(
+            'posts:page_post', kwargs={'slug': cls.group.slug}
+        )
+        cls.group_two_page = reverse(
+            'posts:page_post', kwargs={'slug': cls.group_two.slug}
+        )
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def assert_cached(self, url: str, cached: bool = True) -> None:
+        response = self.client.get(url)
+        self.assertEqual(response.context is None, cached, url)
+
+    def test_anonymous_feed_is_cached(self) -> None:
+        """Повторный анонимный запрос ленты отдается из кэша."""
+        self.client.get(self.index)
+        self.assert_cached(self.index)
+        self.client.get(self.index + '?page=2')
+        self.assert_cached(self.index + '?page=2')
+
+    def test_authorized_feed_is_not_cached(self) -> None:
+        """Авторизованный пользователь получает страницу со своей шапкой."""
+        self.client.get(self.index)
+        response = self.authorized_client.get(self.index)
+        self.assertIsNotNone(response.context)
+        self.assertContains(response, 'Пользователь: author_post')
+
+    def test_new_post_bumps_only_its_feeds(self) -> None:
+        """Новый пост сбрасывает только ленты, в которые он попадает."""
+        for url in (self.index, self.group_page, self.group_two_page):
+            self.client.get(url)
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            data={'text': 'Новый пост', 'group': self.group.pk},
+        )
+        self.assert_cached(self.index, cached=False)
+        self.assert_cached(self.group_page, cached=False)
+        self.assert_cached(self.group_two_page)
+
+    def test_group_move_bumps_both_groups(self) -> None:
+        """Перенос поста в другую группу сбрасывает страницы обеих групп."""
+        for url in (self.group_page, self.group_two_page):
+            self.client.get(url)
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'pk': self.post.pk}),
+            data={'text': 'Тестовый пост', 'group': self.group_two.pk},
+        )
+        self.assertNotContains(self.client.get(self.group_page), 'Тестовый')
+        self.assertContains(self.client.get(self.group_two_page), 'Тестовый')
+
+    def test_evicted_generation_does_not_revive_old_pages(self) -> None:
+        """Вытесненное поколение ленты не возвращает устаревшие страницы."""
+        bump_feeds(FEED_INDEX)
+        self.client.get(self.index)
+        self.assert_cached(self.index)
+        cache.delete(generation_key(FEED_INDEX))
+        Post.objects.create(author=self.user_author, text='Новый пост')
+        self.assertContains(self.client.get(self.index), 'Новый пост')
+
+    @override_settings(FEED_CACHE_TIMEOUT=0)
+    def test_cache_can_be_disabled(self) -> None:
+        """Нулевой таймаут отключает кэш страниц."""
+        self.client.get(self.index)
+        self.assert_cached(self.index, cached=False)
@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from posts.forms import PostForm
+from posts.models import Group, Post
+from posts.registry import group_registry
+
+User = get_user_model()
+
+
+def group_queries(context: CaptureQueriesContext) -> list:
+    return [
+        query['sql']
+        for query in context.captured_queries
+        if 'FROM "posts_group"' in query['sql']
+    ]
+
+
+class GroupRegistryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user_author = User.objects.create_user(username='author_post')
+        cls.group, cls.group_two = mixer.cycle(2).blend(Group)
+        Post.objects.create(
+            author=cls.user_author, text='Тестовый пост', group=cls.group
+        )
+        cls.authorized_client = Client()
+        cls.authorized_client.force_login(cls.user_author)
+
+    def setUp(self) -> None:
+        cache.clear()
+        group_registry.clear()
+
+    def test_group_page_reads_group_once(self) -> None:
+        """Страница группы берет группу из кэша после первого запроса."""
+        url = reverse('posts:page_post', kwargs={'slug': self.group.slug})
+        self.client.get(url)
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.context['group'], self.group)
+        self.assertEqual(group_queries(context), [])
+
+    def test_post_form_uses_registry(self) -> None:
+        """Форма поста строит выбор групп и находит группу без запросов."""
+        str(PostForm())
+        with CaptureQueriesContext(connection) as context:
+            rendered = str(PostForm())
+            group = PostForm().fields['group'].clean(self.group.pk)
+        self.assertEqual(group_queries(context), [])
+        self.assertIn(str(self.group_two), rendered)
+        self.assertEqual(group, self.group)
+        form = PostForm(data={'text': 'Текст', 'group': self.group.pk})
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['group'], self.group)
+        form = PostForm(data={'text': 'Текст', 'group': 'not-a-pk'})
+        self.assertIn('group', form.errors)
+        form = PostForm(data={'text': 'Текст', 'group': ''})
+        self.assertTrue(form.is_valid())
+        self.assertIsNone(form.cleaned_data['group'])
+
+    def test_changes_reset_registry(self) -> None:
+        """Изменение и удаление группы и новые посты сбрасывают кэш."""
+        url = reverse('posts:page_post', kwargs={'slug': self.group.slug})
+        self.client.get(url)
+        self.group.refresh_from_db()
+        self.group.title = 'Новое название'
+        self.group.save()
+        self.assertEqual(
+            group_registry.get(slug=self.group.slug).title, 'Новое название'
+        )
+        self.authorized_client.post(
+            reverse('posts:post_create'),
+            {'text': 'Еще пост', 'group': self.group.pk},
+        )
+        self.assertEqual(
+            group_registry.get(pk=self.group.pk).posts_count, 2
+        )
+        self.group_two.delete()
+        self.assertNotIn(self.group_two, group_registry.all())
+        cache.clear()
+        response = self.client.get(
+            reverse('posts:page_post', kwargs={'slug': self.group_two.slug})
+        )
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,128 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from posts.models import (
+    AuthorCounter,
+    Follow,
+    Group,
+    Post,
+    TimelineEntry,
+)
+from posts.timeline import fan_out_posts
+
+User = get_user_model()
+
+
+class ImportPostsCommandTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user_author = User.objects.create_user(username='author_post')
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+
+    def import_file(self, name: str, content: str) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / name
+            path.write_text(content, encoding='utf-8')
+            call_command(
+                'import_posts',
+                str(path),
+                transaction_size=2,
+                stdout=StringIO(),
+            )
+
+    def test_import_jsonl(self) -> None:
+        """Посты из JSONL импортируются с датой, группой и счетчиками."""
+        records = [
+            {
+                'text': 'Пост 1',
+                'author': 'author_post',
+                'group': 'test-slug',
+                'pub_date': '2020-01-01T10:00:00',
+            },
+            {'text': 'Пост 2', 'author': 'author_post'},
+            {'text': 'Пост 3', 'author': 'author_post', 'group': 'test-slug'},
+            {'text': 'Чужой', 'author': 'nobody'},
+            {'text': 'Без группы', 'author': 'author_post', 'group': 'nope'},
+        ]
+        self.import_file(
+            'posts.jsonl',
+            '\n'.join(json.dumps(record) for record in records),
+        )
+        self.assertEqual(Post.objects.count(), 3)
+        self.assertEqual(
+            Post.objects.get(text='Пост 1').pub_date.year, 2020
+        )
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.posts_count, 2)
+        self.assertEqual(
+            AuthorCounter.objects.get(author=self.user_author).posts_count, 3
+        )
+
+    def test_import_csv(self) -> None:
+        """Посты из CSV импортируются построчно."""
+        self.import_file(
+            'posts.csv',
+            'text,author,group,pub_date\n'
+            'Пост 1,author_post,test-slug,\n'
+            'Пост 2,author_post,,2021-05-05 12:00:00\n',
+        )
+        self.assertEqual(
+            list(Post.objects.order_by('pk').values_list('text', 'group')),
+            [('Пост 1', self.group.pk), ('Пост 2', None)],
+        )
+
+    def test_broken_records_are_skipped(self) -> None:
+        """Битые строки и неверные даты пропускаются, импорт продолжается."""
+        stdout = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'posts.jsonl'
+            path.write_text(
+                '{"text": "Битый\n'
+                '[1, 2]\n'
+                '{"text": "Плохая дата", "author": "author_post", '
+                '"pub_date": "2020-13-45T10:00:00"}\n'
+                '{"text": "С поясом", "author": "author_post", '
+                '"pub_date": "2020-01-01T10:00:00+03:00"}\n',
+                encoding='utf-8',
+            )
+            call_command('import_posts', str(path), stdout=stdout)
+        self.assertEqual(
+            list(Post.objects.values_list('text', flat=True)), ['С поясом']
+        )
+        self.assertIn('пропущено 3', stdout.getvalue())
+
+    def test_imported_posts_reach_timelines(self) -> None:
+        """Импортированные посты раскладываются по лентам подписчиков."""
+        reader = User.objects.create_user(username='reader')
+        Follow.objects.create(user=reader, author=self.user_author)
+        records = [
+            {'text': f'Пост {number}', 'author': 'author_post'}
+            for number in range(3)
+        ]
+        with mock.patch.object(fan_out_posts, 'delay') as fan_out:
+            self.import_file(
+                'posts.jsonl',
+                '\n'.join(json.dumps(record) for record in records),
+            )
+        self.assertEqual(fan_out.call_count, 2)
+        for call in fan_out.call_args_list:
+            fan_out_posts(*call.args)
+        self.assertEqual(
+            set(
+                TimelineEntry.objects.filter(reader=reader).values_list(
+                    'post_id', flat=True
+                )
+            ),
+            set(Post.objects.values_list('pk', flat=True)),
+        )
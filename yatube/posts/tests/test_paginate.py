@@ -1,9 +1,16 @@
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from mixer.backend.django import mixer
 
+from posts.registry import group_registry
+from posts.views import groups_posts
+from yatube.utils import encode_cursor
+
 User = get_user_model()
 
 
@@ -51,3 +58,211 @@ class PaginatorViewsTest(TestCase):
                     ),
                     NUMBER_TEST_POSTS - settings.OBJECTS_PER_PAGE,
                 )
+
+
+@override_settings(FEED_PAGINATION='cursor')
+class CursorPaginatorViewsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.posts = mixer.cycle(NUMBER_TEST_POSTS).blend(
+            'posts.Post',
+            author=mixer.blend(User, username='kir'),
+            group=mixer.blend('posts.Group', slug='test-slug-page'),
+        )
+        cls.reverse_names_paginate = {
+            reverse(
+                'posts:page_post',
+                kwargs={'slug': 'test-slug-page'},
+            ),
+            reverse('posts:h_page'),
+            reverse('posts:profile', kwargs={'username': 'kir'}),
+        }
+
+    def test_cursor_pages_walk_forward_and_back(self):
+        """Курсоры after/before обходят ленту без пропусков и повторов."""
+        for reverse_name in self.reverse_names_paginate:
+            with self.subTest(reverse_name=reverse_name):
+                first_page = self.client.get(reverse_name).context['page_obj']
+                self.assertEqual(len(first_page), settings.OBJECTS_PER_PAGE)
+                self.assertFalse(first_page.has_previous())
+                self.assertTrue(first_page.has_next())
+                second_page = self.client.get(
+                    reverse_name + '?after=' + first_page.next_cursor
+                ).context['page_obj']
+                self.assertEqual(
+                    len(second_page),
+                    NUMBER_TEST_POSTS - settings.OBJECTS_PER_PAGE,
+                )
+                self.assertFalse(second_page.has_next())
+                self.assertEqual(
+                    {post.pk for post in first_page}
+                    | {post.pk for post in second_page},
+                    {post.pk for post in self.posts},
+                )
+                back_page = self.client.get(
+                    reverse_name + '?before=' + second_page.previous_cursor
+                ).context['page_obj']
+                self.assertEqual(list(back_page), list(first_page))
+                self.assertFalse(back_page.has_previous())
+
+    def test_cursor_past_the_end_links_to_first_page(self):
+        """Пустая страница за концом ленты не ссылается на ?before=None."""
+        oldest = min(self.posts, key=lambda post: (post.pub_date, post.pk))
+        response = self.client.get(
+            reverse('posts:h_page'),
+            {'after': encode_cursor(oldest.pub_date, oldest.pk)},
+        )
+        self.assertEqual(len(response.context['page_obj']), 0)
+        self.assertContains(response, 'href="?"')
+        self.assertNotContains(response, '?before=None')
+
+    def test_broken_cursor_returns_first_page(self):
+        """Битый курсор открывает первую страницу ленты."""
+        response = self.client.get(reverse('posts:h_page') + '?after=broken')
+        self.assertFalse(response.context['page_obj'].has_previous())
+        self.assertEqual(
+            len(response.context['page_obj']), settings.OBJECTS_PER_PAGE
+        )
+
+
+@override_settings(FEED_PAGINATION='window')
+class WindowPaginatorViewsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        mixer.cycle(NUMBER_TEST_POSTS * 5).blend(
+            'posts.Post', author=mixer.blend(User, username='kir')
+        )
+
+    def test_window_pages_skip_count(self):
+        """Страницы без COUNT(*) с ограниченным окном ссылок."""
+        url = reverse('posts:h_page')
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url + '?page=3')
+        self.assertFalse(
+            any('COUNT(' in query['sql'] for query in context.captured_queries)
+        )
+        page = response.context['page_obj']
+        self.assertEqual(len(page), settings.OBJECTS_PER_PAGE)
+        self.assertTrue(page.has_previous())
+        self.assertTrue(page.has_next())
+        self.assertEqual(list(page.page_window), [1, 2, 3, 4])
+        self.assertNotContains(response, 'Последняя')
+        last_page = self.client.get(url + '?page=7').context['page_obj']
+        self.assertEqual(
+            len(last_page), NUMBER_TEST_POSTS * 5 % settings.OBJECTS_PER_PAGE
+        )
+        self.assertFalse(last_page.has_next())
+        self.assertEqual(list(last_page.page_window), [4, 5, 6, 7])
+        for number in ('100', 'broken', '0'):
+            with self.subTest(page=number):
+                page = self.client.get(url, {'page': number}).context[
+                    'page_obj'
+                ]
+                self.assertEqual(page.number, 1)
+
+
+class PageWindowTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        mixer.cycle(NUMBER_TEST_POSTS * 10).blend(
+            'posts.Post', author=mixer.blend(User, username='kir')
+        )
+
+    def test_page_links_are_bounded(self):
+        """Число ссылок на страницы не зависит от длины ленты."""
+        response = self.client.get(reverse('posts:h_page') + '?page=7')
+        self.assertEqual(
+            list(response.context['page_obj'].page_window),
+            [4, 5, 6, 7, 8, 9, 10],
+        )
+        self.assertNotContains(response, 'page=2"')
+        self.assertContains(response, 'page=13"')
+
+
+class MergedGroupsViewsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = mixer.blend(User, username='kir')
+        cls.groups = mixer.cycle(3).blend('posts.Group')
+        cls.posts = []
+        for group in cls.groups:
+            cls.posts += mixer.cycle(NUMBER_TEST_POSTS).blend(
+                'posts.Post', author=author, group=group
+            )
+        mixer.cycle(NUMBER_TEST_POSTS).blend('posts.Post', author=author)
+        cls.posts.sort(key=lambda post: (post.pub_date, post.pk), reverse=True)
+        cls.url = reverse(
+            'posts:groups_posts',
+            kwargs={'slugs': [group.slug for group in cls.groups]},
+        )
+
+    def test_groups_merge_in_date_order(self):
+        """Общая лента групп сливает их посты по дате, страницы - по ключу."""
+        with CaptureQueriesContext(connection) as context:
+            first_page = self.client.get(self.url).context['page_obj']
+        self.assertEqual(list(first_page), self.posts[: len(first_page)])
+        self.assertEqual(len(first_page), settings.OBJECTS_PER_PAGE)
+        selects = [
+            query['sql']
+            for query in context.captured_queries
+            if query['sql'].startswith('SELECT "posts_post"')
+        ]
+        # по запросу на группу, без IN по списку групп
+        self.assertEqual(len(selects), len(self.groups))
+        self.assertFalse(any(' IN (' in sql for sql in selects))
+        seen = list(first_page)
+        page = first_page
+        while page.has_next():
+            page = self.client.get(
+                self.url, {'after': page.next_cursor}
+            ).context['page_obj']
+            seen += list(page)
+        self.assertEqual(seen, self.posts)
+        back_page = self.client.get(
+            self.url, {'before': page.previous_cursor}
+        ).context['page_obj']
+        self.assertEqual(
+            list(back_page),
+            seen[-len(page) - settings.OBJECTS_PER_PAGE:-len(page)],
+        )
+
+    def test_unknown_or_too_many_groups_return_404(self):
+        """Неизвестная группа или слишком много групп - 404."""
+        slugs = [self.groups[0].slug, 'missing']
+        self.assertEqual(
+            self.client.get(
+                reverse('posts:groups_posts', kwargs={'slugs': slugs})
+            ).status_code,
+            404,
+        )
+        with override_settings(MERGED_GROUPS_LIMIT=2):
+            self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_cold_registry_stays_within_budget(self):
+        """
+        На MERGED_GROUPS_LIMIT группах с пустым кэшем групп slug читаются
+        одним запросом, и view укладывается в объявленный бюджет.
+        """
+        groups = mixer.cycle(settings.MERGED_GROUPS_LIMIT).blend(
+            'posts.Group'
+        )
+        for group in groups:
+            mixer.blend('posts.Post', group=group)
+        url = reverse(
+            'posts:groups_posts',
+            kwargs={'slugs': [group.slug for group in groups]},
+        )
+        cache.clear()
+        group_registry.clear()
+        user = User.objects.create_user(username='reader')
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(len(response.context['page_obj']), len(groups))
+        self.assertLessEqual(len(context), groups_posts.query_budget)
+        group_selects = [
+            query['sql']
+            for query in context.captured_queries
+            if query['sql'].startswith('SELECT "posts_group"')
+        ]
+        self.assertEqual(len(group_selects), 1)
@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.feed_cache import FEED_EPOCH, generation_key
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class PostCardCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user_author = User.objects.create_user(
+            username='author_post', first_name='Кир'
+        )
+        cls.group = Group.objects.create(
+            title='Тестовая группа',
+            slug='test-slug',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user_author,
+            text='Тестовый пост',
+            group=cls.group,
+        )
+        cls.authorized_client = Client()
+        cls.authorized_client.force_login(cls.user_author)
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def get_index(self) -> str:
+        return self.client.get(reverse('posts:h_page')).content.decode()
+
+    def test_card_is_served_from_cache(self) -> None:
+        """Повторный показ ленты берет карточку поста из кэша."""
+        self.get_index()
+        with self.assertTemplateNotUsed('posts/includes/post.html'):
+            self.get_index()
+
+    def test_post_edit_invalidates_card(self) -> None:
+        """Редактирование поста сбрасывает его карточку."""
+        self.get_index()
+        self.authorized_client.post(
+            reverse('posts:post_edit', kwargs={'pk': self.post.pk}),
+            data={'text': 'Измененный пост', 'group': self.group.pk},
+        )
+        self.assertIn('Измененный пост', self.get_index())
+
+    def test_author_and_group_rename_invalidate_card(self) -> None:
+        """Переименование автора и группы сбрасывает карточки постов."""
+        self.get_index()
+        self.user_author.first_name = 'Кирилл'
+        self.user_author.save()
+        self.group.title = 'Новая группа'
+        self.group.save()
+        html = self.get_index()
+        self.assertIn('Кирилл', html)
+        self.assertIn('#Новая группа', html)
+
+    def test_rename_keeps_posts_and_other_feeds(self) -> None:
+        """
+        Переименование не переписывает посты и не сбрасывает все ленты,
+        но обновляет профили авторов группы.
+        """
+        profile = reverse('posts:profile', kwargs={'username': 'author_post'})
+        self.client.get(profile)
+        edited = Post.objects.get(pk=self.post.pk).edited
+        epoch = cache.get(generation_key(FEED_EPOCH))
+        self.group.title = 'Другая группа'
+        self.group.save()
+        self.assertEqual(Post.objects.get(pk=self.post.pk).edited, edited)
+        self.assertEqual(cache.get(generation_key(FEED_EPOCH)), epoch)
+        self.assertContains(self.client.get(profile), '#Другая группа')
@@ -0,0 +1,167 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from posts import urls as posts_urls
+
+User = get_user_model()
+
+NUMBER_TEST_POSTS = 12
+
+
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.groups = mixer.cycle(NUMBER_TEST_POSTS).blend('posts.Group')
+        cls.authors = mixer.cycle(NUMBER_TEST_POSTS).blend(User)
+        cls.posts = mixer.cycle(NUMBER_TEST_POSTS).blend(
+            'posts.Post',
+            author=(author for author in cls.authors),
+            group=(group for group in cls.groups),
+        )
+        cls.author = cls.authors[0]
+        cls.author.is_staff = True
+        cls.author.save()
+        mixer.cycle(NUMBER_TEST_POSTS).blend(
+            'posts.Post', author=cls.author, group=cls.groups[0]
+        )
+        cls.post = cls.posts[0]
+        cls.authorized_client = Client()
+        cls.authorized_client.force_login(cls.author)
+        cls.requests = {
+            'h_page': (('get', reverse('posts:h_page'), None),),
+            'page_post': (
+                (
+                    'get',
+                    reverse(
+                        'posts:page_post', kwargs={'slug': cls.groups[0].slug}
+                    ),
+                    None,
+                ),
+            ),
+            'groups_posts': (
+                (
+                    'get',
+                    reverse(
+                        'posts:groups_posts',
+                        kwargs={
+                            'slugs': [
+                                group.slug
+                                for group in cls.groups[
+                                    : settings.MERGED_GROUPS_LIMIT
+                                ]
+                            ]
+                        },
+                    ),
+                    None,
+                ),
+            ),
+            'profile': (
+                (
+                    'get',
+                    reverse(
+                        'posts:profile', kwargs={'username': cls.author}
+                    ),
+                    None,
+                ),
+            ),
+            'post_detail': (
+                (
+                    'get',
+                    reverse('posts:post_detail', kwargs={'pk': cls.post.pk}),
+                    None,
+                ),
+            ),
+            'post_create': (
+                ('get', reverse('posts:post_create'), None),
+                (
+                    'post',
+                    reverse('posts:post_create'),
+                    {'text': 'Новый пост', 'group': cls.groups[1].pk},
+                ),
+            ),
+            'post_edit': (
+                (
+                    'get',
+                    reverse('posts:post_edit', kwargs={'pk': cls.post.pk}),
+                    None,
+                ),
+                (
+                    'post',
+                    reverse('posts:post_edit', kwargs={'pk': cls.post.pk}),
+                    {'text': 'Измененный пост', 'group': cls.groups[2].pk},
+                ),
+            ),
+            'search': (
+                (
+                    'get',
+                    reverse('posts:search') + '?q=' + cls.posts[0].text[:5],
+                    None,
+                ),
+            ),
+            'follow_index': (
+                ('get', reverse('posts:follow_index'), None),
+            ),
+            'profile_follow': (
+                (
+                    'post',
+                    reverse(
+                        'posts:profile_follow',
+                        kwargs={'username': cls.authors[1]},
+                    ),
+                    {},
+                ),
+            ),
+            'profile_unfollow': (
+                (
+                    'post',
+                    reverse(
+                        'posts:profile_unfollow',
+                        kwargs={'username': cls.authors[1]},
+                    ),
+                    {},
+                ),
+            ),
+            'export_posts': (
+                (
+                    'get',
+                    reverse(
+                        'posts:export_posts', kwargs={'file_format': 'jsonl'}
+                    ),
+                    None,
+                ),
+            ),
+        }
+
+    def test_every_view_declares_budget(self) -> None:
+        """Каждый view приложения posts объявляет бюджет запросов."""
+        for pattern in posts_urls.urlpatterns:
+            with self.subTest(name=pattern.name):
+                self.assertIsInstance(
+                    getattr(pattern.callback, 'query_budget', None), int
+                )
+                self.assertIn(pattern.name, self.requests)
+
+    def test_views_stay_within_budget(self) -> None:
+        """Число SQL-запросов view не превышает объявленный бюджет."""
+        for pattern in posts_urls.urlpatterns:
+            budget = pattern.callback.query_budget
+            for method, url, data in self.requests[pattern.name]:
+                with self.subTest(name=pattern.name, method=method):
+                    with CaptureQueriesContext(connection) as context:
+                        response = getattr(self.authorized_client, method)(
+                            url, data
+                        )
+                        if response.streaming:
+                            b''.join(response.streaming_content)
+                    self.assertLessEqual(
+                        len(context),
+                        budget,
+                        '\n'.join(
+                            query['sql'] for query in context.captured_queries
+                        ),
+                    )
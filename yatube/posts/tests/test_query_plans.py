@@ -0,0 +1,84 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+User = get_user_model()
+
+NUMBER_TEST_POSTS = 30
+
+FULL_SCAN = re.compile(r'^SCAN (TABLE )?\w+$')
+
+
+class FeedQueryPlanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.author = mixer.blend(User, username='kir')
+        cls.group = mixer.blend('posts.Group', slug='test-slug-plan')
+        mixer.cycle(NUMBER_TEST_POSTS).blend(
+            'posts.Post', author=cls.author, group=cls.group
+        )
+        cls.feeds = (
+            reverse('posts:h_page'),
+            reverse('posts:h_page') + '?page=2',
+            reverse('posts:page_post', kwargs={'slug': cls.group.slug}),
+            reverse('posts:profile', kwargs={'username': cls.author}),
+        )
+        cls.authorized_client = Client()
+        cls.authorized_client.force_login(cls.author)
+
+    def explain(self, sql: str) -> list:
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assert_feed_plans(self, url: str) -> None:
+        with CaptureQueriesContext(connection) as context:
+            self.authorized_client.get(url)
+        post_queries = [
+            query['sql']
+            for query in context.captured_queries
+            if query['sql'].startswith('SELECT')
+            and 'posts_post' in query['sql']
+        ]
+        self.assertTrue(post_queries, f'{url} не читает посты')
+        for sql in post_queries:
+            for detail in self.explain(sql):
+                self.assertNotIn(
+                    'TEMP B-TREE',
+                    detail,
+                    f'{url}: сортировка без индекса {sql}',
+                )
+                self.assertIsNone(
+                    FULL_SCAN.match(detail),
+                    f'{url}: полный просмотр таблицы {sql}',
+                )
+
+    def test_paged_feeds_use_indexes(self) -> None:
+        """Ленты с нумерацией страниц читают посты по индексам."""
+        for url in self.feeds:
+            with self.subTest(url=url):
+                self.assert_feed_plans(url)
+
+    @override_settings(FEED_PAGINATION='cursor')
+    def test_cursor_feeds_use_indexes(self) -> None:
+        """Ленты с курсорной пагинацией читают посты по индексам."""
+        for url in self.feeds:
+            with self.subTest(url=url):
+                response = self.authorized_client.get(url)
+                first_page = response.context['page_obj']
+                self.assert_feed_plans(url)
+                self.assert_feed_plans(
+                    url.split('?')[0] + '?after=' + first_page.next_cursor
+                )
+
+    @override_settings(FEED_PAGINATION='window')
+    def test_window_feeds_use_indexes(self) -> None:
+        """Ленты без COUNT(*) читают посты по индексам."""
+        for url in self.feeds:
+            with self.subTest(url=url):
+                self.assert_feed_plans(url)
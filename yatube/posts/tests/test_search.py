@@ -0,0 +1,71 @@
+from django.contrib.admin.sites import site
+from django.contrib.auth import get_user_model
+from django.test import Client, RequestFactory, TestCase
+from django.urls import reverse
+
+from posts.models import Post
+
+User = get_user_model()
+
+
+class PostSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.user_author = User.objects.create_user(username='author_post')
+        cls.post_cats = Post.objects.create(
+            author=cls.user_author, text='Кошки любят спать на солнце'
+        )
+        cls.post_dogs = Post.objects.create(
+            author=cls.user_author, text='Собаки любят гулять'
+        )
+        cls.post_both = Post.objects.create(
+            author=cls.user_author,
+            text='Кошки и собаки, кошки и собаки, кошки и собаки',
+        )
+
+    def search(self, query: str) -> list:
+        response = self.client.get(reverse('posts:search'), {'q': query})
+        return list(response.context['page_obj'])
+
+    def test_search_finds_ranked_posts(self) -> None:
+        """Поиск находит посты по словам и префиксам, лучшие - первыми."""
+        self.assertEqual(
+            self.search('кошки'), [self.post_both, self.post_cats]
+        )
+        self.assertEqual(
+            set(self.search('люб')), {self.post_cats, self.post_dogs}
+        )
+        self.assertEqual(self.search('кошки гулять'), [])
+
+    def test_search_index_follows_edits_and_deletes(self) -> None:
+        """Индекс обновляется при изменении и удалении поста."""
+        self.post_dogs.text = 'Попугаи любят болтать'
+        self.post_dogs.save()
+        self.assertEqual(self.search('попугаи'), [self.post_dogs])
+        self.assertEqual(self.search('собаки'), [self.post_both])
+        self.post_both.delete()
+        self.assertEqual(self.search('собаки'), [])
+
+    def test_search_tolerates_fts_syntax(self) -> None:
+        """Служебные символы FTS5 в запросе не ломают поиск."""
+        for query in ('"', 'кошки OR', 'NEAR(', '*', ''):
+            with self.subTest(query=query):
+                self.client.get(reverse('posts:search'), {'q': query})
+
+    def test_admin_search_uses_index(self) -> None:
+        """Поиск в админке идет через полнотекстовый индекс."""
+        admin_model = site._registry[Post]
+        request = RequestFactory().get('/')
+        queryset, _ = admin_model.get_search_results(
+            request, Post.objects.all(), 'собаки'
+        )
+        self.assertIn('posts_post_fts', str(queryset.query))
+        self.assertEqual(
+            set(queryset), {self.post_dogs, self.post_both}
+        )
+        client = Client()
+        client.force_login(
+            User.objects.create_superuser('admin', 'a@a.ru', 'password')
+        )
+        response = client.get('/admin/posts/post/', {'q': 'собаки'})
+        self.assertEqual(response.status_code, 200)
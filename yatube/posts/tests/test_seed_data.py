@@ -0,0 +1,58 @@
+import datetime as dt
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from posts.models import AuthorCounter, Group, Post
+
+User = get_user_model()
+
+
+class SeedDataCommandTests(TestCase):
+    def seed(self, seed: int, **options) -> list:
+        call_command(
+            'seed_data',
+            users=5,
+            groups=3,
+            posts=60,
+            seed=seed,
+            transaction_size=25,
+            stdout=StringIO(),
+            **options,
+        )
+        return list(
+            Post.objects.order_by('pk').values_list(
+                'text', 'author__username', 'group__slug', 'pub_date'
+            )
+        )
+
+    def test_seed_data_is_deterministic(self):
+        """Одинаковый seed дает одинаковый набор постов."""
+        first = self.seed(seed=7)
+        Post.objects.all().delete()
+        User.objects.all().delete()
+        Group.objects.all().delete()
+        self.assertEqual(self.seed(seed=7), first)
+
+    def test_seed_data_sets_dates_and_counters(self):
+        """Даты публикации разнесены во времени, счетчики пересчитаны."""
+        self.seed(seed=1)
+        self.assertEqual(Post.objects.count(), 60)
+        dates = list(Post.objects.order_by('pk').values_list(
+            'pub_date', flat=True
+        ))
+        self.assertEqual(dates, sorted(dates))
+        self.assertGreater((dates[-1] - dates[0]).days, 30)
+        self.assertEqual(
+            sum(AuthorCounter.objects.values_list('posts_count', flat=True)),
+            60,
+        )
+
+    def test_seed_data_ends_at_given_date(self):
+        """Даты публикации не позже --end и не зависят от текущего времени."""
+        self.seed(seed=1, end='2020-06-01T00:00:00')
+        last = Post.objects.order_by('-pub_date').first().pub_date
+        self.assertLessEqual(last, dt.datetime(2020, 6, 1))
+        self.assertGreater(last, dt.datetime(2020, 5, 1))
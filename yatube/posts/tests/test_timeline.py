@@ -0,0 +1,181 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from posts.bulk import delete_posts
+from posts.models import AuthorCounter, Follow, Post, TimelineEntry
+from posts.timeline import (
+    TimelinePaginator,
+    backfill_followers,
+    backfill_timeline,
+    fan_out_post,
+)
+
+User = get_user_model()
+
+PER_PAGE = 10
+
+
+class TimelineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls) -> None:
+        cls.reader = User.objects.create_user(username='reader')
+        cls.authors = mixer.cycle(3).blend(User)
+        cls.reader_client = Client()
+        cls.reader_client.force_login(cls.reader)
+
+    def follow(self, author, client=None):
+        return (client or self.reader_client).post(
+            reverse('posts:profile_follow', kwargs={'username': author})
+        )
+
+    def publish(self, author, count):
+        posts = mixer.cycle(count).blend(Post, author=author)
+        for post in posts:
+            fan_out_post(post.pk)
+        return posts
+
+    def feed(self, **cursor):
+        return list(TimelinePaginator(self.reader, PER_PAGE).page(**cursor))
+
+    def test_follow_and_unfollow(self):
+        """Подписка и отписка меняют счетчик и ленту, на себя - нельзя."""
+        author = self.authors[0]
+        self.publish(author, 2)
+        with mock.patch.object(backfill_timeline, 'delay') as backfill:
+            response = self.follow(author)
+            self.follow(author)
+        self.assertRedirects(
+            response, reverse('posts:profile', kwargs={'username': author})
+        )
+        backfill.assert_called_once_with(self.reader.pk, author.pk)
+        backfill_timeline(self.reader.pk, author.pk)
+        self.assertEqual(Follow.objects.filter(user=self.reader).count(), 1)
+        self.assertEqual(
+            AuthorCounter.objects.get(author=author).followers_count, 1
+        )
+        self.assertEqual(len(self.feed()), 2)
+        profile = self.reader_client.get(
+            reverse('posts:profile', kwargs={'username': author})
+        )
+        self.assertTrue(profile.context['following'])
+
+        self.reader_client.post(
+            reverse('posts:profile_unfollow', kwargs={'username': author})
+        )
+        self.assertFalse(Follow.objects.exists())
+        self.assertEqual(
+            AuthorCounter.objects.get(author=author).followers_count, 0
+        )
+        self.assertFalse(TimelineEntry.objects.exists())
+
+        self.follow(self.reader)
+        self.assertFalse(Follow.objects.exists())
+        self.assertEqual(
+            self.reader_client.get(
+                reverse('posts:profile_follow', kwargs={'username': author})
+            ).status_code,
+            405,
+        )
+
+    def test_new_posts_fan_out_after_commit(self):
+        """Новый пост ставит раскладку по лентам фоновой задачей."""
+        with mock.patch.object(fan_out_post, 'delay') as fan_out:
+            post = Post.objects.create(author=self.authors[0], text='Пост')
+        fan_out.assert_called_once_with(post.pk)
+
+    def test_feed_pages_by_keyset(self):
+        """Лента подписок листается по ключу в обе стороны."""
+        for author in self.authors:
+            Follow.objects.create(user=self.reader, author=author)
+        posts = []
+        for author in self.authors:
+            posts += self.publish(author, 5)
+        posts.sort(key=lambda post: (post.pub_date, post.pk), reverse=True)
+        response = self.reader_client.get(reverse('posts:follow_index'))
+        first = response.context['page_obj']
+        self.assertEqual(list(first), posts[:PER_PAGE])
+        self.assertTrue(first.has_next())
+        second = TimelinePaginator(self.reader, PER_PAGE).page(
+            after=first.next_cursor
+        )
+        self.assertEqual(list(second), posts[PER_PAGE:])
+        self.assertFalse(second.has_next())
+        back = TimelinePaginator(self.reader, PER_PAGE).page(
+            before=second.previous_cursor
+        )
+        self.assertEqual(list(back), posts[:PER_PAGE])
+
+    @override_settings(TIMELINE_FANOUT_LIMIT=2)
+    def test_popular_authors_are_merged_on_read(self):
+        """Посты авторов с множеством подписчиков подмешиваются при чтении."""
+        popular, regular = self.authors[:2]
+        Follow.objects.create(user=self.authors[2], author=popular)
+        for author in (popular, regular):
+            Follow.objects.create(user=self.reader, author=author)
+        popular_posts = self.publish(popular, 3)
+        regular_posts = self.publish(regular, 3)
+        self.assertFalse(
+            TimelineEntry.objects.filter(author=popular).exists()
+        )
+        feed = self.feed()
+        self.assertEqual(
+            sorted(post.pk for post in feed),
+            sorted(post.pk for post in popular_posts + regular_posts),
+        )
+
+    @override_settings(TIMELINE_FANOUT_LIMIT=2)
+    def test_posts_survive_author_losing_popularity(self):
+        """Посты популярного автора досылаются, когда он им быть перестал."""
+        popular = self.authors[0]
+        Follow.objects.create(user=self.reader, author=popular)
+        other = Follow.objects.create(user=self.authors[1], author=popular)
+        posts = self.publish(popular, 3)
+        self.assertFalse(TimelineEntry.objects.exists())
+        with mock.patch.object(backfill_followers, 'delay') as backfill:
+            other.delete()
+        backfill.assert_called_once_with(popular.pk)
+        backfill_followers(popular.pk)
+        self.assertEqual(
+            sorted(post.pk for post in self.feed()),
+            sorted(post.pk for post in posts),
+        )
+
+    def test_author_change_moves_post_between_feeds(self):
+        """Смена автора поста убирает его из лент подписчиков прежнего."""
+        Follow.objects.create(user=self.reader, author=self.authors[0])
+        post = self.publish(self.authors[0], 1)[0]
+        post.author = self.authors[1]
+        with mock.patch.object(fan_out_post, 'delay') as fan_out:
+            post.save()
+        fan_out.assert_called_once_with(post.pk)
+        fan_out_post(post.pk)
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(self.feed(), [])
+
+    def test_feed_cost_does_not_grow_with_follows(self):
+        """Число запросов ленты не зависит от числа подписок."""
+        authors = mixer.cycle(20).blend(User)
+        counts = []
+        for followed in (authors[:2], authors):
+            Follow.objects.filter(user=self.reader).delete()
+            for author in followed:
+                Follow.objects.create(user=self.reader, author=author)
+                self.publish(author, 1)
+            with CaptureQueriesContext(connection) as context:
+                self.feed()
+            counts.append(len(context))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_bulk_delete_removes_timeline_entries(self):
+        """Массовое удаление постов убирает их из лент подписок."""
+        Follow.objects.create(user=self.reader, author=self.authors[0])
+        posts = self.publish(self.authors[0], 3)
+        delete_posts(Post.objects.filter(pk__in=[post.pk for post in posts]))
+        self.assertFalse(TimelineEntry.objects.exists())
+        self.assertEqual(self.feed(), [])
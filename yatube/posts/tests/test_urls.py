@@ -1,6 +1,7 @@
 from http import HTTPStatus
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import Client, TestCase
 from django.urls import reverse
 from mixer.backend.django import mixer
@@ -39,6 +40,9 @@ class PostUrlsTests(TestCase):
             'missing': '/unexisting_page/',
         }
 
+    def setUp(self) -> None:
+        cache.clear()
+
     def test_http_statuses(self) -> None:
         """
         В зависимости от уровня прав пользователя
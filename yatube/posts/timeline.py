@@ -0,0 +1,207 @@
+from typing import Any, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+
+from core.tasks import task
+from posts.models import AuthorCounter, Follow, Post, TimelineEntry
+from yatube.utils import CursorPage, decode_cursor, keyset_filter
+
+FANOUT_CHUNK = 1000
+FANOUT_POSTS = 100
+
+
+def fanout_authors(author_ids: Any) -> Any:
+    """Авторы из author_ids, чьи посты раскладываются по лентам при записи."""
+    return AuthorCounter.objects.filter(
+        author_id__in=author_ids,
+        followers_count__lt=settings.TIMELINE_FANOUT_LIMIT,
+    )
+
+
+def add_entries(
+    readers: List[int], posts: List[Tuple[int, int, Any]]
+) -> None:
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(
+                reader_id=reader_id,
+                post_id=post_id,
+                author_id=author_id,
+                pub_date=pub_date,
+            )
+            for reader_id in readers
+            for post_id, author_id, pub_date in posts
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def follower_chunks(author_id: int) -> Iterator[List[int]]:
+    """id подписчиков автора пачками по FANOUT_CHUNK."""
+    followers = Follow.objects.filter(author_id=author_id).order_by('user_id')
+    last_reader = 0
+    while True:
+        readers = list(
+            followers.filter(user_id__gt=last_reader).values_list(
+                'user_id', flat=True
+            )[:FANOUT_CHUNK]
+        )
+        if not readers:
+            return
+        yield readers
+        last_reader = readers[-1]
+
+
+def recent_posts(author_id: int) -> List[Tuple[int, int, Any]]:
+    """Последние TIMELINE_BACKFILL постов автора для записей ленты."""
+    return list(
+        Post.objects.filter(author_id=author_id)
+        .order_by('-pub_date', '-pk')
+        .values_list('pk', 'author_id', 'pub_date')[
+            : settings.TIMELINE_BACKFILL
+        ]
+    )
+
+
+@task
+def fan_out_post(post_id: int) -> None:
+    """
+    Раскладывает новый пост по лентам подписчиков автора пачками по
+    FANOUT_CHUNK читателей. Посты авторов с TIMELINE_FANOUT_LIMIT и более
+    подписчиков не раскладываются, лента подмешивает их при чтении.
+    """
+    fan_out_posts([post_id])
+
+
+@task
+def fan_out_posts(post_ids: List[int]) -> None:
+    """
+    Раскладывает порцию новых постов, до FANOUT_POSTS штук, например
+    после импорта: подписчики каждого автора читаются один раз на всю
+    порцию его постов.
+    """
+    posts = list(
+        Post.objects.filter(pk__in=post_ids).values_list(
+            'pk', 'author_id', 'pub_date'
+        )
+    )
+    authors = fanout_authors({post[1] for post in posts}).values_list(
+        'author_id', flat=True
+    )
+    for author_id in authors:
+        author_posts = [post for post in posts if post[1] == author_id]
+        for readers in follower_chunks(author_id):
+            add_entries(readers, author_posts)
+
+
+@task
+def backfill_timeline(reader_id: int, author_id: int) -> None:
+    """Добавляет в ленту нового подписчика последние посты автора."""
+    if fanout_authors([author_id]).exists():
+        add_entries([reader_id], recent_posts(author_id))
+
+
+@task
+def backfill_followers(author_id: int) -> None:
+    """
+    Автор опустился ниже TIMELINE_FANOUT_LIMIT подписчиков: его посты
+    больше не подмешиваются при чтении, поэтому последние из них, еще не
+    разложенные, добавляются в ленты всех подписчиков.
+    """
+    if not fanout_authors([author_id]).exists():
+        return
+    posts = recent_posts(author_id)
+    for readers in follower_chunks(author_id):
+        add_entries(readers, posts)
+
+
+def drop_author(reader_id: int, author_id: int) -> None:
+    """Убирает из ленты читателя посты автора, от которого он отписался."""
+    TimelineEntry.objects.filter(
+        reader_id=reader_id, author_id=author_id
+    ).delete()
+
+
+def unfollowed(reader_id: int, author_id: int) -> None:
+    """
+    Убирает посты автора из ленты отписавшегося читателя; если автор
+    при этом перестал быть популярным, досылает его посты остальным.
+    """
+    drop_author(reader_id, author_id)
+    if AuthorCounter.objects.filter(
+        author_id=author_id,
+        followers_count=settings.TIMELINE_FANOUT_LIMIT - 1,
+    ).exists():
+        backfill_followers.delay(author_id)
+
+
+def drop_post(post_id: int) -> None:
+    """Убирает пост из всех лент, например перед раскладкой заново."""
+    TimelineEntry.objects.filter(post_id=post_id).delete()
+
+
+class TimelinePaginator:
+    """
+    Лента подписок читателя по ключу (pub_date, id). Посты обычных авторов
+    читаются из разложенной ленты одним запросом по индексу, посты
+    авторов с большим числом подписчиков - одним запросом к постам, после
+    чего обе выборки сливаются. Стоимость страницы не зависит от числа
+    подписок.
+    """
+
+    keyset = True
+
+    def __init__(self, reader: Any, per_page: Any) -> None:
+        self.reader = reader
+        self.per_page = int(per_page)
+
+    def page(
+        self, after: Optional[str] = None, before: Optional[str] = None
+    ) -> CursorPage:
+        before_key = decode_cursor(before)
+        forward = before_key is None
+        key = decode_cursor(after) if forward else before_key
+        sign = '-' if forward else ''
+        limit = self.per_page + 1
+        pulled_authors = list(
+            Follow.objects.filter(
+                user=self.reader,
+                author__posts_counter__followers_count__gte=(
+                    settings.TIMELINE_FANOUT_LIMIT
+                ),
+            ).values_list('author_id', flat=True)
+        )
+        entries = keyset_filter(
+            TimelineEntry.objects.filter(reader=self.reader),
+            'pub_date',
+            'post_id',
+            key,
+            forward,
+        )
+        if pulled_authors:
+            entries = entries.exclude(author_id__in=pulled_authors)
+        posts = [
+            entry.post
+            for entry in entries.select_related(
+                'post__author', 'post__group'
+            ).order_by(f'{sign}pub_date', f'{sign}post_id')[:limit]
+        ]
+        if pulled_authors:
+            posts += keyset_filter(
+                Post.objects.filter(author_id__in=pulled_authors),
+                'pub_date',
+                'pk',
+                key,
+                forward,
+            ).select_related('author', 'group').order_by(
+                f'{sign}pub_date', f'{sign}pk'
+            )[:limit]
+        posts.sort(key=lambda post: (post.pub_date, post.pk), reverse=forward)
+        has_more = len(posts) > self.per_page
+        posts = posts[: self.per_page]
+        if forward:
+            return CursorPage(posts, self, has_more, key is not None)
+        if not posts:
+            return self.page()
+        posts.reverse()
+        return CursorPage(posts, self, True, has_more)
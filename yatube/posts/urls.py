@@ -1,21 +1,44 @@
-from django.urls import path
+from django.urls import path, register_converter
 
+from posts.converters import SlugListConverter
 from posts.views import (
+    export_posts,
+    follow_index,
     group_posts,
+    groups_posts,
     index,
     post_create,
     post_detail,
     post_edit,
     profile,
+    profile_follow,
+    profile_unfollow,
+    search,
 )
 
+register_converter(SlugListConverter, 'slugs')
+
 app_name = '%(posts_label)s'
 
 urlpatterns = [
     path('', index, name='h_page'),
     path('create/', post_create, name='post_create'),
     path('group/<slug:slug>/', group_posts, name='page_post'),
+    path('group/<slugs:slugs>/', groups_posts, name='groups_posts'),
     path('posts/<int:pk>/', post_detail, name='post_detail'),
     path('posts/<int:pk>/edit/', post_edit, name='post_edit'),
+    path('follow/', follow_index, name='follow_index'),
     path('profile/<str:username>/', profile, name='profile'),
+    path(
+        'profile/<str:username>/follow/',
+        profile_follow,
+        name='profile_follow',
+    ),
+    path(
+        'profile/<str:username>/unfollow/',
+        profile_unfollow,
+        name='profile_unfollow',
+    ),
+    path('search/', search, name='search'),
+    path('export/<str:file_format>/', export_posts, name='export_posts'),
 ]
@@ -1,18 +1,46 @@
 from typing import Any
 
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
+from django.http import Http404, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.http import urlencode
+from django.views.decorators.http import condition, require_POST
 
+from posts.export import RENDERERS, iter_post_rows
+from posts.feed_cache import (
+    FEED_INDEX,
+    author_scope,
+    cache_anonymous_feed,
+    conditional_feed,
+    group_scope,
+    post_etag,
+)
 from posts.forms import PostForm
-from posts.models import Group, Post
-from yatube.utils import paginate
+from posts.models import Follow, Group, Post
+from posts.registry import group_registry
+from posts.search import search_posts
+from posts.timeline import TimelinePaginator
+from yatube.sqlite import retry_on_lock
+from yatube.utils import (
+    CountedPaginator,
+    MergedPaginator,
+    paginate,
+    public_page,
+    query_budget,
+)
 
 User = get_user_model()
 
 
+@query_budget(5)
+@public_page
+@conditional_feed(lambda: (FEED_INDEX,))
+@cache_anonymous_feed(lambda: (FEED_INDEX,))
 def index(request: object) -> Post:
-    posts = Post.objects.all()
+    posts = Post.objects.select_related('author', 'group')
     page = paginate(request, posts)
     return render(
         request,
@@ -23,10 +51,16 @@ def index(request: object) -> Post:
     )
 
 
+@query_budget(5)
+@public_page
+@conditional_feed(lambda slug: (group_scope(slug),))
+@cache_anonymous_feed(lambda slug: (group_scope(slug),))
 def group_posts(request: object, slug: str) -> Group:
-    group = get_object_or_404(Group, slug=slug)
+    group = group_registry.get(slug=slug)
+    if group is None:
+        raise Http404
     posts = group.posts.select_related('author').all()
-    page = paginate(request, posts)
+    page = paginate(request, posts, count=group.posts_count)
     return render(
         request,
         'posts/group_list.html',
@@ -37,22 +71,125 @@ def group_posts(request: object, slug: str) -> Group:
     )
 
 
+# сессия, пользователь, группы одним запросом и по запросу на группу
+@query_budget(3 + settings.MERGED_GROUPS_LIMIT)
+@public_page
+@conditional_feed(lambda slugs: tuple(map(group_scope, slugs)))
+@cache_anonymous_feed(lambda slugs: tuple(map(group_scope, slugs)))
+def groups_posts(request: Any, slugs: list) -> Any:
+    found = group_registry.get_many('slug', slugs)
+    if len(found) < len(slugs):
+        raise Http404
+    groups = [found[slug] for slug in slugs]
+    page = MergedPaginator(
+        [group.posts.select_related('author', 'group') for group in groups],
+        settings.OBJECTS_PER_PAGE,
+    ).page(after=request.GET.get('after'), before=request.GET.get('before'))
+    return render(
+        request,
+        'posts/groups_list.html',
+        {
+            'groups': groups,
+            'page_obj': page,
+        },
+    )
+
+
+@query_budget(5)
+@public_page
+@conditional_feed(lambda username: (author_scope(username),))
+@cache_anonymous_feed(lambda username: (author_scope(username),))
 def profile(request: Any, username: Any) -> Any:
-    user_name = get_object_or_404(User, username=username)
-    posts = user_name.posts.all()
-    page = paginate(request, posts)
+    user_name = get_object_or_404(
+        User.objects.select_related('posts_counter'), username=username
+    )
+    posts = user_name.posts.select_related('group')
+    counter = getattr(user_name, 'posts_counter', None)
+    page = paginate(
+        request, posts, count=counter.posts_count if counter else None
+    )
+    following = (
+        request.user.is_authenticated
+        and Follow.objects.filter(
+            user=request.user, author=user_name
+        ).exists()
+    )
     return render(
         request,
         'posts/profile.html',
         {
             'page_obj': page,
             'user_name': user_name,
+            'following': following,
         },
     )
 
 
+@query_budget(5)
+@login_required
+def follow_index(request: Any) -> Any:
+    page = TimelinePaginator(request.user, settings.OBJECTS_PER_PAGE).page(
+        after=request.GET.get('after'),
+        before=request.GET.get('before'),
+    )
+    return render(
+        request,
+        'posts/follow.html',
+        {
+            'page_obj': page,
+        },
+    )
+
+
+@query_budget(10)
+@login_required
+@require_POST
+@retry_on_lock
+def profile_follow(request: Any, username: str) -> Any:
+    author = get_object_or_404(User, username=username)
+    if author != request.user:
+        Follow.objects.get_or_create(user=request.user, author=author)
+    return redirect('posts:profile', username)
+
+
+@query_budget(10)
+@login_required
+@require_POST
+@retry_on_lock
+def profile_unfollow(request: Any, username: str) -> Any:
+    author = get_object_or_404(User, username=username)
+    for follow in Follow.objects.filter(user=request.user, author=author):
+        # экземпляр уже знает автора, сигнал не читает его повторно
+        follow.author = author
+        follow.delete()
+    return redirect('posts:profile', username)
+
+
+@query_budget(4)
+@public_page
+def search(request: Any) -> Any:
+    query = request.GET.get('q', '').strip()
+    page = CountedPaginator(
+        search_posts(query), settings.OBJECTS_PER_PAGE
+    ).get_page(request.GET.get('page'))
+    return render(
+        request,
+        'posts/search.html',
+        {
+            'page_obj': page,
+            'search_query': query,
+            'page_query': urlencode({'q': query}) + '&' if query else '',
+        },
+    )
+
+
+@query_budget(4)
+@public_page
+@condition(etag_func=post_etag)
 def post_detail(request: Any, pk: Any) -> Any:
-    post = get_object_or_404(Post, pk=pk)
+    post = get_object_or_404(
+        Post.objects.select_related('author__posts_counter', 'group'), pk=pk
+    )
     return render(
         request,
         'posts/post_detail.html',
@@ -62,7 +199,9 @@ def post_detail(request: Any, pk: Any) -> Any:
     )
 
 
+@query_budget(12)
 @login_required
+@retry_on_lock
 def post_create(request):
     form = PostForm(request.POST or None)
     if not form.is_valid():
@@ -78,11 +217,13 @@ def post_create(request):
     return redirect('posts:profile', request.user)
 
 
+@query_budget(15)
 @login_required
+@retry_on_lock
 def post_edit(request, pk):
     post = get_object_or_404(Post, pk=pk)
     form = PostForm(request.POST or None, instance=post)
-    if request.user != post.author:
+    if request.user.pk != post.author_id:
         return redirect('posts:post_detail', pk)
     if form.is_valid():
         form.save()
@@ -96,3 +237,18 @@ def post_edit(request, pk):
             'form': form,
         },
     )
+
+
+@query_budget(3)
+@staff_member_required
+def export_posts(request: Any, file_format: str) -> StreamingHttpResponse:
+    if file_format not in RENDERERS:
+        raise Http404
+    render_rows, content_type = RENDERERS[file_format]
+    response = StreamingHttpResponse(
+        render_rows(iter_post_rows()), content_type=content_type
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="posts.{file_format}"'
+    )
+    return response
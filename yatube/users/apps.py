@@ -4,3 +4,17 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     name = 'users'
     verbose_name = 'приложение для работы с пользователями'
+
+    def ready(self) -> None:
+        from django.contrib.auth.models import update_last_login
+        from django.contrib.auth.signals import user_logged_in
+
+        from users.tasks import defer_last_login
+
+        # запись last_login при входе заменяется фоновой задачей
+        user_logged_in.disconnect(
+            update_last_login, dispatch_uid='update_last_login'
+        )
+        user_logged_in.connect(
+            defer_last_login, dispatch_uid='defer_last_login'
+        )
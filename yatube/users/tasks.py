@@ -0,0 +1,24 @@
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from core.auth import forget_user
+from core.tasks import task
+
+User = get_user_model()
+
+
+@task
+def update_last_login(user_id: int, moment: str) -> None:
+    """Записывает время входа пользователя, если оно новее сохраненного."""
+    User.objects.filter(pk=user_id).exclude(last_login__gte=moment).update(
+        last_login=moment
+    )
+    # update() не вызывает post_save, кэш пользователя сбрасывается явно
+    forget_user(user_id)
+
+
+def defer_last_login(sender, user, **kwargs) -> None:
+    """Вход не ждет записи last_login, она уходит фоновой задачей."""
+    moment = timezone.now()
+    user.last_login = moment
+    update_last_login.delay(user.pk, moment.isoformat())
@@ -0,0 +1,336 @@
+import fcntl
+import hashlib
+import mmap
+import os
+import pickle
+import stat
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional, Tuple
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.exceptions import ImproperlyConfigured
+
+MAGIC = b'YTBCACHE'
+
+# заголовок файла: сигнатура, число слотов и размер слота
+FILE_HEADER = struct.Struct('<8sII')
+
+HEADER_SIZE = 64
+
+# заголовок слота: занят, флаги, длина ключа, длина значения, хэш ключа,
+# срок жизни (unix time, 0 - бессрочно), время последнего обращения
+SLOT_HEADER = struct.Struct('<BBHIQdQ')
+
+EXPIRES_OFFSET = 16
+
+LAST_USED_OFFSET = 24
+
+# слотов в наборе: ключ может лежать только в своем наборе
+WAYS = 8
+
+FLAG_COMPRESSED = 1
+
+# значения длиннее этого сжимаются, если сжатие их уменьшает
+COMPRESS_MIN_LENGTH = 1024
+
+
+class MmapCache(BaseCache):
+    """
+    Кэш в файле, отображенном в память всех процессов хоста (LOCATION -
+    путь к файлу, лучше в /dev/shm). Файл разбит на SLOTS слотов по
+    SLOT_SIZE байт, сгруппированных в наборы по WAYS слотов; ключ попадает
+    в набор по хэшу, из полного набора вытесняется давно не читанный ключ.
+    Набор защищен блокировкой потоков процесса и fcntl-блокировкой байта
+    файла между процессами. Значения больше слота не кэшируются.
+
+    Значения хранятся через pickle, поэтому каталог и файл должны
+    принадлежать текущему пользователю и быть закрыты для остальных:
+    иначе чужой процесс мог бы подложить данные для выполнения кода.
+    """
+
+    def __init__(self, location: str, params: dict) -> None:
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.path = location
+        self.slot_size = int(options.get('SLOT_SIZE', 16 * 1024))
+        self.sets = max(int(options.get('SLOTS', 4096)) // WAYS, 1)
+        self.slots = self.sets * WAYS
+        self.size = HEADER_SIZE + self.slots * self.slot_size
+        self.thread_locks = [threading.Lock() for _ in range(self.sets)]
+        self.open_lock = threading.Lock()
+        self.pid: Optional[int] = None
+        self.fd: Optional[int] = None
+        self.map: Optional[mmap.mmap] = None
+
+    def _open(self) -> mmap.mmap:
+        # после fork процесс открывает файл заново: fcntl-блокировки
+        # принадлежат процессу и не наследуются
+        if self.pid == os.getpid():
+            return self.map
+        with self.open_lock:
+            if self.pid != os.getpid():
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, 0o700, exist_ok=True)
+                self._check_private(os.lstat(directory), stat.S_ISDIR)
+                fd = os.open(
+                    self.path, os.O_RDWR | os.O_CREAT | os.O_NOFOLLOW, 0o600
+                )
+                try:
+                    self._check_private(os.fstat(fd), stat.S_ISREG)
+                    self.fd = fd
+                    self._init_file()
+                    self.map = mmap.mmap(fd, self.size)
+                except BaseException:
+                    os.close(fd)
+                    raise
+                self.pid = os.getpid()
+        return self.map
+
+    def _check_private(self, status: os.stat_result, kind: Any) -> None:
+        if (
+            not kind(status.st_mode)
+            or status.st_uid != os.geteuid()
+            or status.st_mode & 0o077
+        ):
+            raise ImproperlyConfigured(
+                f'Кэш {self.path}: каталог и файл должны принадлежать '
+                'текущему пользователю и быть недоступны остальным (0700 '
+                'и 0600).'
+            )
+
+    def _init_file(self) -> None:
+        header = FILE_HEADER.pack(MAGIC, self.slots, self.slot_size)
+        fcntl.lockf(self.fd, fcntl.LOCK_EX, 1, 0)
+        try:
+            current = os.pread(self.fd, FILE_HEADER.size, 0)
+            if current == header:
+                # файл мог обрезать другой процесс: недостающие слоты
+                # дописываются нулями, то есть пустыми
+                if os.fstat(self.fd).st_size < self.size:
+                    os.ftruncate(self.fd, self.size)
+                return
+            if current.startswith(MAGIC):
+                raise ImproperlyConfigured(
+                    f'Файл кэша {self.path} создан с другими SLOTS или '
+                    'SLOT_SIZE, удалите его или укажите другой LOCATION.'
+                )
+            os.ftruncate(self.fd, self.size)
+            os.pwrite(self.fd, header, 0)
+        finally:
+            fcntl.lockf(self.fd, fcntl.LOCK_UN, 1, 0)
+
+    @contextmanager
+    def _locked(self, index: int) -> Iterator[mmap.mmap]:
+        view = self._open()
+        with self.thread_locks[index]:
+            fcntl.lockf(self.fd, fcntl.LOCK_EX, 1, 1 + index)
+            try:
+                yield view
+            finally:
+                fcntl.lockf(self.fd, fcntl.LOCK_UN, 1, 1 + index)
+
+    def _key(self, key: Any, version: Any) -> Tuple[bytes, int, int]:
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        raw = key.encode()
+        key_hash = int.from_bytes(
+            hashlib.blake2b(raw, digest_size=8).digest(), 'little'
+        )
+        return raw, key_hash, key_hash % self.sets
+
+    def _find(
+        self, view: mmap.mmap, index: int, raw: bytes, key_hash: int
+    ) -> Tuple[Optional[int], Optional[tuple]]:
+        """Слот ключа в наборе и его заголовок; истекший слот освобождается."""
+        base = HEADER_SIZE + index * WAYS * self.slot_size
+        for way in range(WAYS):
+            offset = base + way * self.slot_size
+            header = SLOT_HEADER.unpack_from(view, offset)
+            used, _, key_len, _, slot_hash, expires, _ = header
+            if not used or slot_hash != key_hash:
+                continue
+            start = offset + SLOT_HEADER.size
+            if view[start:start + key_len] != raw:
+                continue
+            if expires and expires <= time.time():
+                view[offset] = 0
+                return None, None
+            return offset, header
+        return None, None
+
+    def _victim(self, view: mmap.mmap, index: int) -> int:
+        """Свободный или истекший слот набора, иначе давно не читанный."""
+        base = HEADER_SIZE + index * WAYS * self.slot_size
+        now = time.time()
+        victim, oldest = base, None
+        for way in range(WAYS):
+            offset = base + way * self.slot_size
+            used, _, _, _, _, expires, last_used = SLOT_HEADER.unpack_from(
+                view, offset
+            )
+            if not used or (expires and expires <= now):
+                return offset
+            if oldest is None or last_used < oldest:
+                victim, oldest = offset, last_used
+        return victim
+
+    def _read(self, view: mmap.mmap, offset: int, header: tuple) -> bytes:
+        _, _, key_len, value_len, _, _, _ = header
+        start = offset + SLOT_HEADER.size + key_len
+        struct.pack_into(
+            '<Q', view, offset + LAST_USED_OFFSET, time.monotonic_ns()
+        )
+        return view[start:start + value_len]
+
+    def _write(
+        self,
+        view: mmap.mmap,
+        offset: int,
+        raw: bytes,
+        key_hash: int,
+        payload: Tuple[int, bytes],
+        expires: Optional[float],
+    ) -> None:
+        flags, value = payload
+        start = offset + SLOT_HEADER.size
+        view[start:start + len(raw)] = raw
+        view[start + len(raw):start + len(raw) + len(value)] = value
+        SLOT_HEADER.pack_into(
+            view,
+            offset,
+            1,
+            flags,
+            len(raw),
+            len(value),
+            key_hash,
+            expires or 0.0,
+            time.monotonic_ns(),
+        )
+
+    def _dump(self, value: Any) -> Tuple[int, bytes]:
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(data) >= COMPRESS_MIN_LENGTH:
+            packed = zlib.compress(data, 1)
+            if len(packed) < len(data):
+                return FLAG_COMPRESSED, packed
+        return 0, data
+
+    def _load(self, flags: int, data: bytes) -> Any:
+        if flags & FLAG_COMPRESSED:
+            data = zlib.decompress(data)
+        return pickle.loads(data)
+
+    def _fits(self, raw: bytes, payload: Tuple[int, bytes]) -> bool:
+        return SLOT_HEADER.size + len(raw) + len(payload[1]) <= self.slot_size
+
+    def _store(
+        self, key: Any, value: Any, timeout: Any, version: Any, only_new: bool
+    ) -> bool:
+        raw, key_hash, index = self._key(key, version)
+        payload = self._dump(value)
+        expires = self.get_backend_timeout(timeout)
+        with self._locked(index) as view:
+            offset, _ = self._find(view, index, raw, key_hash)
+            if offset is not None and only_new:
+                return False
+            expired = expires is not None and expires <= time.time()
+            if expired or not self._fits(raw, payload):
+                # старое значение не должно пережить неудачную запись
+                if offset is not None:
+                    view[offset] = 0
+                return False
+            if offset is None:
+                offset = self._victim(view, index)
+            self._write(view, offset, raw, key_hash, payload, expires)
+        return True
+
+    def add(
+        self,
+        key: Any,
+        value: Any,
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Any = None,
+    ) -> bool:
+        return self._store(key, value, timeout, version, only_new=True)
+
+    def set(
+        self,
+        key: Any,
+        value: Any,
+        timeout: Any = DEFAULT_TIMEOUT,
+        version: Any = None,
+    ) -> None:
+        self._store(key, value, timeout, version, only_new=False)
+
+    def get(self, key: Any, default: Any = None, version: Any = None) -> Any:
+        raw, key_hash, index = self._key(key, version)
+        with self._locked(index) as view:
+            offset, header = self._find(view, index, raw, key_hash)
+            if offset is None:
+                return default
+            data = self._read(view, offset, header)
+        return self._load(header[1], data)
+
+    def incr(self, key: Any, delta: int = 1, version: Any = None) -> int:
+        """Атомарно для всех процессов: чтение и запись под блокировкой."""
+        raw, key_hash, index = self._key(key, version)
+        with self._locked(index) as view:
+            offset, header = self._find(view, index, raw, key_hash)
+            if offset is None:
+                raise ValueError(f"Key '{key}' not found")
+            value = self._load(header[1], self._read(view, offset, header))
+            value += delta
+            self._write(
+                view, offset, raw, key_hash, self._dump(value), header[5]
+            )
+        return value
+
+    def touch(
+        self, key: Any, timeout: Any = DEFAULT_TIMEOUT, version: Any = None
+    ) -> bool:
+        raw, key_hash, index = self._key(key, version)
+        with self._locked(index) as view:
+            offset, _ = self._find(view, index, raw, key_hash)
+            if offset is None:
+                return False
+            struct.pack_into(
+                '<d',
+                view,
+                offset + EXPIRES_OFFSET,
+                self.get_backend_timeout(timeout) or 0.0,
+            )
+        return True
+
+    def has_key(self, key: Any, version: Any = None) -> bool:
+        raw, key_hash, index = self._key(key, version)
+        with self._locked(index) as view:
+            return self._find(view, index, raw, key_hash)[0] is not None
+
+    def delete(self, key: Any, version: Any = None) -> bool:
+        raw, key_hash, index = self._key(key, version)
+        with self._locked(index) as view:
+            offset, _ = self._find(view, index, raw, key_hash)
+            if offset is not None:
+                view[offset] = 0
+        return offset is not None
+
+    def clear(self) -> None:
+        view = self._open()
+        # fcntl-блокировки процесса сливаются, поэтому сначала берутся
+        # блокировки всех наборов в потоках этого процесса
+        for lock in self.thread_locks:
+            lock.acquire()
+        try:
+            fcntl.lockf(self.fd, fcntl.LOCK_EX, 0, 1)
+            try:
+                for offset in range(HEADER_SIZE, self.size, self.slot_size):
+                    view[offset] = 0
+            finally:
+                fcntl.lockf(self.fd, fcntl.LOCK_UN, 0, 1)
+        finally:
+            for lock in self.thread_locks:
+                lock.release()
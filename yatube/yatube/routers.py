@@ -0,0 +1,65 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PRIMARY = DEFAULT_DB_ALIAS
+
+
+class RoutingState:
+    """Состояние маршрутизации запросов к базе в рамках одного HTTP-запроса."""
+
+    def __init__(self, pinned: bool = False) -> None:
+        self.pinned = pinned
+        self.wrote = False
+
+
+_state: ContextVar[Optional[RoutingState]] = ContextVar(
+    'db_routing_state', default=None
+)
+
+
+@contextmanager
+def replica_reads(pinned: bool = False) -> Iterator[RoutingState]:
+    """
+    Разрешает читать с реплик внутри блока with. pinned - все чтения
+    блока идут в основную базу (пользователь недавно что-то записал).
+    """
+    state = RoutingState(pinned)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Запись - в основную базу, чтение в обработке HTTP-запроса - на одну из
+    DATABASE_REPLICAS. После первой записи и внутри транзакции чтения
+    идут в основную базу, вне HTTP-запросов (команды, миграции) - тоже.
+    """
+
+    def db_for_read(self, model: Any, **hints: Any) -> str:
+        state = _state.get()
+        if (
+            state is None
+            or state.pinned
+            or not settings.DATABASE_REPLICAS
+            or connections[PRIMARY].in_atomic_block
+        ):
+            return PRIMARY
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model: Any, **hints: Any) -> str:
+        state = _state.get()
+        if state is not None:
+            state.pinned = state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1: Any, obj2: Any, **hints: Any) -> bool:
+        # реплики содержат те же данные, что и основная база
+        return True
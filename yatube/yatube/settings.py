@@ -17,9 +17,11 @@ INSTALLED_APPS = [
     'about.apps.AboutConfig',
     'core.apps.CoreConfig',
     'posts.apps.PostsConfig',
-    'users.apps.UsersConfig',
     'django.contrib.admin',
     'django.contrib.auth',
+    # после auth: users отключает обработчик last_login, который
+    # подключает auth
+    'users.apps.UsersConfig',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
@@ -27,17 +29,38 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.ServerTimingMiddleware',
+    'core.middleware.TemplateProfilerMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.ReplicaStickinessMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.CachedAuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
+    'core.middleware.AnonymousFastPathMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'yatube.urls'
 
+# в разработке у процесса свой кэш в памяти; без DEBUG воркеры хоста
+# делят один кэш в файле, отображенном в память (см. yatube.mmap_cache);
+# каталог файла доступен только пользователю, под которым работает сайт
+CACHES = {
+    'default': (
+        {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+        if DEBUG
+        else {
+            'BACKEND': 'yatube.mmap_cache.MmapCache',
+            'LOCATION': '/dev/shm/yatube/cache',
+            'OPTIONS': {'SLOTS': 8192, 'SLOT_SIZE': 32 * 1024},
+        }
+    ),
+}
+
 TEMPLATES_DIR = BASE_DIR / 'templates'
 
 STATICFILES_DIRS = [
@@ -70,6 +93,39 @@ DATABASES = {
     },
 }
 
+DATABASE_ROUTERS = ['yatube.routers.ReplicaRouter']
+
+# прагмы каждого нового соединения SQLite; для отдельной базы их можно
+# переопределить ключом PRAGMAS в DATABASES
+SQLITE_PRAGMAS = {
+    'journal_mode': 'wal',
+    'busy_timeout': 5000,
+    'synchronous': 'normal',
+    'cache_size': -20000,
+    'mmap_size': 256 * 1024 * 1024,
+}
+
+# повторы транзакции записи при 'database is locked'
+SQLITE_LOCK_RETRIES = 5
+
+SQLITE_LOCK_BACKOFF = 0.02
+
+# псевдонимы DATABASES, с которых читают view; пусто - все в default
+DATABASE_REPLICAS = []
+
+# сколько секунд после записи чтения пользователя идут в default
+REPLICA_STICKY_SECONDS = 5
+
+REPLICA_STICKY_COOKIE = 'read_primary'
+
+# сессии читаются из кэша, в базу пишутся только при изменении
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# время жизни пользователя сессии в кэше, в секундах; сохранение и
+# удаление пользователя сбрасывают кэш сразу, изменения через
+# QuerySet.update - только вместе с core.auth.forget_users
+AUTH_USER_CACHE_TIMEOUT = 60
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -93,6 +149,51 @@ STATIC_URL = '/static/'
 
 OBJECTS_PER_PAGE = 10
 
+# 'pages' - нумерованные страницы, 'window' - нумерованные страницы
+# без COUNT(*), 'cursor' - курсор по (pub_date, id)
+FEED_PAGINATION = 'pages'
+
+POST_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+
+# страницы лент для анонимных пользователей, 0 - без кэширования
+FEED_CACHE_TIMEOUT = 60 * 10
+
+# каталог для профилей рендера шаблонов, None - профилирование выключено
+TEMPLATE_PROFILE_DIR = None
+
+# процессный кэш групп: число групп и время жизни записи в секундах
+GROUP_REGISTRY_SIZE = 1000
+
+GROUP_REGISTRY_TIMEOUT = 60
+
+# фоновые задачи: 'thread' - пул потоков процесса (для разработки),
+# 'database' - очередь в базе, ее выполняет команда run_workers,
+# 'immediate' - сразу после фиксации транзакции в том же потоке
+TASKS_BACKEND = 'thread'
+
+TASKS_THREADS = 4
+
+TASKS_MAX_ATTEMPTS = 5
+
+# задержка перед первым повтором в секундах, дальше растет вдвое
+TASKS_RETRY_DELAY = 10
+
+# на сколько секунд забранная задача скрыта от других работников
+TASKS_VISIBILITY_TIMEOUT = 60 * 5
+
+# посты авторов с таким числом подписчиков не раскладываются по лентам
+# подписок при публикации, а подмешиваются в ленту при чтении
+TIMELINE_FANOUT_LIMIT = 10000
+
+# число последних постов автора, которые попадают в ленту при подписке
+TIMELINE_BACKFILL = 100
+
+# наибольшее число групп в общей ленте /group/a+b+c/
+MERGED_GROUPS_LIMIT = 10
+
+# админка постов без list_editable, list_filter и полного COUNT(*)
+ADMIN_LARGE_TABLES = True
+
 SHOW_WORDS = 15
 
 SHOW_CHARACTERS = 15
@@ -101,6 +202,9 @@ LOGIN_URL = 'users:login'
 
 LOGIN_REDIRECT_URL = 'posts:h_page'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+# письма отправляются фоновой задачей через TASKS_EMAIL_BACKEND
+EMAIL_BACKEND = 'core.mail.TaskEmailBackend'
+
+TASKS_EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
@@ -0,0 +1,72 @@
+import random
+import re
+import time
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from django.conf import settings
+from django.db import (
+    DEFAULT_DB_ALIAS,
+    OperationalError,
+    connections,
+    transaction,
+)
+
+PRAGMA_NAME = re.compile(r'^[a-z_]+$')
+
+
+def apply_sqlite_pragmas(sender: Any, connection: Any, **kwargs: Any) -> None:
+    """
+    Обработчик connection_created: применяет к новому соединению SQLite
+    прагмы из DATABASES[alias]['PRAGMAS'] или, если их нет, SQLITE_PRAGMAS.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = connection.settings_dict.get('PRAGMAS', settings.SQLITE_PRAGMAS)
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            if not PRAGMA_NAME.match(name):
+                raise ValueError(f'Недопустимое имя прагмы SQLite: {name}')
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def is_lock_error(error: Exception) -> bool:
+    return isinstance(error, OperationalError) and 'locked' in str(error)
+
+
+def retry_on_lock(
+    function: Optional[Callable] = None, *, using: Optional[str] = None
+) -> Callable:
+    """
+    Выполняет function в транзакции, при ошибке блокировки SQLite
+    повторяет ее до SQLITE_LOCK_RETRIES раз с экспоненциальной задержкой.
+    Внутри внешней транзакции повтор невозможен, ошибка пробрасывается.
+    """
+
+    def decorator(function: Callable) -> Callable:
+        @wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            alias = using or DEFAULT_DB_ALIAS
+            for attempt in range(settings.SQLITE_LOCK_RETRIES + 1):
+                try:
+                    with transaction.atomic(using=alias):
+                        return function(*args, **kwargs)
+                except OperationalError as error:
+                    if (
+                        not is_lock_error(error)
+                        or attempt == settings.SQLITE_LOCK_RETRIES
+                        or connections[alias].in_atomic_block
+                    ):
+                        raise
+                # разброс задержки не дает повторам совпасть по времени
+                time.sleep(
+                    settings.SQLITE_LOCK_BACKOFF
+                    * 2 ** attempt
+                    * random.uniform(0.5, 1.5)
+                )
+
+        return wrapper
+
+    if function is not None:
+        return decorator(function)
+    return decorator
@@ -1,14 +1,383 @@
-from typing import Any
+import base64
+import binascii
+import heapq
+import itertools
+from collections.abc import Sequence
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
 
 from django.conf import settings
-from django.core.paginator import Page, Paginator
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+CURSOR_SEPARATOR = '|'
+
+# число ссылок на страницы по каждую сторону от текущей
+PAGE_WINDOW = 3
+
+
+def encode_cursor(pub_date: Any, pk: int) -> str:
+    """Упаковывает ключ (pub_date, id) в непрозрачный токен для URL."""
+    raw = f'{pub_date.isoformat()}{CURSOR_SEPARATOR}{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(token: Optional[str]) -> Optional[Tuple[Any, int]]:
+    """Распаковывает токен курсора, для битого токена возвращает None."""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        pub_date, pk = raw.decode().rsplit(CURSOR_SEPARATOR, 1)
+        parsed = parse_datetime(pub_date)
+        if parsed is None:
+            return None
+        return parsed, int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+class CursorPage(Sequence):
+    """Страница ленты, построенная по ключу (pub_date, id) без OFFSET."""
+
+    def __init__(
+        self,
+        object_list: list,
+        paginator: 'CursorPaginator',
+        has_next: bool,
+        has_previous: bool,
+    ) -> None:
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self) -> str:
+        return f'<Cursor page of {len(self.object_list)} objects>'
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __getitem__(self, index: Any) -> Any:
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    def has_other_pages(self) -> bool:
+        return self.has_previous() or self.has_next()
+
+    @property
+    def next_cursor(self) -> Optional[str]:
+        if not self.has_next() or not self.object_list:
+            return None
+        last = self.object_list[-1]
+        return encode_cursor(last.pub_date, last.pk)
+
+    @property
+    def previous_cursor(self) -> Optional[str]:
+        if not self.has_previous() or not self.object_list:
+            return None
+        first = self.object_list[0]
+        return encode_cursor(first.pub_date, first.pk)
+
+
+class CursorPaginator:
+    """
+    Пагинатор по ключу (pub_date, id): не выполняет COUNT(*) и OFFSET,
+    поэтому любая страница ленты стоит столько же, сколько первая.
+    """
+
+    keyset = True
+
+    def __init__(
+        self, object_list: Any, per_page: Any, count: Optional[int] = None
+    ) -> None:
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        if count is not None:
+            self.count = count
+
+    @cached_property
+    def count(self) -> int:
+        """Общее число объектов, считается только по явному запросу."""
+        return self.object_list.count()
+
+    def page(
+        self, after: Optional[str] = None, before: Optional[str] = None
+    ) -> CursorPage:
+        after_key = decode_cursor(after)
+        before_key = decode_cursor(before)
+        if before_key is not None:
+            pub_date, pk = before_key
+            rows = list(
+                self.object_list.filter(
+                    Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk)
+                ).order_by('pub_date', 'pk')[: self.per_page + 1]
+            )
+            if not rows:
+                return self.page()
+            has_previous = len(rows) > self.per_page
+            rows = rows[: self.per_page]
+            rows.reverse()
+            return CursorPage(rows, self, True, has_previous)
+        queryset = self.object_list.order_by('-pub_date', '-pk')
+        if after_key is not None:
+            pub_date, pk = after_key
+            queryset = queryset.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+            )
+        rows = list(queryset[: self.per_page + 1])
+        return CursorPage(
+            rows[: self.per_page],
+            self,
+            len(rows) > self.per_page,
+            after_key is not None,
+        )
+
+
+def keyset_filter(
+    queryset: Any, date_field: str, pk_field: str, key: Any, forward: bool
+) -> Any:
+    """Строки выборки дальше ключа (pub_date, id) в направлении чтения."""
+    if key is None:
+        return queryset
+    pub_date, pk = key
+    lookup = 'lt' if forward else 'gt'
+    return queryset.filter(
+        Q(**{f'{date_field}__{lookup}': pub_date})
+        | Q(**{date_field: pub_date, f'{pk_field}__{lookup}': pk})
+    )
+
+
+def keyset_stream(
+    queryset: Any, key: Any, forward: bool, size: int
+) -> Iterator[Any]:
+    """
+    Лениво читает выборку по ключу (pub_date, id) порциями по size строк:
+    следующая порция запрашивается, только когда предыдущая прочитана.
+    """
+    sign = '-' if forward else ''
+    ordered = queryset.order_by(f'{sign}pub_date', f'{sign}pk')
+    while True:
+        chunk = keyset_filter(ordered, 'pub_date', 'pk', key, forward)
+        rows = list(chunk[:size])
+        yield from rows
+        if len(rows) < size:
+            return
+        key = (rows[-1].pub_date, rows[-1].pk)
+
+
+class MergedPaginator:
+    """
+    Пагинатор по ключу (pub_date, id) для объединения нескольких выборок:
+    каждая читается своим запросом по индексу, а потоки сливаются кучей.
+    Страница стоит k запросов по per_page + 1 строк и O(per_page * log k)
+    сравнений, сколько бы строк ни было в выборках.
+    """
+
+    keyset = True
+
+    def __init__(self, querysets: List[Any], per_page: Any) -> None:
+        self.querysets = querysets
+        self.per_page = int(per_page)
+
+    def page(
+        self, after: Optional[str] = None, before: Optional[str] = None
+    ) -> CursorPage:
+        before_key = decode_cursor(before)
+        forward = before_key is None
+        key = decode_cursor(after) if forward else before_key
+        size = self.per_page + 1
+        merged = heapq.merge(
+            *(
+                keyset_stream(queryset, key, forward, size)
+                for queryset in self.querysets
+            ),
+            key=lambda row: (row.pub_date, row.pk),
+            reverse=forward,
+        )
+        rows = list(itertools.islice(merged, size))
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if forward:
+            return CursorPage(rows, self, has_more, key is not None)
+        if not rows:
+            return self.page()
+        rows.reverse()
+        return CursorPage(rows, self, True, has_more)
+
+
+class CountedPage(Page):
+    """Страница Paginator с ограниченным окном ссылок на соседние страницы."""
+
+    @property
+    def page_window(self) -> range:
+        return range(
+            max(self.number - PAGE_WINDOW, 1),
+            min(self.number + PAGE_WINDOW, self.paginator.num_pages) + 1,
+        )
+
+
+class CountedPaginator(Paginator):
+    """Paginator, которому можно передать заранее известное число объектов."""
+
+    def __init__(
+        self, object_list: Any, per_page: Any, count: Optional[int] = None
+    ) -> None:
+        super().__init__(object_list, per_page)
+        if count is not None:
+            self.count = count
+
+    def _get_page(self, *args: Any, **kwargs: Any) -> CountedPage:
+        return CountedPage(*args, **kwargs)
+
+
+class WindowPage(Sequence):
+    """
+    Страница ленты по номеру, для которой известно только, есть ли
+    следующая страница: общее число страниц не считается.
+    """
+
+    def __init__(
+        self,
+        object_list: list,
+        number: int,
+        paginator: 'WindowPaginator',
+        has_next: bool,
+    ) -> None:
+        self.object_list = object_list
+        self.number = number
+        self.paginator = paginator
+        self._has_next = has_next
+
+    def __repr__(self) -> str:
+        return f'<Page {self.number}>'
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __getitem__(self, index: Any) -> Any:
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self.number > 1
+
+    def has_other_pages(self) -> bool:
+        return self.has_previous() or self.has_next()
+
+    def next_page_number(self) -> int:
+        if not self.has_next():
+            raise EmptyPage('That page contains no results')
+        return self.number + 1
+
+    def previous_page_number(self) -> int:
+        if not self.has_previous():
+            raise EmptyPage('That page number is less than 1')
+        return self.number - 1
+
+    @property
+    def page_window(self) -> range:
+        return range(
+            max(self.number - PAGE_WINDOW, 1),
+            self.number + self.has_next() + 1,
+        )
+
+
+class WindowPaginator:
+    """
+    Пагинатор по номеру страницы без COUNT(*): читает per_page + 1 строк,
+    лишняя строка показывает, есть ли следующая страница.
+    """
+
+    keyset = False
+    count_free = True
+
+    def __init__(
+        self, object_list: Any, per_page: Any, count: Optional[int] = None
+    ) -> None:
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        if count is not None:
+            self.count = count
+
+    @cached_property
+    def count(self) -> int:
+        """Общее число объектов, считается только по явному запросу."""
+        return self.object_list.count()
+
+    def validate_number(self, number: Any) -> int:
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('That page number is not an integer')
+        if number < 1:
+            raise EmptyPage('That page number is less than 1')
+        return number
+
+    def page(self, number: Any) -> WindowPage:
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage('That page contains no results')
+        return WindowPage(
+            rows[: self.per_page], number, self, len(rows) > self.per_page
+        )
+
+    def get_page(self, number: Any) -> WindowPage:
+        """Как Paginator.get_page, но вместо последней страницы - первая."""
+        try:
+            return self.page(number)
+        except (PageNotAnInteger, EmptyPage):
+            return self.page(1)
 
 
 def paginate(
     request: Any,
     posts: Any,
     post_per_one_page: Any = settings.OBJECTS_PER_PAGE,
-) -> Page:
-    return Paginator(posts, post_per_one_page).get_page(
+    count: Optional[int] = None,
+) -> Union[Page, CursorPage, WindowPage]:
+    if settings.FEED_PAGINATION == 'cursor':
+        return CursorPaginator(posts, post_per_one_page, count).page(
+            after=request.GET.get('after'),
+            before=request.GET.get('before'),
+        )
+    if settings.FEED_PAGINATION == 'window':
+        return WindowPaginator(posts, post_per_one_page, count).get_page(
+            request.GET.get('page')
+        )
+    return CountedPaginator(posts, post_per_one_page, count).get_page(
         request.GET.get('page')
     )
+
+
+def query_budget(queries: int) -> Callable:
+    """
+    Объявляет максимальное число SQL-запросов, которое view может выполнить
+    за один запрос авторизованного пользователя (вместе с сессией).
+    """
+
+    def decorator(view: Callable) -> Callable:
+        view.query_budget = queries
+        return view
+
+    return decorator
+
+
+def public_page(view: Callable) -> Callable:
+    """
+    Помечает view, страница которого для анонимных пользователей не зависит
+    от сессии: AnonymousFastPathMiddleware обслуживает такие GET-запросы
+    без cookie сессии, не обращаясь к сессии, auth и messages.
+    """
+    view.public_page = True
+    return view